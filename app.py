@@ -5,17 +5,33 @@ sys.modules["sqlite3.dbapi2"] = sys.modules["pysqlite3.dbapi2"]
 
 import streamlit as st
 import pandas as pd
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from crewai import Crew
-from src.resume_shortlisting.tools.custom_tool import ExtractResumeText
-from src.resume_shortlisting.crew import ResumeShortlistingCrew
+from src.resume_shortlisting.extraction import extract_resumes, default_worker_count
+from src.resume_shortlisting.pdf_text import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+from src.resume_shortlisting.cache import ExtractionCache, JDAnalysisCache, ResponseCache
+from src.resume_shortlisting.compaction import compact_resumes, DEFAULT_TOKEN_BUDGET
+from src.resume_shortlisting.prefilter import bm25_scores, select_top
+from src.resume_shortlisting.dedup import DEFAULT_SIMILARITY, find_duplicates
+from src.resume_shortlisting.parsing import (
+    JD_SEPARATOR,
+    IncrementalRecordParser,
+    parse_candidate_header,
+    split_job_descriptions,
+)
+from src.resume_shortlisting.jobs import JobManager
+from src.resume_shortlisting.metrics import DEFAULT_MODEL, DEFAULT_QUICK_MODEL, MODEL_PRICES, RunMetrics
+from src.resume_shortlisting.ratelimit import classify_error, scheduler_stats
+from src.resume_shortlisting.store import CandidateStore
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 import os
-import re
+import threading
+
+UPLOAD_SOURCE = "Upload PDFs"
+POOL_SOURCE = "Candidate pool"
+SINGLE_PROMPT_MODE = "Single batch prompt"
+PER_CANDIDATE_MODE = "Per-candidate (concurrent)"
+CASCADE_MODE = "Cascade (quick score, then full evaluation)"
+JOB_POLL_SECONDS = 1.0
 
 st.set_page_config(
     page_title="Resume Shortlisting Tool",
@@ -77,211 +93,687 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def create_pdf_report(df, filename):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-  
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        textColor=colors.darkblue,
-        alignment=1
+@st.cache_resource
+def get_extraction_cache():
+    return ExtractionCache()
+
+@st.cache_resource
+def get_jd_cache():
+    return JDAnalysisCache()
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+@st.cache_resource
+def get_candidate_store():
+    return CandidateStore()
+
+# crewai and the ReportLab export stack take seconds to import, so they are
+# loaded on first use instead of before the first page render.
+@st.cache_resource
+def warm_start():
+    def load():
+        import src.resume_shortlisting.screening  # noqa: F401
+        import src.resume_shortlisting.report  # noqa: F401
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_job_manager():
+    return JobManager()
+
+# One template per process, shared by every session. The API key is given
+# to each run's LLMs by for_run(), so it never keys a process-wide cache or
+# lands in the environment of other sessions.
+@st.cache_resource
+def get_crew_template():
+    from src.resume_shortlisting.crew import ResumeShortlistingCrew
+
+    return ResumeShortlistingCrew(jd_cache=get_jd_cache())
+
+def extract_resumes_data(job, files, cache, max_workers=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, fallback=True):
+    def on_progress(done, total, name):
+        job.set_stage(f"📝 Extracted {name} ({done}/{total})", done / total)
+
+    job.set_stage(f"📝 Extracting text from {len(files)} file(s)...", 0.0)
+    outcomes = extract_resumes(
+        files,
+        max_workers=max_workers,
+        on_progress=on_progress,
+        cache=cache,
+        max_pages=max_pages,
+        max_chars=max_chars,
+        fallback=fallback
     )
-    story.append(Paragraph("Resume Shortlisting Report", title_style))
-    story.append(Spacer(1, 12))
-    table_data = [df.columns.tolist()]
-    for _, row in df.iterrows():
-        row_data = []
-        for col in df.columns:
-            cell_content = str(row[col])
-            # Wrap long content
-            if len(cell_content) > 100:
-                cell_content = cell_content[:100] + "..."
-            row_data.append(cell_content)
-        table_data.append(row_data)
-    
-    table = Table(table_data, colWidths=[1.5*inch, 1.2*inch, 0.8*inch, 2.5*inch, 2*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-    ]))
-    
-    story.append(table)
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
-def extract_resumes_data(uploaded_files):
-    extract_tool = ExtractResumeText()
     resumes_data = []
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for i, file in enumerate(uploaded_files):
-        try:
-            status_text.text(f"Processing {file.name}...")
-            temp_path = f"temp_{file.name}"
-            with open(temp_path, "wb") as f:
-                f.write(file.getbuffer())
-
-            result = extract_tool._run(temp_path)
-            resumes_data.append(result)
-            os.remove(temp_path)
-            
-            progress_bar.progress((i + 1) / len(uploaded_files))
-            
-        except Exception as e:
-            st.error(f"Error processing {file.name}: {str(e)}")
-    
-    progress_bar.empty()
-    status_text.empty()
-    return resumes_data
-
-def parse_ai_response(result_text):
-    try:
-        text = str(result_text)
-        lines = text.split('\n')
-        candidates = []
-        
-        for line in lines:
-            line = line.strip()
-            if '|' in line and len(line.split('|')) >= 4:
-                if any(header in line.lower() for header in ['name', 'mobile', 'score', 'questions']):
-                    continue
-                if line.startswith('|---') or line.startswith('---'):
-                    continue
-                
-                parts = [part.strip() for part in line.split('|')]
-                
-                while parts and not parts[0]:
-                    parts.pop(0)
-                while parts and not parts[-1]:
-                    parts.pop()
-                
-                if len(parts) >= 4:
-                    try:
-                        name = parts[0]
-                        mobile = parts[1]
-                        
-                        score_text = parts[2]
-                        score_match = re.search(r'(\d+(?:\.\d+)?)', score_text)
-                        score = float(score_match.group(1)) if score_match else 0.0
-                        
-                        questions = parts[3]
-                        reasoning = parts[4] if len(parts) > 4 else "No reasoning provided"
-                        if name and name.lower() not in ['name', 'example', 'sample']:
-                            candidates.append({
-                                "Name": name,
-                                "Mobile": mobile,
-                                "Score": score,
-                                "Questions for Interview": questions,
-                                "Reasoning": reasoning
-                            })
-                    except (ValueError, IndexError) as e:
-                        st.warning(f"Skipping malformed row: {line[:50]}...")
-                        continue
-        
-        if not candidates:
-            blocks = re.split(r'\n\s*\n', text)
-            
-            for block in blocks:
-                if any(keyword in block.lower() for keyword in ['name:', 'mobile:', 'score:', 'candidate']):
-                    try:
-                        name_match = re.search(r'name:\s*(.+?)(?:\n|$)', block, re.IGNORECASE)
-                        mobile_match = re.search(r'(?:mobile|phone):\s*(.+?)(?:\n|$)', block, re.IGNORECASE)
-                        score_match = re.search(r'score:\s*(\d+(?:\.\d+)?)', block, re.IGNORECASE)
-                        questions_match = re.search(r'(?:questions?|interview):\s*(.+?)(?:\n\n|$)', block, re.IGNORECASE | re.DOTALL)
-                        reasoning_match = re.search(r'(?:reasoning|rationale|analysis):\s*(.+?)(?:\n\n|$)', block, re.IGNORECASE | re.DOTALL)
-                        
-                        if name_match:
-                            name = name_match.group(1).strip()
-                            mobile = mobile_match.group(1).strip() if mobile_match else "Not found"
-                            score = float(score_match.group(1)) if score_match else 0.0
-                            questions = questions_match.group(1).strip() if questions_match else "No questions provided"
-                            reasoning = reasoning_match.group(1).strip() if reasoning_match else "No reasoning provided"
-                            
-                            candidates.append({
-                                "Name": name,
-                                "Mobile": mobile,
-                                "Score": score,
-                                "Questions for Interview": questions,
-                                "Reasoning": reasoning
-                            })
-                    except Exception:
-                        continue
-        
-        if not candidates:
-            json_pattern = r'\{[^}]*"name"[^}]*\}'
-            json_matches = re.findall(json_pattern, text, re.IGNORECASE)
-            
-            for match in json_matches:
-                try:
-                    name_match = re.search(r'"name":\s*"([^"]+)"', match, re.IGNORECASE)
-                    mobile_match = re.search(r'"(?:mobile|phone)":\s*"([^"]+)"', match, re.IGNORECASE)
-                    score_match = re.search(r'"score":\s*(\d+(?:\.\d+)?)', match, re.IGNORECASE)
-                    
-                    if name_match:
-                        candidates.append({
-                            "Name": name_match.group(1),
-                            "Mobile": mobile_match.group(1) if mobile_match else "Not found",
-                            "Score": float(score_match.group(1)) if score_match else 0.0,
-                            "Questions for Interview": "Check detailed response",
-                            "Reasoning": "Extracted from JSON format"
-                        })
-                except Exception:
-                    continue
-        
-        if not candidates:
-            name_score_pattern = r'(?:Name|Candidate):\s*([A-Za-z\s]+).*?(?:Score|Rating):\s*(\d+(?:\.\d+)?)'
-            matches = re.findall(name_score_pattern, text, re.IGNORECASE | re.DOTALL)
-            
-            for name, score in matches:
-                if name.strip():
-                    candidates.append({
-                        "Name": name.strip(),
-                        "Mobile": "Not found",
-                        "Score": float(score),
-                        "Questions for Interview": "Please check the detailed response",
-                        "Reasoning": "Extracted from text pattern"
-                    })
-        
-        if not candidates:
-            st.warning("Could not parse AI response into structured format. Check the raw response below.")
-            candidates = [
+    source_names = []
+    digests = []
+    details = []
+    for (_, data), outcome in zip(files, outcomes):
+        if outcome.ok:
+            resumes_data.append(outcome.text)
+            source_names.append(outcome.name)
+            digests.append(CandidateStore.digest(data))
+            stats = outcome.stats
+            details.append({
+                "File": outcome.name,
+                "Extractor": stats.method,
+                "Pages Read": f"{stats.pages_read}/{stats.pages_total}" if stats.pages_total else "",
+                "Characters": stats.chars,
+                "Stopped Early": stats.stopped_early,
+                "Fallback Reason": stats.fallback_reason or "",
+                "Seconds": round(stats.seconds, 3),
+            })
+        else:
+            job.error_message(f"Error processing {outcome.name}: {outcome.error}")
+    return resumes_data, source_names, digests, pd.DataFrame(details) if details else None
+
+def build_results_frame(job, result, resumes_data, prefilter_scores=None, role=None):
+    if result.failures:
+        job.warning(
+            f"⚠️ {f'{role}: ' if role else ''}{len(result.failures)} candidate(s) could not be evaluated and are listed with a score of 0. "
+            "Check the raw response below."
+        )
+    columns = ["Resume #", "Name", "Mobile", "Score", "Questions for Interview", "Reasoning"]
+    if result.decided_by:
+        columns += ["Quick Score", "Decided By"]
+    must_haves = result.must_haves()
+    if must_haves:
+        job.info(f"🧩 {f'{role}: ' if role else ''}Must-have coverage checked locally against {', '.join(must_haves)}")
+        columns += ["Must-Have Coverage", "Missing Must-Haves"]
+    df = pd.DataFrame(result.rows(resumes_data), columns=columns)
+    if prefilter_scores is not None:
+        df['Prefilter Score'] = [prefilter_scores[resume_id - 1] for resume_id in df['Resume #']]
+    return df
+
+def add_duplicate_rows(df, duplicates, batch_indices, all_resumes, source_names):
+    # Duplicates share their representative's evaluation but keep their own
+    # contact details. Groups whose representative was pre-filtered out are
+    # dropped with it.
+    positions = {original: resume_id for resume_id, original in enumerate(batch_indices, start=1)}
+    evaluated = df.set_index('Resume #', drop=False)
+    rows = []
+    for duplicate, match in sorted(duplicates.items()):
+        resume_id = positions.get(match.representative)
+        if resume_id is None or resume_id not in evaluated.index:
+            continue
+        fields = parse_candidate_header(all_resumes[duplicate])
+        row = evaluated.loc[resume_id].to_dict()
+        row.update({
+            "Name": fields.get('name', row["Name"]),
+            "Mobile": fields.get('mobile', row["Mobile"]),
+            "Duplicate Of": source_names[match.representative],
+        })
+        rows.append(row)
+    df = df.assign(**{"Duplicate Of": ""})
+    if not rows:
+        return df
+    return pd.concat([df, pd.DataFrame(rows, columns=df.columns)], ignore_index=True)
+
+def record_pool_scores(store, job_description, df, batch_indices, duplicates, candidate_ids, failed, model):
+    # Failed evaluations are listed with a placeholder score of 0, which is
+    # not worth keeping in a candidate's history.
+    evaluated = {}
+    for row in df.to_dict('records'):
+        # Duplicate rows repeat their representative's Resume # after it.
+        if row['Resume #'] not in failed:
+            evaluated.setdefault(row['Resume #'], row)
+    positions = {original: resume_id for resume_id, original in enumerate(batch_indices, start=1)}
+    scores = [
+        (candidate_ids[original], evaluated[resume_id])
+        for original, resume_id in positions.items() if resume_id in evaluated
+    ]
+    scores += [
+        (candidate_ids[duplicate], evaluated[positions[match.representative]])
+        for duplicate, match in duplicates.items()
+        if positions.get(match.representative) in evaluated
+    ]
+    store.record_scores(job_description, scores, model)
+
+def render_candidate_pool(max_resumes):
+    store = get_candidate_store()
+    query = st.text_input(
+        "Search the candidate pool:",
+        placeholder="e.g. kubernetes python, a name, an email or a phone number",
+        help="Full-text search over every stored resume and its contact details; leave empty to list the latest"
+    )
+    matches = store.search(query, limit=200)
+    if not matches:
+        st.info("No stored candidates match. Candidates are added to the pool when their PDFs are uploaded and analyzed.")
+        return []
+    pool = pd.DataFrame(matches).rename(columns={
+        'id': 'ID', 'name': 'Name', 'mobile': 'Mobile', 'email': 'Email',
+        'source_name': 'File', 'snippet': 'Match',
+    })[['ID', 'Name', 'Mobile', 'Email', 'File', 'Match']]
+    selection = st.dataframe(
+        pool, use_container_width=True, hide_index=True,
+        on_select="rerun", selection_mode="multi-row", key="pool_selection"
+    )
+    selected_rows = selection.selection.rows or list(range(len(pool)))
+    candidate_ids = pool['ID'].iloc[selected_rows].tolist()[:max_resumes]
+    st.caption(
+        f"{len(matches)} match(es). The first {len(candidate_ids)} "
+        f"{'selected ' if selection.selection.rows else ''}candidate(s) will be screened."
+    )
+
+    jobs = store.jobs()
+    if jobs:
+        with st.expander("📈 Score History"):
+            job = st.selectbox(
+                "Job description", jobs,
+                format_func=lambda job: f"{job['title']} ({job['candidates']} candidate(s))"
+            )
+            history = pd.DataFrame(store.score_history(job_id=job['id']))
+            history['scored_at'] = pd.to_datetime(history['scored_at'], unit='s').dt.strftime('%Y-%m-%d %H:%M')
+            st.dataframe(
+                history[['name', 'source_name', 'score', 'model', 'scored_at', 'reasoning']],
+                use_container_width=True, hide_index=True
+            )
+    return candidate_ids
+
+def render_partial_results(rows):
+    partial_df = pd.DataFrame(rows)
+    st.dataframe(partial_df, use_container_width=True)
+    st.download_button(
+        label=f"📊 Download partial CSV ({len(rows)} candidate(s) so far)",
+        data=partial_df.to_csv(index=False),
+        file_name=f"partial_shortlist_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        key=f"partial_csv_{len(rows)}",
+        on_click="ignore"
+    )
+
+def shortlist_streaming(job, crew_instance, job_description, resumes_data, max_concurrency):
+    from src.resume_shortlisting.screening import screen_single_prompt
+
+    parser = IncrementalRecordParser()
+    parser_lock = threading.Lock()
+
+    def publish(evaluation):
+        job.put_partial(evaluation.resume_id, evaluation.to_row())
+        job.set_progress(len(job.partial_rows()) / len(resumes_data))
+
+    def on_chunk(chunk):
+        with parser_lock:
+            evaluations = parser.feed(chunk)
+        for evaluation in evaluations:
+            publish(evaluation)
+
+    def on_evaluation(resume_id, evaluation, error):
+        if evaluation is not None:
+            publish(evaluation)
+
+    job.set_stage("🤖 Running AI analysis...", 0.0)
+    return screen_single_prompt(
+        crew_instance, job_description, resumes_data,
+        on_chunk=on_chunk,
+        on_evaluation=on_evaluation,
+        max_concurrency=max_concurrency
+    )
+
+def score_resumes_individually(job, crew_instance, job_description, resumes_data, max_concurrency):
+    from src.resume_shortlisting.screening import screen_per_candidate
+
+    job.set_stage("🤖 Analyzing job description...", 0.0)
+    done = 0
+    lock = threading.Lock()
+
+    def on_evaluation(resume_id, evaluation, error):
+        nonlocal done
+        with lock:
+            done = min(done + 1, len(resumes_data))
+            job.set_stage(f"🤖 Scored {done}/{len(resumes_data)} candidate(s)", done / len(resumes_data))
+        if evaluation is not None:
+            job.put_partial(resume_id, evaluation.to_row())
+
+    return screen_per_candidate(
+        crew_instance, job_description, resumes_data, max_concurrency, on_evaluation=on_evaluation
+    )
+
+@dataclass
+class AnalysisRequest:
+    """Everything a run needs, captured on the script thread before it is handed to a job."""
+    job_description: str
+    roles: Optional[Dict[str, str]]
+    files: List[Tuple[str, bytes]]
+    pool_ids: List[int]
+    crew_template: Any
+    api_key: Optional[str]
+    extraction_cache: ExtractionCache
+    response_cache: Optional[ResponseCache]
+    store: CandidateStore
+    store_enabled: bool
+    extraction_workers: int
+    max_pages: int
+    max_chars: int
+    extraction_fallback: bool
+    dedup_enabled: bool
+    dedup_threshold: float
+    prefilter_enabled: bool
+    prefilter_top_k: int
+    prefilter_cutoff: float
+    compaction_enabled: bool
+    token_budget: int
+    scoring_mode: str
+    scoring_threshold: float
+    cascade_margin: float
+    model: str
+    quick_model: str
+    scoring_concurrency: int
+
+@dataclass
+class AnalysisResult:
+    df: pd.DataFrame
+    metrics: RunMetrics
+    raw: str
+    total_resumes: int
+    extraction_details: Optional[pd.DataFrame] = None
+    duplicates: Optional[pd.DataFrame] = None
+    # Multi-JD runs: `df` is the candidate × role score matrix and each
+    # role's full results are kept here.
+    roles: Optional[Dict[str, pd.DataFrame]] = None
+
+def run_analysis(job, request: AnalysisRequest) -> AnalysisResult:
+    # Runs on a job thread: progress and messages go to `job`, never to st.
+    metrics = RunMetrics(request.model)
+    store = request.store
+    extraction_details = None
+    if request.pool_ids:
+        # Stored candidates were extracted when first uploaded.
+        job.set_stage("🗄️ Loading candidates from the pool...")
+        with metrics.stage('load_pool'):
+            stored = store.get_candidates(request.pool_ids)
+        resumes_data = [candidate.text for candidate in stored]
+        source_names = [candidate.source_name for candidate in stored]
+        candidate_ids = [candidate.id for candidate in stored]
+        job.info(f"🗄️ Loaded {len(stored)} candidate(s) from the pool")
+    else:
+        with metrics.stage('extract'):
+            resumes_data, source_names, digests, extraction_details = extract_resumes_data(
+                job, request.files, request.extraction_cache, request.extraction_workers,
+                request.max_pages, request.max_chars, request.extraction_fallback
+            )
+        candidate_ids = None
+        if request.store_enabled and resumes_data:
+            with metrics.stage('store'):
+                candidate_ids = store.add_candidates(zip(source_names, resumes_data, digests))
+
+    if not resumes_data:
+        raise ValueError("No resumes could be processed. Please check your files.")
+
+    # Keyword pre-filtering and compaction keep what is relevant to any role.
+    relevance_text = '\n\n'.join(request.roles.values()) if request.roles else request.job_description
+
+    duplicates = {}
+    duplicates_table = None
+    if request.dedup_enabled:
+        job.set_stage("🧬 Looking for duplicate resumes...")
+        with metrics.stage('dedup'):
+            duplicates = find_duplicates(resumes_data, request.dedup_threshold)
+        if duplicates:
+            job.info(f"🧬 Found {len(duplicates)} duplicate resume(s); each group is scored once")
+            duplicates_table = pd.DataFrame([
                 {
-                    "Name": "Parse Error", 
-                    "Mobile": "N/A", 
-                    "Score": 0.0, 
-                    "Questions for Interview": "Please check the raw AI response",
-                    "Reasoning": "Could not parse response format"
+                    "File": source_names[duplicate],
+                    "Duplicate Of": source_names[match.representative],
+                    "Matched On": match.reason,
                 }
-            ]
-        
-        return pd.DataFrame(candidates)
-        
-    except Exception as e:
-        st.error(f"Error parsing AI response: {str(e)}")
-        return pd.DataFrame([{
-            "Name": "Error", 
-            "Mobile": "Error", 
-            "Score": 0.0, 
-            "Questions for Interview": "Error parsing response",
-            "Reasoning": str(e)
-        }])
+                for duplicate, match in sorted(duplicates.items())
+            ])
+    all_resumes = resumes_data
+    batch_indices = [i for i in range(len(all_resumes)) if i not in duplicates]
+    resumes_data = [all_resumes[i] for i in batch_indices]
+
+    prefilter_scores = None
+    if request.prefilter_enabled:
+        with metrics.stage('prefilter'):
+            scores = bm25_scores(resumes_data, relevance_text)
+            selected = select_top(scores, request.prefilter_top_k, request.prefilter_cutoff)
+        job.info(f"🔎 Keyword pre-filter kept {len(selected)} of {len(resumes_data)} resume(s)")
+        resumes_data = [resumes_data[i] for i in selected]
+        batch_indices = [batch_indices[i] for i in selected]
+        prefilter_scores = [round(float(scores[i]), 2) for i in selected]
+
+    if request.compaction_enabled:
+        job.set_stage("✂️ Compacting resumes...")
+        with metrics.stage('compact'):
+            resumes_data, compaction_stats = compact_resumes(resumes_data, relevance_text, request.token_budget)
+        tokens_before = sum(stats.tokens_before for stats in compaction_stats)
+        tokens_after = sum(stats.tokens_after for stats in compaction_stats)
+        saved = (1 - tokens_after / tokens_before) * 100 if tokens_before else 0.0
+        estimate = "" if all(stats.exact for stats in compaction_stats) else " (estimated)"
+        job.info(
+            f"✂️ Compacted resumes from {tokens_before:,} to {tokens_after:,} tokens{estimate}, "
+            f"saving {saved:.0f}%"
+        )
+
+    crew_instance = request.crew_template.for_run(
+        metrics=metrics, response_cache=request.response_cache,
+        model=request.model, quick_model=request.quick_model, api_key=request.api_key
+    )
+    if request.roles:
+        return finish_role_matrix(
+            job, request, metrics, crew_instance, resumes_data, all_resumes, batch_indices, source_names,
+            duplicates, candidate_ids, prefilter_scores, extraction_details, duplicates_table
+        )
+    if request.scoring_mode == PER_CANDIDATE_MODE:
+        result = score_resumes_individually(
+            job, crew_instance, request.job_description, resumes_data, request.scoring_concurrency
+        )
+    elif request.scoring_mode == CASCADE_MODE:
+        result = score_with_cascade(
+            job, crew_instance, request.job_description, resumes_data,
+            request.scoring_threshold, request.cascade_margin, request.scoring_concurrency
+        )
+        quick = sum(tier.startswith('quick') for tier in result.decided_by.values())
+        job.info(
+            f"🪜 Quick pass settled {quick} of {len(resumes_data)} candidate(s); "
+            f"{len(resumes_data) - quick} got the full evaluation"
+        )
+    else:
+        result = shortlist_streaming(
+            job, crew_instance, request.job_description, resumes_data, request.scoring_concurrency
+        )
+        if result.reasked:
+            job.info(f"🔁 Re-asked {len(result.reasked)} candidate(s) with a missing or invalid evaluation")
+
+    job.set_stage("📊 Processing results...", 1.0)
+    df = build_results_frame(job, result, resumes_data, prefilter_scores)
+    if request.dedup_enabled:
+        df = add_duplicate_rows(df, duplicates, batch_indices, all_resumes, source_names)
+    if request.store_enabled and candidate_ids:
+        with metrics.stage('store'):
+            record_pool_scores(
+                store, request.job_description, df, batch_indices, duplicates, candidate_ids,
+                set(result.failures), crew_instance.model
+            )
+    return AnalysisResult(df, metrics, result.raw, len(all_resumes), extraction_details, duplicates_table)
+
+def score_against_roles(job, crew_instance, roles, resumes_data, max_concurrency):
+    from src.resume_shortlisting.screening import screen_many
+
+    total = len(roles) * len(resumes_data)
+    job.set_stage(f"🤖 Analyzing {len(roles)} job description(s)...", 0.0)
+    done = 0
+    lock = threading.Lock()
+
+    def on_evaluation(role, resume_id, evaluation, error):
+        nonlocal done
+        with lock:
+            done = min(done + 1, total)
+            job.set_stage(f"🤖 Scored {done}/{total} candidate-role pair(s)", done / total)
+        if evaluation is not None:
+            job.put_partial((role, resume_id), {"Role": role, **evaluation.to_row()})
+
+    return screen_many(crew_instance, roles, resumes_data, max_concurrency, on_evaluation=on_evaluation)
+
+def finish_role_matrix(
+    job, request, metrics, crew_instance, resumes_data, all_resumes, batch_indices, source_names,
+    duplicates, candidate_ids, prefilter_scores, extraction_details, duplicates_table
+):
+    from src.resume_shortlisting.screening import build_score_matrix
+
+    results = score_against_roles(job, crew_instance, request.roles, resumes_data, request.scoring_concurrency)
+    job.set_stage("📊 Processing results...", 1.0)
+    frames = {}
+    for role, result in results.items():
+        if result.reasked:
+            job.info(f"🔁 {role}: re-asked {len(result.reasked)} candidate(s) with a missing or invalid evaluation")
+        df = build_results_frame(job, result, resumes_data, prefilter_scores, role=role)
+        if request.dedup_enabled:
+            df = add_duplicate_rows(df, duplicates, batch_indices, all_resumes, source_names)
+        if request.store_enabled and candidate_ids:
+            with metrics.stage('store'):
+                record_pool_scores(
+                    request.store, request.roles[role], df, batch_indices, duplicates, candidate_ids,
+                    set(result.failures), crew_instance.model
+                )
+        frames[role] = df
+    with metrics.stage('score_matrix'):
+        matrix = build_score_matrix(frames)
+    raw = '\n\n'.join(f"=== {role} ===\n{result.raw}" for role, result in results.items())
+    return AnalysisResult(
+        matrix, metrics, raw, len(all_resumes), extraction_details, duplicates_table, roles=frames
+    )
+
+def render_role_matrix(analysis, scoring_threshold):
+    matrix = analysis.df
+    roles = list(analysis.roles)
+    score_columns = roles + ["Best Score"]
+    qualified = matrix[matrix["Best Score"] >= scoring_threshold]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📄 Total Resumes", analysis.total_resumes)
+    with col2:
+        st.metric("🧭 Roles", len(roles))
+    with col3:
+        st.metric("🎯 Qualified for a Role", len(qualified))
+    st.dataframe(
+        pd.DataFrame({
+            "Qualified Candidates": (matrix[roles] >= scoring_threshold).sum(),
+            "Best Fit For": matrix.loc[matrix["Best Score"] >= scoring_threshold, "Best Fit Role"]
+            .value_counts().reindex(roles, fill_value=0),
+            "Average Score": matrix[roles].mean().round(1),
+        }).rename_axis("Role"),
+        use_container_width=True
+    )
+
+    if len(qualified) == 0:
+        st.warning(f"⚠️ No candidates met the minimum score threshold of {scoring_threshold} for any role")
+        st.info("💡 Try lowering the scoring threshold in the sidebar")
+        shown = matrix
+        st.subheader("📋 All Analyzed Candidates")
+    else:
+        shown = qualified
+        st.subheader("🧭 Candidate × Role Scores")
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_by = st.selectbox("Sort by:", ["Best Score", "Name", *roles])
+    with col2:
+        ascending = st.checkbox("Ascending order", value=False)
+    shown = shown.sort_values(by=sort_by, ascending=ascending) #type: ignore
+    st.dataframe(
+        shown.style.format({col: '{:.1f}' for col in score_columns})
+        .background_gradient(subset=score_columns, cmap='RdYlGn', vmin=0, vmax=10), #type: ignore
+        use_container_width=True
+    )
+
+    st.subheader("📥 Export Results")
+    render_export_buttons(shown, analysis.metrics)
+
+    with st.expander("📋 Role Details"):
+        role = st.selectbox("Role", roles)
+        st.dataframe(analysis.roles[role].sort_values('Score', ascending=False), use_container_width=True)
+
+def score_with_cascade(job, crew_instance, job_description, resumes_data, threshold, margin, max_concurrency):
+    from src.resume_shortlisting.screening import screen_cascade
+
+    job.set_stage(f"🪜 Quick pass with {crew_instance.quick_model}...", 0.0)
+    done = 0
+    lock = threading.Lock()
+
+    def on_evaluation(resume_id, evaluation, error):
+        nonlocal done
+        with lock:
+            done = min(done + 1, len(resumes_data))
+            job.set_stage(f"🤖 Settled {done}/{len(resumes_data)} candidate(s)", done / len(resumes_data))
+        if evaluation is not None:
+            job.put_partial(resume_id, evaluation.to_row())
+
+    return screen_cascade(
+        crew_instance, job_description, resumes_data, threshold, margin, max_concurrency, on_evaluation=on_evaluation
+    )
+
+def render_job_messages(job):
+    for level, text in job.messages():
+        getattr(st, level)(text)
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def render_job_progress(job_id):
+    # Only this fragment reruns while a job is in progress; the first poll
+    # that finds the job finished redraws the whole page with its result.
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return
+    if job.is_finished:
+        st.rerun()
+    st.progress(job.progress, text=f"{job.stage} ({job.elapsed:.0f}s, job {job.id})")
+    render_job_messages(job)
+    rows = job.partial_rows()
+    if rows:
+        render_partial_results(rows)
+
+def render_job_result(job, scoring_threshold):
+    render_job_messages(job)
+    if job.error is not None:
+        e = job.error
+        st.error(f"❌ An error occurred: {str(e)}")
+        if classify_error(e)[0]:
+            st.info("💡 OpenAI rate limits were still exceeded after several retries. Please wait a minute and try again.")
+        else:
+            st.info("💡 Please check your OpenAI API key and try again.")
+
+        with st.expander("🔧 Error Details"):
+            st.code(str(e))
+        return
+
+    analysis = job.result
+    if analysis.extraction_details is not None:
+        with st.expander("🧾 Extraction Details"):
+            st.dataframe(analysis.extraction_details, use_container_width=True)
+    if analysis.duplicates is not None:
+        with st.expander("🧬 Duplicate Resumes"):
+            st.dataframe(analysis.duplicates, use_container_width=True)
+
+    st.success(f"✅ Analysis complete! ({job.elapsed:.1f}s, job {job.id})")
+
+    # The threshold, sort order and exports are applied to the stored
+    # result, so changing them redraws without running anything again.
+    if analysis.roles is not None:
+        render_role_matrix(analysis, scoring_threshold)
+        render_metrics_panel(analysis.metrics)
+        with st.expander("🔍 View Raw AI Response"):
+            st.text(analysis.raw)
+        return
+
+    df = analysis.df
+    df_filtered = df[df['Score'] >= scoring_threshold]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📄 Total Resumes", analysis.total_resumes)
+    with col2:
+        st.metric("🎯 Qualified Candidates", len(df_filtered))
+    with col3:
+        if len(df_filtered) > 0:
+            st.metric("📈 Average Score", f"{df_filtered['Score'].mean():.1f}")
+        else:
+            st.metric("📈 Average Score", "N/A")
+    if len(df_filtered) == 0:
+        st.warning(f"⚠️ No candidates met the minimum score threshold of {scoring_threshold}")
+        st.info("💡 Try lowering the scoring threshold in the sidebar")
+
+        if len(df) > 0:
+            st.subheader("📋 All Analyzed Candidates")
+            st.dataframe(df.sort_values('Score', ascending=False), use_container_width=True)
+    else:
+        st.subheader("🏆 Shortlisted Candidates")
+        col1, col2 = st.columns(2)
+        with col1:
+            sort_by = st.selectbox(
+                "Sort by:", ["Score", "Name"] + (["Must-Have Coverage"] if "Must-Have Coverage" in df else [])
+            )
+        with col2:
+            ascending = st.checkbox("Ascending order", value=False)
+
+        df_sorted = df_filtered.sort_values(by=sort_by, ascending=ascending) #type: ignore
+        st.dataframe(
+            df_sorted.style.format(
+                {'Score': '{:.1f}', **({'Must-Have Coverage': '{:.0f}%'} if "Must-Have Coverage" in df else {})}
+            )
+            .background_gradient(subset=['Score'], cmap='RdYlGn'), #type: ignore
+            use_container_width=True
+        )
+
+        st.subheader("📥 Export Results")
+        render_export_buttons(df_sorted, analysis.metrics)
+
+    render_metrics_panel(analysis.metrics)
+
+    with st.expander("🔍 View Raw AI Response"):
+        st.text(analysis.raw)
+
+def render_metrics_panel(metrics):
+    totals = metrics.totals()
+    with st.expander("⏱️ Run Metrics"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Wall time", f"{totals['seconds']:.1f}s")
+        with col2:
+            st.metric("Tokens in / out", f"{totals['prompt_tokens']:,} / {totals['completion_tokens']:,}")
+        with col3:
+            st.metric("Estimated cost", "N/A" if totals['cost'] is None else f"${totals['cost']:.4f}")
+
+        stages = pd.DataFrame.from_dict(metrics.by_stage(), orient='index')
+        st.dataframe(stages.rename_axis('Stage'), use_container_width=True)
+        candidates = metrics.by_candidate()
+        if candidates:
+            per_candidate = pd.DataFrame.from_dict(candidates, orient='index').sort_index()
+            # Multi-JD runs key candidates by (role, Resume #).
+            if per_candidate.index.nlevels == 2:
+                st.caption("Per role and candidate (Resume #)")
+                per_candidate = per_candidate.rename_axis(['Role', 'Resume #'])
+            else:
+                st.caption("Per candidate (Resume #)")
+                per_candidate = per_candidate.rename_axis('Resume #')
+            st.dataframe(per_candidate, use_container_width=True)
+
+        timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Download metrics (JSON)",
+                data=metrics.to_json,
+                file_name=f"run_metrics_{timestamp}.json",
+                mime="application/json",
+                on_click="ignore"
+            )
+        with col2:
+            st.download_button(
+                label="Download metrics (Prometheus)",
+                data=metrics.to_prometheus,
+                file_name=f"run_metrics_{timestamp}.prom",
+                mime="text/plain",
+                on_click="ignore"
+            )
+
+def render_export_buttons(df, metrics):
+    from src.resume_shortlisting.export import EXPORT_FORMATS, open_export
+
+    # Each file is rendered only when its button is clicked, so a large
+    # shortlist is not exported four times on every rerun.
+    def deferred(fmt):
+        def render():
+            with metrics.stage(f'export_{fmt}'):
+                with open_export(df, fmt) as export:
+                    return export.read()
+        return render
+
+    timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+    for column, (fmt, export_format) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with column:
+            st.download_button(
+                label=export_format.label,
+                data=deferred(fmt),
+                file_name=f"shortlisted_resumes_{timestamp}.{export_format.extension}",
+                mime=export_format.mime,
+                on_click="ignore"
+            )
 
 def validate_api_key(api_key):
     if not api_key:
@@ -296,6 +788,7 @@ def validate_api_key(api_key):
     return True, "Valid format"
 
 def main():
+    warm_start()
     st.markdown('<div class="main-header">Resume Shortlisting Tool<div class="main-subtitle">Upload resumes and job description to get AI-powered shortlisting with interview questions</div></div>', unsafe_allow_html=True)
 
     st.subheader("🔑 OpenAI API Configuration")
@@ -309,7 +802,6 @@ def main():
     if api_key:
         is_valid, message = validate_api_key(api_key)
         st.session_state.openai_api_key = api_key
-        os.environ['OPENAI_API_KEY'] = api_key
         if is_valid:
             st.success("✅ API key format looks correct")
         else:
@@ -323,10 +815,125 @@ def main():
         st.header("⚙️ Configuration")
         max_resumes = st.slider("Maximum resumes to process", 1, 20, 10)
         scoring_threshold = st.slider("Minimum score threshold", 1.0, 10.0, 7.0, 0.1)
+        extraction_workers = st.slider(
+            "PDF extraction workers", 1, max(os.cpu_count() or 1, 2), default_worker_count(),
+            help="Number of processes used to extract text from PDFs in parallel"
+        )
+        max_pages = st.slider(
+            "Max pages read per resume", 1, 30, DEFAULT_MAX_PAGES,
+            help="Extraction stops after this many pages"
+        )
+        max_chars = st.slider(
+            "Max characters per resume", 2000, 100000, DEFAULT_MAX_CHARS, 1000,
+            help="Extraction stops once this much text has been collected"
+        )
+        extraction_fallback = st.checkbox(
+            "Retry poor extractions with pdfplumber", value=True,
+            help="Re-extracts a PDF with pdfplumber when the fast extractor returns too little or garbled text"
+        )
+        compaction_enabled = st.checkbox(
+            "Compact resumes before prompting", value=True,
+            help="Drops boilerplate sections and trims each resume to the most job-relevant sections"
+        )
+        token_budget = st.slider(
+            "Token budget per resume", 200, 4000, DEFAULT_TOKEN_BUDGET, 100,
+            disabled=not compaction_enabled
+        )
+        dedup_enabled = st.checkbox(
+            "Score duplicate resumes once", value=True,
+            help="Resumes with the same email or mobile number, or near-identical text, are scored once "
+                 "and the result is copied to the other copies"
+        )
+        dedup_threshold = st.slider(
+            "Duplicate text similarity", 0.3, 1.0, DEFAULT_SIMILARITY, 0.05,
+            disabled=not dedup_enabled,
+            help="Estimated share of three-word phrases two resumes must have in common"
+        )
+        prefilter_enabled = st.checkbox(
+            "Pre-filter resumes by keyword relevance", value=False,
+            help="Ranks resumes against the job description with BM25 and only sends the best matches to the AI"
+        )
+        prefilter_top_k = st.slider(
+            "Resumes sent to the AI (top K)", 1, 20, 10,
+            disabled=not prefilter_enabled
+        )
+        prefilter_cutoff = st.slider(
+            "Minimum keyword score (relative to best)", 0.0, 1.0, 0.0, 0.05,
+            disabled=not prefilter_enabled
+        )
+        store_enabled = st.checkbox(
+            "Save candidates to the local pool", value=True,
+            help="Keeps extracted resumes and their scores on this machine, so they can be searched "
+                 "and re-screened against another job description without uploading them again"
+        )
+        response_cache_enabled = st.checkbox(
+            "Reuse recorded AI responses", value=True,
+            help="Identical prompts (same job description, resumes and settings) are answered from a local cache instead of the API"
+        )
+        scoring_mode = st.radio(
+            "Scoring mode",
+            [SINGLE_PROMPT_MODE, PER_CANDIDATE_MODE, CASCADE_MODE],
+            help="Per-candidate mode analyzes the job description once and scores each resume in its own concurrent call. "
+                 "Cascade mode first asks the quick model for a score only and fully evaluates just the candidates "
+                 "near or above the score threshold"
+        )
+        models = list(MODEL_PRICES)
+        model = st.selectbox("Evaluation model", models, index=models.index(DEFAULT_MODEL))
+        quick_model = st.selectbox(
+            "Quick pass model", models,
+            index=models.index(DEFAULT_QUICK_MODEL) if DEFAULT_QUICK_MODEL in models else 0,
+            disabled=scoring_mode != CASCADE_MODE
+        )
+        cascade_margin = st.slider(
+            "Full evaluation margin", 0.0, 5.0, 1.5, 0.5,
+            disabled=scoring_mode != CASCADE_MODE,
+            help="Candidates whose quick score is within this many points below the threshold, or above it, "
+                 "get the full evaluation"
+        )
+        scoring_concurrency = st.slider(
+            "Concurrent scoring calls", 1, 16, 4,
+            help="Also used to re-ask candidates whose evaluation was missing or invalid"
+        )
         
         st.subheader("📊 Processing Info")
         st.info(f"Will process up to {max_resumes} resumes")
         st.info(f"Candidates need score ≥ {scoring_threshold}")
+        st.info(f"Extracting with {extraction_workers} worker(s)")
+        cache_stats = get_extraction_cache().stats()
+        st.info(
+            f"Extraction cache: {cache_stats['entries']} resume(s), "
+            f"{cache_stats['hits']} hit(s) / {cache_stats['misses']} miss(es)"
+        )
+        jd_cache_stats = get_jd_cache().stats()
+        st.info(
+            f"JD analysis cache: {jd_cache_stats['entries']} job description(s), "
+            f"{jd_cache_stats['hits']} hit(s) / {jd_cache_stats['misses']} miss(es)"
+        )
+        if st.button("🗑️ Clear cached JD analyses"):
+            removed = get_jd_cache().invalidate()
+            st.success(f"Removed {removed} cached analysis(es)")
+        response_cache_stats = get_response_cache().stats()
+        st.info(
+            f"AI response cache: {response_cache_stats['entries']} response(s), "
+            f"{response_cache_stats['hits']} hit(s) / {response_cache_stats['misses']} miss(es)"
+        )
+        if st.button("🗑️ Clear recorded AI responses"):
+            removed = get_response_cache().clear()
+            st.success(f"Removed {removed} recorded response(s)")
+        store_stats = get_candidate_store().stats()
+        st.info(
+            f"Candidate pool: {store_stats['candidates']} candidate(s), "
+            f"{store_stats['scores']} score(s) for {store_stats['jobs']} job description(s)"
+        )
+        # Shared by every session in this process, like the caches above.
+        for scheduled_model, limiter in scheduler_stats().items():
+            st.info(
+                f"OpenAI rate limiter ({scheduled_model}): {limiter['in_flight']} in flight, "
+                f"concurrency limit {int(limiter['concurrency_limit'])}, "
+                f"{limiter['throttled']} throttled / {limiter['retries']} retried call(s)"
+            )
+        job_stats = get_job_manager().stats()
+        st.info(f"Background jobs: {job_stats['running']} running, {job_stats['queued']} queued")
         
         st.subheader("🎯 Analysis Features")
         st.info("✅ Automatic name/mobile extraction")
@@ -338,6 +945,11 @@ def main():
     
     with col1:
         st.subheader("📋 Job Description")
+        multi_jd = st.checkbox(
+            "Screen against several job descriptions",
+            help=f"Separate job descriptions with a line containing only {JD_SEPARATOR}; the first line of each is "
+                 "its role title. Resumes are extracted once and scored against every role"
+        )
         job_description = st.text_area(
             "Enter the job description:",
             height=250,
@@ -347,126 +959,99 @@ def main():
         
         if job_description:
             word_count = len(job_description.split())
-            st.caption(f"📝 Word count: {word_count}")
+            if multi_jd:
+                roles = split_job_descriptions(job_description)
+                st.caption(f"📝 Word count: {word_count} across {len(roles)} role(s): {', '.join(roles)}")
+            else:
+                st.caption(f"📝 Word count: {word_count}")
     
     with col2:
         st.subheader("📄 Upload Resumes")
-        uploaded_files = st.file_uploader(
-            "Choose PDF files",
-            type=['pdf'],
-            accept_multiple_files=True,
-            help=f"Upload up to {max_resumes} PDF resumes"
-        )
-        
-        if uploaded_files:
-            if len(uploaded_files) > max_resumes:
-                st.error(f"❌ Please upload maximum {max_resumes} resumes")
-            else:
-                st.success(f"✅ Uploaded {len(uploaded_files)} resume(s)")
-                
-            with st.expander("📁 Uploaded Files"):
-                for file in uploaded_files:
-                    file_size = len(file.getbuffer()) / 1024  # KB
-                    st.write(f"📄 {file.name} ({file_size:.1f} KB)")
+        resume_source = st.radio("Resume source", [UPLOAD_SOURCE, POOL_SOURCE], horizontal=True)
+        pool_ids = []
+        uploaded_files = None
+        if resume_source == POOL_SOURCE:
+            pool_ids = render_candidate_pool(max_resumes)
+        else:
+            uploaded_files = st.file_uploader(
+                "Choose PDF files",
+                type=['pdf'],
+                accept_multiple_files=True,
+                help=f"Upload up to {max_resumes} PDF resumes"
+            )
+
+            if uploaded_files:
+                if len(uploaded_files) > max_resumes:
+                    st.error(f"❌ Please upload maximum {max_resumes} resumes")
+                else:
+                    st.success(f"✅ Uploaded {len(uploaded_files)} resume(s)")
+
+                with st.expander("📁 Uploaded Files"):
+                    for file in uploaded_files:
+                        file_size = file.size / 1024  # KB
+                        st.write(f"📄 {file.name} ({file_size:.1f} KB)")
     
-    if st.button("🚀 Analyze and Shortlist Resumes", type="primary"):
+    job_manager = get_job_manager()
+    job = job_manager.get(st.session_state.get('job_id'))
+    running = job is not None and not job.is_finished
+    if st.button("🚀 Analyze and Shortlist Resumes", type="primary", disabled=running):
         if not job_description.strip():
             st.error("❌ Please enter a job description.")
             return
+        roles = split_job_descriptions(job_description) if multi_jd else None
+        if multi_jd and not roles:
+            st.error(f"❌ Every job description is empty. Add text between the {JD_SEPARATOR} lines.")
+            return
         
-        if not uploaded_files:
+        if resume_source == POOL_SOURCE:
+            if not pool_ids:
+                st.error("❌ No stored candidates selected.")
+                return
+        elif not uploaded_files:
             st.error("❌ Please upload at least one resume.")
             return
-        
-        if len(uploaded_files) > max_resumes:
+        elif len(uploaded_files) > max_resumes:
             st.error(f"❌ Maximum {max_resumes} resumes allowed.")
             return
 
-        with st.spinner("🔄 Processing resumes... This may take a few minutes."):
-            try:
-                st.info("📝 Extracting text from resumes...")
-                resumes_data = extract_resumes_data(uploaded_files)
-                
-                if not resumes_data:
-                    st.error("❌ No resumes could be processed. Please check your files.")
-                    return
-            
-                st.info("🤖 Running AI analysis...")
-                crew_instance = ResumeShortlistingCrew(api_key=api_key)
-                
-                result = crew_instance.crew().kickoff(inputs={
-                    'job_description': job_description,
-                    'resumes': '\n\n'.join(resumes_data)
-                })
-
-                st.info("📊 Processing results...")
-                df = parse_ai_response(result)
-                df_filtered = df[df['Score'] >= scoring_threshold]
-                
-                st.success("✅ Analysis complete!")
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("📄 Total Resumes", len(uploaded_files))
-                with col2:
-                    st.metric("🎯 Qualified Candidates", len(df_filtered))
-                with col3:
-                    if len(df_filtered) > 0:
-                        st.metric("📈 Average Score", f"{df_filtered['Score'].mean():.1f}")
-                    else:
-                        st.metric("📈 Average Score", "N/A")
-                if len(df_filtered) == 0:
-                    st.warning(f"⚠️ No candidates met the minimum score threshold of {scoring_threshold}")
-                    st.info("💡 Try lowering the scoring threshold in the sidebar")
-                    
-                    if len(df) > 0:
-                        st.subheader("📋 All Analyzed Candidates")
-                        st.dataframe(df.sort_values('Score', ascending=False), use_container_width=True)
-                else:
-                    st.subheader("🏆 Shortlisted Candidates")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        sort_by = st.selectbox("Sort by:", ["Score", "Name"])
-                    with col2:
-                        ascending = st.checkbox("Ascending order", value=False)
-                    
-                    df_sorted = df_filtered.sort_values(by=sort_by, ascending=ascending) #type: ignore
-                    st.dataframe(
-                        df_sorted.style.format({'Score': '{:.1f}'})
-                        .background_gradient(subset=['Score'], cmap='RdYlGn'), #type: ignore
-                        use_container_width=True
-                    )
-
-                    st.subheader("📥 Export Results")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        csv = df_sorted.to_csv(index=False)
-                        st.download_button(
-                            label="📊 Download CSV",
-                            data=csv,
-                            file_name=f"shortlisted_resumes_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv"
-                        )
-                    
-                    with col2:
-                        pdf_buffer = create_pdf_report(df_sorted, "shortlisted_resumes.pdf")
-                        st.download_button(
-                            label="📄 Download PDF",
-                            data=pdf_buffer,
-                            file_name=f"shortlisted_resumes_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                            mime="application/pdf"
-                        )
-    
-                with st.expander("🔍 View Raw AI Response"):
-                    st.text(str(result))
-                
-            except Exception as e:
-                st.error(f"❌ An error occurred: {str(e)}")
-                st.info("💡 Please check your OpenAI API key and try again.")
-
-                with st.expander("🔧 Error Details"):
-                    st.code(str(e))
+        request = AnalysisRequest(
+            job_description=job_description,
+            roles=roles,
+            files=[] if resume_source == POOL_SOURCE else [(file.name, file.getvalue()) for file in uploaded_files],
+            pool_ids=pool_ids if resume_source == POOL_SOURCE else [],
+            crew_template=get_crew_template(),
+            api_key=api_key,
+            extraction_cache=get_extraction_cache(),
+            response_cache=get_response_cache() if response_cache_enabled else None,
+            store=get_candidate_store(),
+            store_enabled=store_enabled,
+            extraction_workers=extraction_workers,
+            max_pages=max_pages,
+            max_chars=max_chars,
+            extraction_fallback=extraction_fallback,
+            dedup_enabled=dedup_enabled,
+            dedup_threshold=dedup_threshold,
+            prefilter_enabled=prefilter_enabled,
+            prefilter_top_k=prefilter_top_k,
+            prefilter_cutoff=prefilter_cutoff,
+            compaction_enabled=compaction_enabled,
+            token_budget=token_budget,
+            scoring_mode=scoring_mode,
+            scoring_threshold=scoring_threshold,
+            cascade_margin=cascade_margin,
+            model=model,
+            quick_model=quick_model,
+            scoring_concurrency=scoring_concurrency,
+        )
+        job = job_manager.submit(run_analysis, request, label=job_description.strip().splitlines()[0][:80])
+        st.session_state.job_id = job.id
+
+    if job is None:
+        return
+    if job.is_finished:
+        render_job_result(job, scoring_threshold)
+    else:
+        render_job_progress(job.id)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,205 @@
+import argparse
+import json
+import random
+import re
+import sys
+import time
+
+from src.resume_shortlisting.contact_fields import (
+    clean_text,
+    extract_contact_fields_batch,
+    extract_email,
+    extract_mobile,
+    extract_name,
+)
+
+
+# Verbatim copies of the original ExtractResumeText methods, kept as the
+# reference the compiled engine must reproduce.
+class ReferenceExtractor:
+    def _clean_text(self, text: str) -> str:
+        text = re.sub(r'\s+', ' ', text)
+        text = ''.join(char for char in text if ord(char) < 127)
+        text = re.sub(r'[^\w\s\.\,\-\@\(\)\+\/\:]', ' ', text)
+        return text.strip()
+
+    def _extract_name(self, text: str) -> str:
+        lines = text.split('\n')
+        for line in lines[:10]:
+            line = line.strip()
+            if line and len(line) > 2:
+                skip_keywords = ['email', 'phone', 'mobile', 'address', 'resume', 'cv', 'objective', 'summary', 'profile', 'contact', 'linkedin', 'github']
+                if not any(keyword in line.lower() for keyword in skip_keywords):
+                    if re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$', line) and len(line.split()) <= 4:
+                        return line
+                    if re.match(r'^[A-Z]\.?\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$', line):
+                        return line
+
+        words = text.split()[:20]
+        potential_name = []
+        for word in words:
+            if word.istitle() and len(word) > 1 and word.isalpha():
+                potential_name.append(word)
+                if len(potential_name) >= 2:
+                    break
+
+        if potential_name:
+            return ' '.join(potential_name)
+
+        return "Not found"
+
+    def _extract_mobile(self, text: str) -> str:
+        patterns = [
+            r'(?:\+91|91)[-\s]?[6-9]\d{9}',
+            r'[6-9]\d{9}',
+            r'\+\d{1,3}[-\s]?\d{3}[-\s]?\d{3}[-\s]?\d{4}',
+            r'\(\d{3}\)[-\s]?\d{3}[-\s]?\d{4}',
+            r'\d{3}[-\s]?\d{3}[-\s]?\d{4}',
+            r'\d{10}',
+        ]
+
+        for pattern in patterns:
+            matches = re.findall(pattern, text)
+            if matches:
+                mobile = re.sub(r'[-\s]', '', matches[0])
+                return mobile
+
+        return "Not found"
+
+    def _extract_email(self, text: str) -> str:
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        matches = re.findall(email_pattern, text)
+        if matches:
+            return matches[0]
+        return "Not found"
+
+
+HANDWRITTEN_FIXTURES = [
+    "",
+    "John Smith\nSoftware Engineer\njohn.smith@example.com\n+91 9876543210",
+    "RESUME\nA. Kumar\nPhone: (555) 123-4567 Email: a.kumar@mail.co.in",
+    "Priya Sharma 919876543210 priya@x.io Python developer",
+    "Contact: 555-123-4567, also +1 555 123 4567 and 9123456789",
+    "jane doe lowercase name email: JANE@EXAMPLE.COM phone 020 7946 0958",
+    "Objective\nMcDonald O'Neil\nreach me at 91-8123456789 or m.oneil@corp.example",
+    "Résumé — José Ñúñez • +34 612 345 678 • jose.nunez@correo.es Madrid",
+    "digits only 12345678901234567890 and 1234567890 and 6789012345",
+    "email inside digits 9876543210@numbers.com and 8765432109",
+    "Name: Alex\tBrown\r\nMobile :  +44-207-946-0958\n\n\nSkills: C++, C#, .NET",
+    "|A|B|C| weird punctuation {curly} [square] <angle> ~tilde~ `tick` \x7f del \x00 nul",
+    "Dr Ann Lee Phd Mba Cfa Xyz another Title Case Sentence Here With Many Words",
+    "no contact details at all, just text about python and sql",
+    "+919876543210+918765432109 (123)456-7890 (123) 456 7890",
+]
+
+FIRST_NAMES = ['John', 'Priya', 'Ann', 'Wei', 'Olu', 'María', 'Lars', 'A.', 'mary', 'JOHN']
+LAST_NAMES = ['Smith', 'Sharma', 'Lee', 'Zhang', 'Adeyemi', 'García', 'Berg', 'Kumar']
+PHONE_FORMATS = [
+    '+91 9{0}', '91{1}', '9{0}', '+1 {2}-{3}-{4}', '({2}) {3}-{4}', '{2}-{3}-{4}', '{2} {3} {4}', '{2}{3}{4}', '',
+]
+FILLER = [
+    'Experienced engineer', 'SKILLS Python, Django, AWS', 'Summary:', 'Profile', 'built APIs',
+    'EDUCATION B.Tech 2015-2019', 'Led a team of 5', 'GitHub: github.com/user', 'Address: 12 Main St',
+    'ID 00123', 'Salary 1200000', '2019 - 2023', 'Hobbies: chess', '•', '—', 'naïve café',
+]
+
+
+def generate_fixtures(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    fixtures = []
+    for _ in range(count):
+        digits = ''.join(rng.choice('0123456789') for _ in range(9))
+        phone = rng.choice(PHONE_FORMATS).format(
+            digits, '6' + digits, digits[:3], digits[3:6], digits[5:9]
+        )
+        email = rng.choice(['', f"{rng.choice(LAST_NAMES).lower()}.{rng.randint(1, 99)}@example.com"])
+        parts = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"]
+        parts += rng.sample(FILLER, rng.randint(3, 10))
+        parts.insert(rng.randint(0, len(parts)), phone)
+        parts.insert(rng.randint(0, len(parts)), email)
+        separator = rng.choice(['\n', ' ', ' | ', '\n\n'])
+        fixtures.append(separator.join(parts) + ' ' + ' '.join(rng.sample(FILLER, 5)) * rng.randint(1, 40))
+    return fixtures
+
+
+def check_identical(texts):
+    reference = ReferenceExtractor()
+    mismatches = []
+    for text in texts:
+        for variant in (text, reference._clean_text(text)):
+            expected = (
+                reference._clean_text(variant),
+                reference._extract_name(variant),
+                reference._extract_mobile(variant),
+                reference._extract_email(variant),
+            )
+            actual = (clean_text(variant), extract_name(variant), extract_mobile(variant), extract_email(variant))
+            if expected != actual:
+                mismatches.append({'text': variant[:120], 'expected': expected[1:], 'actual': actual[1:]})
+    return mismatches
+
+
+def _time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(texts, repeat: int = 5):
+    reference = ReferenceExtractor()
+    cleaned = [reference._clean_text(text) for text in texts]
+
+    def reference_pass():
+        for text in texts:
+            cleaned_text = reference._clean_text(text)
+            reference._extract_name(cleaned_text)
+            reference._extract_mobile(cleaned_text)
+            reference._extract_email(cleaned_text)
+
+    def engine_pass():
+        extract_contact_fields_batch(clean_text(text) for text in texts)
+
+    def reference_fields_only():
+        for text in cleaned:
+            reference._extract_name(text)
+            reference._extract_mobile(text)
+            reference._extract_email(text)
+
+    def engine_fields_only():
+        extract_contact_fields_batch(cleaned)
+
+    results = {
+        'texts': len(texts),
+        'total_chars': sum(len(text) for text in texts),
+        'reference_seconds': _time(reference_pass, repeat),
+        'engine_seconds': _time(engine_pass, repeat),
+        'reference_fields_seconds': _time(reference_fields_only, repeat),
+        'engine_fields_seconds': _time(engine_fields_only, repeat),
+    }
+    results['speedup'] = results['reference_seconds'] / results['engine_seconds']
+    results['fields_speedup'] = results['reference_fields_seconds'] / results['engine_fields_seconds']
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the compiled contact-field engine with the original methods.")
+    parser.add_argument('--fixtures', type=int, default=2000, help="Number of generated fixture texts")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    texts = HANDWRITTEN_FIXTURES + generate_fixtures(args.fixtures, args.seed)
+    mismatches = check_identical(texts)
+    results = run_benchmark(texts, args.repeat)
+    results['mismatches'] = len(mismatches)
+    print(json.dumps(results, indent=2))
+    for mismatch in mismatches[:10]:
+        print(json.dumps(mismatch), file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
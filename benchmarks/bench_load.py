@@ -0,0 +1,226 @@
+import os
+
+# Keep crewai from phoning home or prompting about traces during timed runs.
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('CREWAI_TESTING', 'true')
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.corpus import SAMPLE_JOB_DESCRIPTION, generate_corpus
+from benchmarks.fake_openai import FakeOpenAIServer, add_server_arguments, settings_from_args
+
+# How often a simulated session checks on its job. Much finer than the app's
+# one-second refresh, so the poll interval does not show in the latencies.
+POLL_SECONDS = 0.01
+PERCENTILES = (50, 95, 99)
+
+
+def load_app():
+    # app.py draws its page header on import. Outside `streamlit run` that is
+    # a no-op that logs a warning per element.
+    from streamlit import logger
+
+    logger.set_log_level(logging.ERROR)
+    import app
+    return app
+
+
+def summarize(values):
+    if not values:
+        return {}
+    summary = {f'p{q}': float(np.percentile(values, q)) for q in PERCENTILES}
+    summary.update(mean=float(np.mean(values)), max=float(np.max(values)))
+    return summary
+
+
+def run_sessions(app, files, args, base_url: str, cache_dir: Path):
+    from src.resume_shortlisting.cache import ExtractionCache
+    from src.resume_shortlisting.crew import ResumeShortlistingCrew
+    from src.resume_shortlisting.jobs import JobManager
+
+    modes = {
+        'single': app.SINGLE_PROMPT_MODE,
+        'per-candidate': app.PER_CANDIDATE_MODE,
+        'cascade': app.CASCADE_MODE,
+    }
+    # One of each shared resource, as a single app process has them; JD
+    # analyses and responses are not cached, so every run reaches the server.
+    manager = JobManager(max_workers=args.job_workers)
+    crew_template = ResumeShortlistingCrew(base_url=base_url)
+    extraction_cache = ExtractionCache(cache_dir / 'extraction.sqlite3')
+    runs = []
+    lock = threading.Lock()
+
+    def session(index: int):
+        if args.ramp:
+            time.sleep(args.ramp * index / args.sessions)
+        for run in range(args.runs):
+            offset = (index * args.runs + run) * args.resumes
+            batch = [files[(offset + k) % len(files)] for k in range(args.resumes)]
+            request = app.AnalysisRequest(
+                job_description=SAMPLE_JOB_DESCRIPTION,
+                roles=None,
+                files=batch,
+                pool_ids=[],
+                crew_template=crew_template,
+                api_key='sk-fake',
+                extraction_cache=extraction_cache,
+                response_cache=None,
+                store=None,
+                store_enabled=False,
+                extraction_workers=args.extraction_workers,
+                max_pages=app.DEFAULT_MAX_PAGES,
+                max_chars=app.DEFAULT_MAX_CHARS,
+                extraction_fallback=True,
+                dedup_enabled=True,
+                dedup_threshold=app.DEFAULT_SIMILARITY,
+                prefilter_enabled=False,
+                prefilter_top_k=args.resumes,
+                prefilter_cutoff=0.0,
+                compaction_enabled=True,
+                token_budget=app.DEFAULT_TOKEN_BUDGET,
+                scoring_mode=modes[args.scoring_mode],
+                scoring_threshold=args.threshold,
+                cascade_margin=args.cascade_margin,
+                model=args.model,
+                quick_model=args.quick_model,
+                scoring_concurrency=args.concurrency,
+            )
+            start = time.perf_counter()
+            job = manager.submit(app.run_analysis, request, label=f"session {index}")
+            while not job.is_finished:
+                time.sleep(POLL_SECONDS)
+            record = {
+                'session': index,
+                'seconds': time.perf_counter() - start,
+                'queued_seconds': (job.started or job.finished) - job.created,
+                'candidates': 0,
+                'error': None if job.error is None else str(job.error),
+            }
+            if job.error is None:
+                record['candidates'] = len(job.result.df)
+                record['failed_candidates'] = int((job.result.df['Questions for Interview'] == 'Evaluation failed').sum())
+            with lock:
+                runs.append(record)
+
+    threads = [threading.Thread(target=session, args=(i,), name=f'session-{i}') for i in range(args.sessions)]
+    start = time.perf_counter()
+    # crewai's verbose console output would otherwise dominate the run.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return runs, time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    from src.resume_shortlisting.metrics import DEFAULT_MODEL, DEFAULT_QUICK_MODEL
+    from src.resume_shortlisting.ratelimit import (
+        DEFAULT_MAX_CONCURRENCY,
+        DEFAULT_RPM,
+        DEFAULT_TPM,
+        configure_scheduler,
+        scheduler_stats,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent screening sessions of the app against a local fake OpenAI server."
+    )
+    parser.add_argument('--sessions', type=int, default=8, help="Concurrent recruiters, each running analyses back to back")
+    parser.add_argument('--runs', type=int, default=2, help="Analyses per session")
+    parser.add_argument('--resumes', type=int, default=10, help="Resumes uploaded per analysis")
+    parser.add_argument('--ramp', type=float, default=0.0, help="Seconds over which session starts are spread")
+    parser.add_argument('--scoring-mode', choices=['single', 'per-candidate', 'cascade'], default='per-candidate')
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent scoring calls per analysis")
+    parser.add_argument('--threshold', type=float, default=7.0, help="Score threshold, used by the cascade")
+    parser.add_argument('--cascade-margin', type=float, default=1.5)
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--quick-model', default=DEFAULT_QUICK_MODEL)
+    parser.add_argument('--job-workers', type=int, default=4, help="Analyses the app process runs at once")
+    parser.add_argument('--extraction-workers', type=int, default=1, help="PDF extraction processes per analysis")
+    parser.add_argument('--files', type=int, default=40, help="Synthetic resumes to generate and rotate through")
+    parser.add_argument('--max-pages', type=int, default=2)
+    parser.add_argument('--corpus-dir', type=Path, help="Reuse or create the corpus here instead of a temp directory")
+    parser.add_argument('--rpm', type=int, default=DEFAULT_RPM, help="Client-side requests per minute (0 disables)")
+    parser.add_argument('--tpm', type=int, default=DEFAULT_TPM, help="Client-side tokens per minute (0 disables)")
+    parser.add_argument('--max-inflight', type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument(
+        '--base-url', help="Load an already running OpenAI-compatible server instead of starting the fake one"
+    )
+    add_server_arguments(parser)
+    parser.add_argument('--output', type=Path, help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+    if not 1 <= args.max_pages <= 5:
+        parser.error("--max-pages must be between 1 and 5")
+
+    for model in {args.model, args.quick_model}:
+        configure_scheduler(model, rpm=args.rpm or None, tpm=args.tpm or None, max_concurrency=args.max_inflight)
+    app = load_app()
+
+    with contextlib.ExitStack() as stack:
+        work_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        corpus_dir = args.corpus_dir or work_dir / 'corpus'
+        # --seed also fixes the corpus, so a seeded run is fully repeatable.
+        paths = generate_corpus(corpus_dir, args.files, 1, args.max_pages, args.seed or 0)
+        files = [(path.name, path.read_bytes()) for path in paths]
+        server = None
+        base_url = args.base_url
+        if base_url is None:
+            server = stack.enter_context(FakeOpenAIServer(settings_from_args(args)))
+            base_url = server.url
+        runs, wall_seconds = run_sessions(app, files, args, base_url, work_dir)
+        server_stats = server.stats() if server else None
+
+    succeeded = [run for run in runs if run['error'] is None]
+    candidates = sum(run['candidates'] for run in succeeded)
+    results = {
+        'analyses': len(runs),
+        'failed_analyses': len(runs) - len(succeeded),
+        'failed_candidates': sum(run.get('failed_candidates', 0) for run in succeeded),
+        'candidates': candidates,
+        'wall_seconds': wall_seconds,
+        'latency_seconds': summarize([run['seconds'] for run in succeeded]),
+        'queued_seconds': summarize([run['queued_seconds'] for run in runs]),
+        'throughput': {
+            'analyses_per_minute': len(succeeded) / wall_seconds * 60 if wall_seconds else 0.0,
+            'candidates_per_second': candidates / wall_seconds if wall_seconds else 0.0,
+        },
+        'errors': sorted({run['error'] for run in runs if run['error']})[:10],
+        'server': server_stats,
+        'scheduler': scheduler_stats(),
+    }
+    output = {
+        'benchmark': 'load',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'parameters': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        'results': results,
+    }
+
+    text = json.dumps(output, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+    return 1 if results['failed_analyses'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
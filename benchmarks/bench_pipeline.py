@@ -0,0 +1,304 @@
+import os
+
+# Keep crewai from phoning home or prompting about traces during timed runs.
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('CREWAI_TESTING', 'true')
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from crewai.llms.base_llm import BaseLLM
+from PyPDF2 import PdfReader
+
+from benchmarks.corpus import MAX_FILES, MIN_FILES, SAMPLE_JOB_DESCRIPTION, generate_corpus, synthetic_response
+from src.resume_shortlisting.compaction import DEFAULT_TOKEN_BUDGET, compact_resumes
+from src.resume_shortlisting.crew import ResumeShortlistingCrew
+from src.resume_shortlisting.export import EXPORT_FORMATS, write_export
+from src.resume_shortlisting.extraction import default_worker_count, extract_resumes
+from src.resume_shortlisting.parsing import parse_candidate_header, parse_evaluations
+from src.resume_shortlisting.report import create_pdf_report
+from src.resume_shortlisting.screening import screen_per_candidate, screen_single_prompt
+from src.resume_shortlisting.tools.custom_tool import ExtractResumeText
+
+MANIFEST = 'corpus.json'
+SIZE_KEYS = ('records', 'rows', 'files', 'workers', 'llm_latency_seconds')
+_RESUME_HEADING = re.compile(r'=== RESUME (\d+) ===\n(.*?)(?==== RESUME \d+ ===|\Z)', re.DOTALL)
+
+
+class StubLLM(BaseLLM):
+    """Answers every prompt locally in the format the tasks ask for."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(model='stub')
+        self.latency = latency
+        self.calls = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages if isinstance(messages, str) else messages[-1]['content']
+        resumes = _RESUME_HEADING.findall(prompt)
+        if not resumes:
+            return "Thought: I have analyzed the job description.\nFinal Answer: Python, Django, PostgreSQL, AWS; 5+ years."
+        records = []
+        for resume_id, resume in resumes:
+            fields = parse_candidate_header(resume)
+            records.append(json.dumps({
+                "resume_id": int(resume_id),
+                "name": fields.get('name', 'Not found'),
+                "mobile": fields.get('mobile', 'Not found'),
+                "score": 7.5,
+                "questions": ["Describe a system you scaled.", "How do you test data pipelines?"],
+                "reasoning": "Stubbed evaluation.",
+            }))
+        return "Thought: I have scored every resume.\nFinal Answer:\n" + '\n'.join(records)
+
+
+class StubbedCrew(ResumeShortlistingCrew):
+    def __init__(self, latency: float = 0.0):
+        # CrewBase builds the agents during __init__, so the latency must be set first.
+        self.latency = latency
+        super().__init__(api_key='sk-benchmark')
+
+    def _build_llm(self, stream: bool = False, model=None):
+        return StubLLM(self.latency)
+
+
+def _time(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        'best_seconds': min(samples),
+        'median_seconds': statistics.median(samples),
+        'mean_seconds': statistics.fmean(samples),
+        'repeat': repeat,
+    }
+
+
+def prepare_corpus(corpus_dir: Path, files: int, min_pages: int, max_pages: int, seed: int):
+    # A corpus is regenerated only when its parameters change, since
+    # thousands of multi-page PDFs take a while to build.
+    parameters = {'files': files, 'min_pages': min_pages, 'max_pages': max_pages, 'seed': seed}
+    manifest_path = corpus_dir / MANIFEST
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get('parameters') == parameters:
+            return [corpus_dir / name for name in manifest['files']], manifest['pages']
+
+    paths = generate_corpus(corpus_dir, files, min_pages, max_pages, seed)
+    pages = sum(len(PdfReader(path).pages) for path in paths)
+    manifest_path.write_text(json.dumps({
+        'parameters': parameters,
+        'files': [path.name for path in paths],
+        'pages': pages,
+    }))
+    return paths, pages
+
+
+def bench_extraction(paths, pages: int, repeat: int, workers: int):
+    extractor = ExtractResumeText()
+    files = [(path.name, path.read_bytes()) for path in paths]
+
+    sequential = _time(lambda: [extractor._run(str(path)) for path in paths], repeat)
+    pooled = _time(lambda: extract_resumes(files, max_workers=workers), repeat)
+    for result in (sequential, pooled):
+        result['files_per_second'] = len(paths) / result['best_seconds']
+        result['pages_per_second'] = pages / result['best_seconds']
+    pooled['workers'] = workers
+    return {'extract_run_sequential': sequential, 'extract_resumes_pooled': pooled}
+
+
+def bench_parsing(records: int, repeat: int):
+    response = synthetic_response(records)
+    result = _time(lambda: parse_evaluations(response), repeat)
+    parsed = parse_evaluations(response)
+    result.update({
+        'records': records,
+        'response_chars': len(response),
+        'records_per_second': records / result['best_seconds'],
+        'valid_records': len(parsed.evaluations),
+    })
+    return {'parse_evaluations': result}
+
+
+def bench_report(rows: int, repeat: int):
+    evaluations = parse_evaluations(synthetic_response(rows)).evaluations
+    df = pd.DataFrame([evaluation.to_row() for evaluation in evaluations.values()])
+    result = _time(lambda: create_pdf_report(df, 'benchmark.pdf'), repeat)
+    result.update({
+        'rows': len(df),
+        'rows_per_second': len(df) / result['best_seconds'],
+        'pdf_bytes': len(create_pdf_report(df, 'benchmark.pdf').getvalue()),
+    })
+    results = {'create_pdf_report': result}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in EXPORT_FORMATS:
+            target = Path(tmp) / f'benchmark.{fmt}'
+            result = _time(lambda: write_export(df, fmt, target), repeat)
+            tracemalloc.start()
+            write_export(df, fmt, target)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            result.update({
+                'rows': len(df),
+                'rows_per_second': len(df) / result['best_seconds'],
+                'bytes': target.stat().st_size,
+                'peak_python_mb': peak / 1e6,
+            })
+            results[f'export_{fmt}_to_disk'] = result
+    return results
+
+
+def _end_to_end(paths, workers: int, latency: float, per_candidate: bool, concurrency: int):
+    stages = {}
+
+    start = time.perf_counter()
+    outcomes = extract_resumes([(path.name, path.read_bytes()) for path in paths], max_workers=workers)
+    resumes = [outcome.text for outcome in outcomes if outcome.ok]
+    stages['extract_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resumes, _ = compact_resumes(resumes, SAMPLE_JOB_DESCRIPTION, DEFAULT_TOKEN_BUDGET)
+    stages['compact_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    crew_instance = StubbedCrew(latency)
+    # crewai's verbose console output would otherwise dominate the timings.
+    with contextlib.redirect_stdout(io.StringIO()):
+        if per_candidate:
+            result = screen_per_candidate(crew_instance, SAMPLE_JOB_DESCRIPTION, resumes, concurrency)
+        else:
+            result = screen_single_prompt(crew_instance, SAMPLE_JOB_DESCRIPTION, resumes)
+    stages['screen_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = pd.DataFrame(result.rows(resumes))
+    create_pdf_report(df.sort_values('Score', ascending=False), 'benchmark.pdf')
+    stages['report_seconds'] = time.perf_counter() - start
+
+    stages['total_seconds'] = sum(stages.values())
+    stages['candidates'] = len(result.evaluations)
+    stages['failures'] = len(result.failures)
+    return stages
+
+
+def bench_end_to_end(paths, workers: int, latency: float, concurrency: int, repeat: int):
+    results = {}
+    for name, per_candidate in (('end_to_end_single_prompt', False), ('end_to_end_per_candidate', True)):
+        runs = [_end_to_end(paths, workers, latency, per_candidate, concurrency) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['total_seconds'])
+        results[name] = {
+            **best,
+            'best_seconds': best['total_seconds'],
+            'median_seconds': statistics.median(run['total_seconds'] for run in runs),
+            'repeat': repeat,
+            'files': len(paths),
+            'llm_latency_seconds': latency,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for name, current in results['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or 'best_seconds' not in previous:
+            continue
+        if any(current.get(key) != previous.get(key) for key in SIZE_KEYS):
+            # Timings of differently sized workloads are not comparable.
+            continue
+        ratio = current['best_seconds'] / previous['best_seconds']
+        current['baseline_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {previous['best_seconds']:.4f}s -> {current['best_seconds']:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time extraction, parsing, report export and stubbed end-to-end screening.")
+    parser.add_argument(
+        '--files', type=int, default=50, help=f"Synthetic resumes to generate ({MIN_FILES} to {MAX_FILES:,})"
+    )
+    parser.add_argument('--min-pages', type=int, default=1)
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus-dir', type=Path, help="Reuse or create the corpus here instead of a temp directory")
+    parser.add_argument('--response-records', type=int, default=5000, help="Records in the synthetic AI response")
+    parser.add_argument('--report-rows', type=int, default=10000, help="Rows in the benchmarked report exports")
+    parser.add_argument('--e2e-files', type=int, default=20, help="Resumes per stubbed end-to-end run")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Seconds the stubbed LLM sleeps per call")
+    parser.add_argument('--concurrency', type=int, default=4, help="Per-candidate scoring concurrency")
+    parser.add_argument('--workers', type=int, default=default_worker_count())
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', choices=['extraction', 'parsing', 'report', 'end_to_end'], action='append')
+    parser.add_argument('--output', type=Path, help="Write the JSON results to this file")
+    parser.add_argument('--compare', type=Path, help="Baseline JSON to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    if not MIN_FILES <= args.files <= MAX_FILES:
+        parser.error(f"--files must be between {MIN_FILES} and {MAX_FILES:,}")
+    if not 1 <= args.min_pages <= args.max_pages <= 5:
+        parser.error("page counts must satisfy 1 <= --min-pages <= --max-pages <= 5")
+    selected = set(args.only or ['extraction', 'parsing', 'report', 'end_to_end'])
+
+    with contextlib.ExitStack() as stack:
+        corpus_dir = args.corpus_dir or Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        results = {}
+        if selected & {'extraction', 'end_to_end'}:
+            paths, pages = prepare_corpus(corpus_dir, args.files, args.min_pages, args.max_pages, args.seed)
+        if 'extraction' in selected:
+            results.update(bench_extraction(paths, pages, args.repeat, args.workers))
+        if 'parsing' in selected:
+            results.update(bench_parsing(args.response_records, args.repeat))
+        if 'report' in selected:
+            results.update(bench_report(args.report_rows, args.repeat))
+        if 'end_to_end' in selected:
+            results.update(bench_end_to_end(
+                paths[:args.e2e_files], args.workers, args.llm_latency, args.concurrency, args.repeat
+            ))
+
+    output = {
+        'benchmark': 'pipeline',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'parameters': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        'results': results,
+    }
+    regressions = []
+    if args.compare:
+        regressions = compare(output, json.loads(args.compare.read_text()), args.tolerance)
+        output['regressions'] = regressions
+
+    text = json.dumps(output, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
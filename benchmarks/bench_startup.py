@@ -0,0 +1,108 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter per sample, since a warm process would hide
+# exactly the import and construction costs being measured.
+CHILD = r'''
+import json, os, sys, time
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('CREWAI_TESTING', 'true')
+sys.path.insert(0, os.getcwd())
+timings = {}
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+timings['streamlit_import'] = time.perf_counter() - start
+
+app = AppTest.from_file('app.py', default_timeout=300)
+start = time.perf_counter()
+app.run()
+timings['first_render'] = time.perf_counter() - start
+
+start = time.perf_counter()
+app.run()
+timings['rerun'] = time.perf_counter() - start
+
+start = time.perf_counter()
+app.text_input[0].input('sk-' + 'a' * 48).run()
+timings['api_key_entered'] = time.perf_counter() - start
+
+# What the first "Analyze" click still has to wait for before the crew runs.
+start = time.perf_counter()
+from src.resume_shortlisting.crew import ResumeShortlistingCrew
+timings['crew_import_after_render'] = time.perf_counter() - start
+start = time.perf_counter()
+ResumeShortlistingCrew(api_key='sk-benchmark')
+timings['crew_construct'] = time.perf_counter() - start
+start = time.perf_counter()
+ResumeShortlistingCrew(api_key='sk-benchmark')
+timings['crew_construct_again'] = time.perf_counter() - start
+
+timings['first_interaction_total'] = (
+    timings['first_render'] + timings['api_key_entered']
+    + timings['crew_import_after_render'] + timings['crew_construct']
+)
+print(json.dumps(timings))
+'''
+
+
+def measure(tree: Path, samples: int):
+    runs = []
+    for _ in range(samples):
+        completed = subprocess.run(
+            [sys.executable, '-c', CHILD], cwd=tree, capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        name: {
+            'median_seconds': statistics.median(run[name] for run in runs),
+            'best_seconds': min(run[name] for run in runs),
+        }
+        for name in runs[0]
+    }
+
+
+def export_revision(revision: str, destination: Path) -> Path:
+    archive = destination / 'tree.tar'
+    with open(archive, 'wb') as f:
+        subprocess.run(['git', 'archive', revision], cwd=REPO_ROOT, stdout=f, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(destination / 'tree')
+    return destination / 'tree'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure app startup and first-interaction latency.")
+    parser.add_argument('--samples', type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument('--baseline-rev', help="Also measure this git revision, e.g. HEAD~1")
+    parser.add_argument('--output', type=Path, help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    output = {'benchmark': 'startup', 'samples': args.samples, 'current': measure(REPO_ROOT, args.samples)}
+    if args.baseline_rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            output['baseline_rev'] = args.baseline_rev
+            output['baseline'] = measure(export_revision(args.baseline_rev, Path(tmp)), args.samples)
+        output['speedup'] = {
+            name: output['baseline'][name]['median_seconds'] / timing['median_seconds']
+            for name, timing in output['current'].items()
+            if name in output['baseline'] and timing['median_seconds'] > 0
+        }
+
+    text = json.dumps(output, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+FIRST_NAMES = ['John', 'Priya', 'Ann', 'Wei', 'Olu', 'Maria', 'Lars', 'Aisha', 'Kenji', 'Fatima', 'Diego', 'Nina']
+LAST_NAMES = ['Smith', 'Sharma', 'Lee', 'Zhang', 'Adeyemi', 'Garcia', 'Berg', 'Kumar', 'Tanaka', 'Haddad']
+SKILLS = [
+    'Python', 'Django', 'Flask', 'FastAPI', 'SQL', 'PostgreSQL', 'AWS', 'Docker', 'Kubernetes', 'React',
+    'TypeScript', 'Java', 'Spring', 'Go', 'Rust', 'Terraform', 'Spark', 'Airflow', 'Pandas', 'PyTorch',
+    'TensorFlow', 'Redis', 'Kafka', 'GraphQL', 'CI/CD', 'Linux', 'Machine Learning', 'Data Modeling',
+]
+ROLES = ['Software Engineer', 'Data Engineer', 'Backend Developer', 'ML Engineer', 'DevOps Engineer', 'Analyst']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli']
+VERBS = ['Built', 'Designed', 'Led', 'Migrated', 'Optimized', 'Automated', 'Maintained', 'Scaled']
+OBJECTS = [
+    'a payments API', 'the data platform', 'an internal dashboard', 'a recommendation service',
+    'the CI pipeline', 'a reporting warehouse', 'customer onboarding flows', 'a search index',
+]
+SECTIONS_PER_PAGE = 4
+MIN_FILES = 10
+MAX_FILES = 10_000
+
+SAMPLE_JOB_DESCRIPTION = (
+    "We are hiring a Senior Backend Engineer with 5+ years of experience in Python, Django or FastAPI, "
+    "PostgreSQL and AWS. Experience with Docker, Kubernetes and Kafka is a plus. The role involves designing "
+    "APIs, optimizing data pipelines and mentoring junior engineers."
+)
+
+
+def _bullet(rng: random.Random) -> str:
+    skill = rng.choice(SKILLS)
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skill}, improving throughput by {rng.randint(5, 80)}%."
+
+
+def _resume_story(rng: random.Random, index: int, pages: int):
+    styles = getSampleStyleSheet()
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    phone = f"+91 {rng.randint(6, 9)}{rng.randint(0, 999999999):09d}"
+    email = f"{name.split()[0].lower()}.{index}@example.com"
+
+    story = [
+        Paragraph(name, styles['Title']),
+        Paragraph(f"Phone: {phone} | Email: {email}", styles['Normal']),
+        Spacer(1, 12),
+        Paragraph("Summary", styles['Heading2']),
+        Paragraph(
+            f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in "
+            f"{', '.join(rng.sample(SKILLS, 4))}.",
+            styles['Normal']
+        ),
+        Paragraph("Skills", styles['Heading2']),
+        Paragraph(', '.join(rng.sample(SKILLS, rng.randint(6, 14))), styles['Normal']),
+    ]
+    for page in range(pages):
+        if page:
+            story.append(PageBreak())
+        for _ in range(SECTIONS_PER_PAGE):
+            start = rng.randint(2005, 2020)
+            story.append(Paragraph(
+                f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})",
+                styles['Heading3']
+            ))
+            for _ in range(rng.randint(3, 6)):
+                story.append(Paragraph(f"• {_bullet(rng)}", styles['Normal']))
+    story.append(Paragraph("Education", styles['Heading2']))
+    story.append(Paragraph(f"B.Tech in Computer Science, {rng.randint(2000, 2020)}", styles['Normal']))
+    return story
+
+
+def generate_corpus(output_dir, count: int, min_pages: int = 1, max_pages: int = 5, seed: int = 0) -> List[Path]:
+    # invariant=1 strips timestamps and random document ids, so the same seed
+    # always produces byte-identical files.
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        pages = rng.randint(min_pages, max_pages)
+        path = output_dir / f"resume_{index:05d}.pdf"
+        doc = SimpleDocTemplate(str(path), pagesize=letter, invariant=1)
+        doc.build(_resume_story(rng, index, pages))
+        paths.append(path)
+    return paths
+
+
+def synthetic_response(count: int, seed: int = 0) -> str:
+    # A JSON Lines answer in the format the scoring tasks request, with the
+    # occasional chatter line a model adds around the records.
+    rng = random.Random(seed)
+    lines = ["Final Answer:"]
+    for resume_id in range(1, count + 1):
+        lines.append(json.dumps({
+            "resume_id": resume_id,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "mobile": f"+91{rng.randint(6, 9)}{rng.randint(0, 999999999):09d}",
+            "score": round(rng.uniform(0, 10), 1),
+            "questions": [f"How did you use {rng.choice(SKILLS)} at {rng.choice(COMPANIES)}?" for _ in range(3)],
+            "reasoning": ' '.join(_bullet(rng) for _ in range(3)),
+        }))
+        if rng.random() < 0.01:
+            lines.append("")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic resume PDF corpus.")
+    parser.add_argument('output_dir', type=Path)
+    parser.add_argument('--files', type=int, default=100, help=f"Number of resumes ({MIN_FILES} to {MAX_FILES:,})")
+    parser.add_argument('--min-pages', type=int, default=1)
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not MIN_FILES <= args.files <= MAX_FILES:
+        parser.error(f"--files must be between {MIN_FILES} and {MAX_FILES:,}")
+    if not 1 <= args.min_pages <= args.max_pages <= 5:
+        parser.error("page counts must satisfy 1 <= --min-pages <= --max-pages <= 5")
+    paths = generate_corpus(args.output_dir, args.files, args.min_pages, args.max_pages, args.seed)
+    print(f"Wrote {len(paths)} resume(s) to {args.output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,379 @@
+import argparse
+import collections
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from src.resume_shortlisting.parsing import parse_candidate_header
+from src.resume_shortlisting.skills import default_taxonomy
+
+TASKS_PATH = Path(__file__).resolve().parent.parent / 'src' / 'resume_shortlisting' / 'config' / 'tasks.yaml'
+CHARS_PER_TOKEN = 4
+# Streamed answers are sent in pieces of about this many tokens.
+STREAM_CHUNK_TOKENS = 8
+RATE_WINDOW = 60.0
+SCORE_CHARS = 300
+_RESUME_HEADING = re.compile(r'=== RESUME (\d+) ===\n(.*?)(?==== RESUME \d+ ===|\Z)', re.DOTALL)
+_QUESTIONS = [
+    "Walk us through the hardest production issue you debugged.",
+    "How would you design this system for ten times the load?",
+    "Which trade-offs did you make in your most recent project?",
+]
+
+
+@dataclass
+class FakeOpenAISettings:
+    # Seconds before the first token, and how far each request may stray
+    # from it (0.25 means +/-25%).
+    latency: float = 0.5
+    latency_jitter: float = 0.0
+    # Completion tokens generated per second; 0 sends the whole answer at once.
+    tokens_per_second: float = 0.0
+    # Requests accepted per rolling minute before answering 429; 0 disables.
+    rpm: int = 0
+    # Share of otherwise accepted requests answered with an injected 429.
+    error_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeOpenAIStats:
+    requests: int = 0
+    completed: int = 0
+    streamed: int = 0
+    rate_limited: int = 0
+    injected_429: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def _load_task_signatures(path: Path = TASKS_PATH) -> List[Tuple[str, str]]:
+    # The first sentence of each description identifies its task in a prompt.
+    with open(path, 'r', encoding='utf-8') as f:
+        tasks = yaml.safe_load(f)
+    signatures = []
+    for name, config in tasks.items():
+        description = _normalize(config.get('description', ''))
+        signatures.append((name, description.split('. ')[0]))
+    # Longer signatures first, in case one task's opening extends another's.
+    return sorted(signatures, key=lambda item: -len(item[1]))
+
+
+def _score(resume: str) -> float:
+    # Stable per resume whichever prompt carries it, so only its opening
+    # (contact fields and skill profile) is hashed. Spread over 3.0-9.9 so
+    # thresholds and the cascade margin both have something to cut.
+    return 3.0 + zlib.crc32(_normalize(resume)[:SCORE_CHARS].encode()) % 70 / 10
+
+
+def _evaluation(resume_id: int, resume: str) -> Dict:
+    fields = parse_candidate_header(resume)
+    skills = default_taxonomy().find(resume)[:3]
+    return {
+        "resume_id": resume_id,
+        "name": fields.get('name', 'Not found'),
+        "mobile": fields.get('mobile', 'Not found'),
+        "score": _score(resume),
+        "questions": _QUESTIONS[:2] if resume_id % 2 else _QUESTIONS[1:],
+        "reasoning": f"Matches on {', '.join(skills)}." if skills else "Few of the required skills are evident.",
+    }
+
+
+def _jd_summary(prompt: str) -> str:
+    job_description = prompt.partition('JD:')[2] or prompt
+    skills = default_taxonomy().find(job_description)
+    must, nice = skills[:max(1, len(skills) * 2 // 3)], skills[max(1, len(skills) * 2 // 3):]
+    lines = ["**Must-Have Skills and Qualifications:**"]
+    lines += [f"- {skill}" for skill in must] or ["- Relevant professional experience"]
+    lines += ["**Nice-to-Have Skills:**"]
+    lines += [f"- {skill}" for skill in nice] or ["- None stated"]
+    lines += ["**Required Years of Experience:** 3+", "**Preferred Industries or Domains:**", "- Software"]
+    return '\n'.join(lines)
+
+
+def _final(answer: str) -> str:
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+class CannedResponder:
+    """Builds the answer to a chat prompt, in the format its `tasks.yaml` task asks for."""
+
+    def __init__(self, tasks_path: Path = TASKS_PATH):
+        self.signatures = _load_task_signatures(tasks_path)
+
+    def task_for(self, prompt: str) -> Optional[str]:
+        normalized = _normalize(prompt)
+        return next((name for name, signature in self.signatures if signature in normalized), None)
+
+    def answer(self, prompt: str) -> Tuple[Optional[str], str]:
+        task = self.task_for(prompt)
+        resumes = [(int(resume_id), resume) for resume_id, resume in _RESUME_HEADING.findall(prompt)]
+        if task == 'analyze_jd':
+            return task, _final(_jd_summary(prompt))
+        if task == 'quick_score' and resumes:
+            resume_id, resume = resumes[0]
+            return task, _final(json.dumps({"resume_id": resume_id, "score": _score(resume)}))
+        if resumes:
+            lines = [json.dumps(_evaluation(resume_id, resume)) for resume_id, resume in resumes]
+            return task, _final('\n'.join(lines))
+        return task, _final("Done.")
+
+
+class FakeOpenAIServer:
+    """An OpenAI-compatible `/v1/chat/completions` endpoint on a background thread.
+
+    Use it as a context manager, or call `start()` and `stop()`; `url` is the
+    base URL to hand to the crew or to OPENAI_BASE_URL.
+    """
+
+    def __init__(self, settings: Optional[FakeOpenAISettings] = None, host: str = '127.0.0.1', port: int = 0):
+        self.settings = settings or FakeOpenAISettings()
+        self.responder = CannedResponder()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._accepted: collections.deque = collections.deque()
+        self._stats = FakeOpenAIStats()
+        self._by_task: Dict[str, int] = collections.Counter()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'FakeOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**asdict(self._stats), 'by_task': dict(self._by_task)}
+
+    def admit(self) -> Tuple[Optional[float], bool]:
+        """(retry_after, injected) for a 429, or (None, False) when the request may proceed."""
+        now = time.monotonic()
+        with self._lock:
+            self._stats.requests += 1
+            while self._accepted and now - self._accepted[0] >= RATE_WINDOW:
+                self._accepted.popleft()
+            if self.settings.rpm and len(self._accepted) >= self.settings.rpm:
+                self._stats.rate_limited += 1
+                return RATE_WINDOW - (now - self._accepted[0]), False
+            if self.settings.error_rate and self._rng.random() < self.settings.error_rate:
+                self._stats.injected_429 += 1
+                return self.settings.retry_after, True
+            self._accepted.append(now)
+            return None, False
+
+    def first_token_delay(self) -> float:
+        jitter = self.settings.latency_jitter
+        with self._lock:
+            factor = 1 + jitter * (2 * self._rng.random() - 1) if jitter else 1.0
+        return max(0.0, self.settings.latency * factor)
+
+    def record(self, task: Optional[str], prompt_tokens: int, completion_tokens: int, stream: bool) -> None:
+        with self._lock:
+            self._stats.completed += 1
+            self._stats.streamed += stream
+            self._stats.prompt_tokens += prompt_tokens
+            self._stats.completion_tokens += completion_tokens
+            self._by_task[task or 'other'] += 1
+
+
+def _handler_for(server: FakeOpenAIServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/models'):
+                self._send_json(200, {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "local"}]})
+            elif self.path.rstrip('/').endswith('/stats'):
+                self._send_json(200, server.stats())
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get('content-length', 0))) or b'{}')
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                return
+            retry_after, injected = server.admit()
+            if retry_after is not None:
+                self._send_json(
+                    429,
+                    {"error": {
+                        "message": "Rate limit reached (injected)" if injected else "Rate limit reached for requests",
+                        "type": "requests", "code": "rate_limit_exceeded",
+                    }},
+                    {
+                        'retry-after-ms': str(int(retry_after * 1000)),
+                        'x-ratelimit-limit-requests': str(server.settings.rpm or 0),
+                        'x-ratelimit-remaining-requests': '0',
+                        'x-ratelimit-reset-requests': f"{retry_after:.3f}s",
+                    },
+                )
+                return
+
+            messages = request.get('messages') or []
+            prompt = '\n'.join(str(message.get('content') or '') for message in messages)
+            task, content = server.responder.answer(prompt)
+            prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+            completion_tokens = max(1, len(content) // CHARS_PER_TOKEN)
+            model = request.get('model', 'gpt-4o-mini')
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            time.sleep(server.first_token_delay())
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+            if request.get('stream'):
+                self._stream(completion_id, model, content, usage, request.get('stream_options') or {})
+            else:
+                if server.settings.tokens_per_second:
+                    time.sleep(completion_tokens / server.settings.tokens_per_second)
+                self._send_json(200, {
+                    "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{
+                        "index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                })
+            server.record(task, prompt_tokens, completion_tokens, bool(request.get('stream')))
+
+        def _stream(self, completion_id: str, model: str, content: str, usage: Dict, options: Dict) -> None:
+            # Server-sent events on a connection closed at the end, so no
+            # chunked transfer encoding is needed.
+            self.send_response(200)
+            self.send_header('content-type', 'text/event-stream')
+            self.send_header('cache-control', 'no-cache')
+            self.send_header('connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+
+            def event(choices, **extra):
+                payload = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": choices, **extra,
+                }
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+                self.wfile.flush()
+
+            step = STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN
+            pause = STREAM_CHUNK_TOKENS / server.settings.tokens_per_second if server.settings.tokens_per_second else 0.0
+            event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            for start in range(0, len(content), step):
+                if pause:
+                    time.sleep(pause)
+                event([{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}])
+            event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if options.get('include_usage'):
+                event([], usage=usage)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeOpenAISettings()
+    parser.add_argument('--latency', type=float, default=defaults.latency, help="Seconds before the first token")
+    parser.add_argument(
+        '--latency-jitter', type=float, default=defaults.latency_jitter,
+        help="Random spread of the latency, as a fraction of it (0.25 is +/-25%%)"
+    )
+    parser.add_argument(
+        '--tokens-per-second', type=float, default=defaults.tokens_per_second,
+        help="Completion tokens generated per second (0 answers at once)"
+    )
+    parser.add_argument(
+        '--server-rpm', type=int, default=defaults.rpm,
+        help="Requests the server accepts per rolling minute before answering 429 (0 disables)"
+    )
+    parser.add_argument(
+        '--error-rate', type=float, default=defaults.error_rate, help="Share of requests answered with an injected 429"
+    )
+    parser.add_argument(
+        '--retry-after', type=float, default=defaults.retry_after, help="Seconds advertised by injected 429s"
+    )
+    parser.add_argument('--seed', type=int, help="Seed for latency jitter and 429 injection")
+
+
+def settings_from_args(args: argparse.Namespace) -> FakeOpenAISettings:
+    return FakeOpenAISettings(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        tokens_per_second=args.tokens_per_second,
+        rpm=args.server_rpm,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local, offline stand-in for the OpenAI chat completions API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(settings_from_args(args), args.host, args.port)
+    print(f"Fake OpenAI API listening on {server.url} (stats at {server.url}/stats); Ctrl+C stops it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.resume_shortlisting.cache import ExtractionCache, JDAnalysisCache, ResponseCache
+from src.resume_shortlisting.compaction import compact_resumes
+from src.resume_shortlisting.crew import DEFAULT_MODEL, DEFAULT_QUICK_MODEL, ResumeShortlistingCrew
+from src.resume_shortlisting.dedup import DEFAULT_SIMILARITY, DuplicateIndex, DuplicateMatch
+from src.resume_shortlisting.export import format_for_path, write_export
+from src.resume_shortlisting.extraction import extract_resumes
+from src.resume_shortlisting.metrics import RunMetrics
+from src.resume_shortlisting.parsing import parse_candidate_header
+from src.resume_shortlisting.screening import (
+    DEFAULT_CASCADE_MARGIN,
+    screen_cascade,
+    screen_per_candidate,
+    screen_single_prompt,
+)
+from src.resume_shortlisting.pdf_text import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+from src.resume_shortlisting.store import CandidateStore
+
+RESULT_FIELDS = [
+    'Source File', 'Name', 'Mobile', 'Score', 'Questions for Interview', 'Reasoning', 'Duplicate Of', 'Decided By',
+    'Must-Have Coverage', 'Missing Must-Haves',
+]
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.completed = set()
+        self.failed: Dict[str, str] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            self.completed = set(data.get('completed', []))
+            self.failed = data.get('failed', {})
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed or key in self.failed
+
+    def record(self, completed: List[str], failed: Dict[str, str]) -> None:
+        self.completed.update(completed)
+        self.failed.update(failed)
+        self.save()
+
+    def save(self) -> None:
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        temp_path.write_text(json.dumps({
+            'completed': sorted(self.completed),
+            'failed': self.failed,
+        }))
+        os.replace(temp_path, self.path)
+
+
+class ResultWriter:
+    def __init__(self, jsonl_path, csv_path=None):
+        self.jsonl_path = Path(jsonl_path)
+        self.csv_path = Path(csv_path) if csv_path else None
+
+    def write(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if self.csv_path:
+            new_file = not self.csv_path.exists() or self.csv_path.stat().st_size == 0
+            with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def iter_pending_chunks(resumes_dir: Path, chunk_size: int, checkpoint: Checkpoint) -> Iterator[List[Path]]:
+    chunk = []
+    for path in sorted(resumes_dir.rglob('*.pdf')):
+        if checkpoint.is_done(path.relative_to(resumes_dir).as_posix()):
+            continue
+        chunk.append(path)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _score_chunk(
+    crew_instance, job_description, sources, resumes, per_candidate, concurrency,
+    cascade_threshold=None, cascade_margin=DEFAULT_CASCADE_MARGIN,
+):
+    if cascade_threshold is not None:
+        result = screen_cascade(
+            crew_instance, job_description, resumes, cascade_threshold, cascade_margin, concurrency
+        )
+    elif per_candidate:
+        result = screen_per_candidate(crew_instance, job_description, resumes, concurrency)
+    else:
+        result = screen_single_prompt(crew_instance, job_description, resumes, max_concurrency=concurrency)
+
+    rows = []
+    coverage = result.coverage(resumes)
+    for resume_id, evaluation in sorted(result.evaluations.items()):
+        row = evaluation.to_row()
+        del row['Resume #']
+        share, missing = coverage.get(resume_id, (None, []))
+        rows.append({
+            'Source File': sources[resume_id - 1], **row, 'Duplicate Of': '',
+            'Decided By': result.decided_by.get(resume_id, ''),
+            'Must-Have Coverage': '' if share is None else round(share * 100),
+            'Missing Must-Haves': ', '.join(missing),
+        })
+    scored = [sources[resume_id - 1] for resume_id in sorted(result.evaluations)]
+    # A response that still fails validation after the re-ask is recorded as
+    # failed, as a file that cannot be read is. Candidates whose call got no
+    # response stay out of the checkpoint, so the next run retries them.
+    rejected = {
+        sources[resume_id - 1]: reason
+        for resume_id, reason in sorted(result.failures.items())
+        if resume_id not in result.call_failures
+    }
+    error = None
+    if result.call_failures:
+        error = '; '.join(
+            f"{sources[resume_id - 1]}: {result.failures[resume_id]}" for resume_id in sorted(result.call_failures)
+        )
+    return rows, scored, rejected, error
+
+
+def _copy_to_duplicates(
+    duplicates: Dict[str, DuplicateMatch],
+    texts: Dict[str, str],
+    scored_rows: Dict[str, Dict],
+    rejected: Dict[str, str],
+):
+    # A duplicate takes its representative's evaluation, which may come from
+    # an earlier chunk of this run, and keeps its own contact details. If the
+    # representative was rejected, the duplicate is failed with it; if its
+    # call got no response, the duplicate stays pending and is retried with
+    # it by the next run.
+    rows, copied, failed, pending = [], [], {}, []
+    for source, match in duplicates.items():
+        representative = scored_rows.get(match.representative)
+        if representative is None:
+            if match.representative in rejected:
+                failed[source] = f"duplicate of {match.representative}, which failed: {rejected[match.representative]}"
+            else:
+                pending.append(source)
+            continue
+        fields = parse_candidate_header(texts[source])
+        rows.append({
+            **representative,
+            'Source File': source,
+            'Name': fields.get('name', representative['Name']),
+            'Mobile': fields.get('mobile', representative['Mobile']),
+            'Duplicate Of': match.representative,
+        })
+        copied.append(source)
+    return rows, copied, failed, pending
+
+
+def screen_directory(
+    resumes_dir,
+    job_description: str,
+    output_path,
+    csv_path=None,
+    checkpoint_path=None,
+    chunk_size: int = 10,
+    workers: Optional[int] = None,
+    per_candidate: bool = False,
+    concurrency: int = 4,
+    token_budget: int = 0,
+    model: str = DEFAULT_MODEL,
+    quick_model: str = DEFAULT_QUICK_MODEL,
+    cascade_threshold: Optional[float] = None,
+    cascade_margin: float = DEFAULT_CASCADE_MARGIN,
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    log: Callable[[str], None] = print,
+    metrics: Optional[RunMetrics] = None,
+    llm_cache_mode: Optional[str] = None,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+    max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+    fallback: bool = True,
+    dedup: bool = True,
+    dedup_threshold: float = DEFAULT_SIMILARITY,
+    store: Optional[CandidateStore] = None,
+) -> Dict[str, int]:
+    resumes_dir = Path(resumes_dir)
+    checkpoint = Checkpoint(checkpoint_path or f"{output_path}.checkpoint.json")
+    writer = ResultWriter(output_path, csv_path)
+    extraction_cache = ExtractionCache()
+    metrics = metrics or RunMetrics(model)
+    crew_instance = ResumeShortlistingCrew(
+        api_key=api_key,
+        model=model,
+        jd_cache=JDAnalysisCache(),
+        metrics=metrics,
+        response_cache=ResponseCache(mode=llm_cache_mode),
+        base_url=base_url,
+        quick_model=quick_model,
+    )
+
+    # Duplicates are detected across every chunk of this run; files finished
+    # by an earlier run are not fingerprinted again.
+    dedup_index = DuplicateIndex(dedup_threshold) if dedup else None
+    scored_rows: Dict[str, Dict] = {}
+    rejected_rows: Dict[str, str] = {}
+
+    summary = {
+        'scored': 0, 'failed': 0, 'rows': 0, 'fallbacks': 0, 'duplicates': 0,
+        'skipped': len(checkpoint.completed) + len(checkpoint.failed),
+    }
+    if summary['skipped']:
+        log(f"Resuming: {summary['skipped']} file(s) already processed")
+
+    for chunk in iter_pending_chunks(resumes_dir, chunk_size, checkpoint):
+        files = [(path.relative_to(resumes_dir).as_posix(), path.read_bytes()) for path in chunk]
+        with metrics.stage('extract'):
+            outcomes = extract_resumes(
+                files,
+                max_workers=workers,
+                cache=extraction_cache,
+                max_pages=max_pages,
+                max_chars=max_chars,
+                fallback=fallback
+            )
+        failed = {outcome.name: outcome.error for outcome in outcomes if not outcome.ok}
+        extracted = [outcome for outcome in outcomes if outcome.ok]
+        candidate_ids: Dict[str, int] = {}
+        if store is not None:
+            with metrics.stage('store'):
+                digests = {name: CandidateStore.digest(data) for name, data in files}
+                ids = store.add_candidates(
+                    (outcome.name, outcome.text, digests[outcome.name]) for outcome in extracted
+                )
+                candidate_ids = dict(zip((outcome.name for outcome in extracted), ids))
+        for outcome in extracted:
+            if outcome.stats.fallback_reason:
+                log(f"{outcome.name}: {outcome.stats.fallback_reason}, extracted with {outcome.stats.method}")
+                summary['fallbacks'] += outcome.stats.method == 'pdfplumber'
+        duplicates: Dict[str, DuplicateMatch] = {}
+        if dedup_index is not None:
+            with metrics.stage('dedup'):
+                for outcome in extracted:
+                    match = dedup_index.add(outcome.text, outcome.name)
+                    if match is not None:
+                        duplicates[outcome.name] = match
+                        log(f"{outcome.name}: duplicate of {match.representative} ({match.reason})")
+        sources = [outcome.name for outcome in extracted if outcome.name not in duplicates]
+        resumes = [outcome.text for outcome in extracted if outcome.name not in duplicates]
+        if token_budget > 0:
+            with metrics.stage('compact'):
+                resumes, _ = compact_resumes(resumes, job_description, token_budget, model)
+
+        rows, scored, error = [], [], None
+        if resumes:
+            rows, scored, rejected, error = _score_chunk(
+                crew_instance, job_description, sources, resumes, per_candidate, concurrency,
+                cascade_threshold, cascade_margin,
+            )
+            for source, reason in rejected.items():
+                log(f"{source}: no valid evaluation after the re-ask ({reason})")
+            failed.update(rejected)
+            rejected_rows.update(rejected)
+        scored_rows.update((row['Source File'], row) for row in rows)
+        copied_rows, copied, duplicates_failed, pending = _copy_to_duplicates(
+            duplicates, {outcome.name: outcome.text for outcome in extracted}, scored_rows, rejected_rows
+        )
+        for source, reason in duplicates_failed.items():
+            log(f"{source}: {reason}")
+        for source in pending:
+            log(f"{source}: left pending, its representative {duplicates[source].representative} got no response")
+        failed.update(duplicates_failed)
+        rows += copied_rows
+        scored += copied
+        summary['duplicates'] += len(copied)
+
+        # Results are flushed before the checkpoint so a crash between the two
+        # can only repeat work, never lose it.
+        with metrics.stage('export'):
+            writer.write(rows)
+        if store is not None and rows:
+            with metrics.stage('store'):
+                store.record_scores(
+                    job_description, [(candidate_ids[row['Source File']], row) for row in rows], model
+                )
+        checkpoint.record(scored, failed)
+        summary['scored'] += len(scored)
+        summary['failed'] += len(failed)
+        summary['rows'] += len(rows)
+        log(f"Processed {summary['skipped'] + summary['scored'] + summary['failed']} file(s), "
+            f"{summary['rows']} result row(s) written")
+        if error:
+            raise RuntimeError(error)
+
+    return summary
+
+
+def export_results(jsonl_path, report_path, metrics: Optional[RunMetrics] = None) -> int:
+    """Write every row accumulated in `jsonl_path` to `report_path`, best score first.
+
+    The format follows the report's suffix: .csv, .pdf, .parquet or .xlsx.
+    """
+    import pandas as pd
+
+    fmt = format_for_path(report_path)
+    metrics = metrics or RunMetrics()
+    jsonl_path = Path(jsonl_path)
+    if jsonl_path.exists() and jsonl_path.stat().st_size:
+        df = pd.read_json(jsonl_path, lines=True, dtype={'Mobile': str, 'Score': float})
+    else:
+        df = pd.DataFrame(columns=RESULT_FIELDS)
+    df = df.sort_values('Score', ascending=False, kind='stable')
+    with metrics.stage(f'export_{fmt}'):
+        write_export(df, fmt, report_path)
+    return len(df)
@@ -0,0 +1,296 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional, Union
+
+from src.resume_shortlisting.pdf_text import EXTRACTOR_VERSION
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_JD_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_RESPONSE_MAX_BYTES = 256 * 1024 * 1024
+
+# off: always call the model. read_write: serve recorded responses and record
+# new ones. record: always call the model and overwrite the recording.
+# replay: serve recorded responses only and fail on anything unrecorded.
+RESPONSE_CACHE_MODES = ('off', 'read_write', 'record', 'replay')
+
+
+def default_cache_dir() -> Path:
+    configured = os.environ.get('RESUME_SHORTLISTING_CACHE_DIR')
+    if configured:
+        return Path(configured)
+    return Path.home() / '.cache' / 'resume_shortlisting'
+
+
+def connect(path: Union[str, Path, None] = None) -> sqlite3.Connection:
+    db_path = Path(path) if path else default_cache_dir() / 'cache.sqlite3'
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def _evict_lru(conn: sqlite3.Connection, table: str, max_bytes: int) -> None:
+    total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {table}').fetchone()[0]
+    if total <= max_bytes:
+        return
+    stale = []
+    for key, size in conn.execute(f'SELECT key, size FROM {table} ORDER BY last_access'):
+        stale.append((key,))
+        total -= size
+        if total <= max_bytes:
+            break
+    conn.executemany(f'DELETE FROM {table} WHERE key = ?', stale)
+
+
+class ExtractionCache:
+    def __init__(self, path: Union[str, Path, None] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS extracted_text ('
+            ' key TEXT PRIMARY KEY,'
+            ' text TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS extracted_text_last_access ON extracted_text (last_access)'
+        )
+
+    @staticmethod
+    def key_for(data: bytes, settings: str = '') -> str:
+        key = f"{hashlib.sha256(data).hexdigest()}:{EXTRACTOR_VERSION}"
+        return f"{key}:{settings}" if settings else key
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT text FROM extracted_text WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                'UPDATE extracted_text SET last_access = ? WHERE key = ?', (time.time(), key)
+            )
+            return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO extracted_text (key, text, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, text, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        _evict_lru(self._conn, 'extracted_text', self.max_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM extracted_text')
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracted_text'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def normalize_job_description(job_description: str) -> str:
+    return ' '.join(unicodedata.normalize('NFKC', job_description).split())
+
+
+class JDAnalysisCache:
+    def __init__(self, path: Union[str, Path, None] = None, ttl_seconds: float = DEFAULT_JD_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jd_analysis ('
+            ' key TEXT PRIMARY KEY,'
+            ' jd_hash TEXT NOT NULL,'
+            ' summary TEXT NOT NULL,'
+            ' created_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jd_analysis_jd_hash ON jd_analysis (jd_hash)')
+
+    @staticmethod
+    def jd_hash(job_description: str) -> str:
+        return hashlib.sha256(normalize_job_description(job_description).encode('utf-8')).hexdigest()
+
+    @classmethod
+    def key_for(cls, job_description: str, agent_config: dict, task_config: dict, model: str) -> str:
+        fingerprint = json.dumps(
+            {'agent': agent_config, 'task': task_config, 'model': model}, sort_keys=True
+        )
+        config_hash = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+        return f"{cls.jd_hash(job_description)}:{config_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT summary, created_at FROM jd_analysis WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl_seconds:
+                self._conn.execute('DELETE FROM jd_analysis WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, summary: str) -> None:
+        jd_hash = key.split(':', 1)[0]
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO jd_analysis (key, jd_hash, summary, created_at) VALUES (?, ?, ?, ?)',
+                (key, jd_hash, summary, time.time())
+            )
+
+    def invalidate(self, job_description: Optional[str] = None) -> int:
+        with self._lock:
+            if job_description is None:
+                cursor = self._conn.execute('DELETE FROM jd_analysis')
+            else:
+                cursor = self._conn.execute(
+                    'DELETE FROM jd_analysis WHERE jd_hash = ?', (self.jd_hash(job_description),)
+                )
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM jd_analysis').fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses, 'ttl_seconds': self.ttl_seconds}
+
+
+class ReplayMissError(RuntimeError):
+    pass
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        max_bytes: int = DEFAULT_RESPONSE_MAX_BYTES,
+        mode: Optional[str] = None,
+    ):
+        mode = mode or os.environ.get('RESUME_SHORTLISTING_LLM_CACHE', 'read_write')
+        if mode not in RESPONSE_CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode {mode!r}; expected one of {', '.join(RESPONSE_CACHE_MODES)}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS llm_responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' model TEXT NOT NULL,'
+            ' response TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS llm_responses_last_access ON llm_responses (last_access)'
+        )
+
+    @property
+    def reads(self) -> bool:
+        return self.mode in ('read_write', 'replay')
+
+    @property
+    def writes(self) -> bool:
+        return self.mode in ('read_write', 'record')
+
+    @staticmethod
+    def key_for(model: str, messages, **params) -> str:
+        fingerprint = json.dumps(
+            {'model': model, 'messages': messages, 'params': params}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response FROM llm_responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._conn.execute(
+                    'UPDATE llm_responses SET last_access = ? WHERE key = ?', (time.time(), key)
+                )
+        if row is None and self.mode == 'replay':
+            raise ReplayMissError(
+                f"No recorded LLM response for request {key[:12]}; record it first with the cache in "
+                f"read_write or record mode"
+            )
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        size = len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model, response, size, now, now)
+            )
+            _evict_lru(self._conn, 'llm_responses', self.max_bytes)
+
+    def clear(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM llm_responses')
+            self.hits = 0
+            self.misses = 0
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'mode': self.mode,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
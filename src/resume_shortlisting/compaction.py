@@ -0,0 +1,206 @@
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+CONTENT_MARKER = 'RESUME CONTENT:'
+DEFAULT_TOKEN_BUDGET = 800
+
+# Relative value of each section type when the budget forces a choice. Sections
+# with a weight of zero are boilerplate and are dropped outright.
+SECTION_WEIGHTS = {
+    'summary': 1.0,
+    'objective': 0.6,
+    'profile': 1.0,
+    'skills': 1.6,
+    'technical skills': 1.6,
+    'experience': 1.5,
+    'work experience': 1.5,
+    'professional experience': 1.5,
+    'employment history': 1.5,
+    'projects': 1.3,
+    'education': 0.9,
+    'certifications': 0.9,
+    'achievements': 0.7,
+    'awards': 0.6,
+    'publications': 0.6,
+    'languages': 0.4,
+    'interests': 0.1,
+    'hobbies': 0.1,
+    'extracurricular activities': 0.2,
+    'personal details': 0.1,
+    'references': 0.0,
+    'declaration': 0.0,
+}
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the to we will with you your'
+    ' this that who what which able work working role team'.split()
+)
+
+_WORD = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+
+def _heading_pattern() -> re.Pattern:
+    # Extracted text is flattened to one line, so headings are recognised by
+    # being written in capitals anywhere, or in title case followed by a colon.
+    names = sorted(SECTION_WEIGHTS, key=len, reverse=True)
+    upper = '|'.join(re.escape(name.upper()) for name in names)
+    title = '|'.join(re.escape(name.title()) for name in names)
+    return re.compile(rf'\b(?:(?P<upper>{upper})\b:?|(?P<title>{title})\s*:)')
+
+
+_HEADING = _heading_pattern()
+
+
+@dataclass
+class CompactionStats:
+    tokens_before: int
+    tokens_after: int
+    sections_kept: int
+    sections_total: int
+    exact: bool
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class TokenCounter:
+    def __init__(self, model: str = 'gpt-4o-mini'):
+        self.encoding = _load_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return math.ceil(len(text) / 4)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ''
+        if self.encoding is None:
+            return text[:max_tokens * 4]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(model: str):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception:
+        # tiktoken fetches its BPE files on first use; without network access
+        # token counts fall back to a characters/4 estimate.
+        return None
+
+
+def tokenize(text: str) -> List[str]:
+    return [term for term in _WORD.findall(text.lower()) if term not in STOPWORDS and len(term) > 1]
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    sections = []
+    heading = ''
+    start = 0
+    for match in _HEADING.finditer(content):
+        body = content[start:match.start()].strip()
+        if body or heading:
+            sections.append((heading, body))
+        heading = (match.group('upper') or match.group('title')).lower()
+        start = match.end()
+    body = content[start:].strip()
+    if body or heading:
+        sections.append((heading, body))
+    return sections
+
+
+def _section_score(heading: str, body: str, jd_terms: frozenset) -> float:
+    weight = SECTION_WEIGHTS.get(heading, 1.0)
+    if weight == 0.0:
+        return 0.0
+    terms = tokenize(body)
+    if not terms:
+        return 0.0
+    overlap = sum(1 for term in terms if term in jd_terms)
+    return weight * (1.0 + overlap / math.sqrt(len(terms)))
+
+
+def compact_resume(
+    resume: str,
+    job_description: str,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    counter: Optional[TokenCounter] = None,
+) -> Tuple[str, CompactionStats]:
+    counter = counter or TokenCounter()
+    tokens_before = counter.count(resume)
+
+    header, marker, content = resume.partition(CONTENT_MARKER)
+    if not marker:
+        header, content = '', resume
+    header = header.strip()
+    header_tokens = counter.count(header + '\n' + CONTENT_MARKER + '\n') if marker else 0
+
+    sections = split_sections(content)
+    if tokens_before <= token_budget:
+        return resume, CompactionStats(tokens_before, tokens_before, len(sections), len(sections), counter.exact)
+
+    jd_terms = frozenset(tokenize(job_description))
+    seen = set()
+    ranked = []
+    for position, (heading, body) in enumerate(sections):
+        key = ' '.join(body.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        score = _section_score(heading, body, jd_terms)
+        if score > 0:
+            ranked.append((score, position))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+
+    remaining = token_budget - header_tokens
+    kept = {}
+    for _, position in ranked:
+        if remaining <= 0:
+            break
+        heading, body = sections[position]
+        text = f"{heading.upper()}: {body}" if heading else body
+        tokens = counter.count(text)
+        if tokens > remaining:
+            text = counter.truncate(text, remaining)
+            tokens = counter.count(text)
+        kept[position] = text
+        remaining -= tokens + 1
+
+    compacted_content = '\n'.join(kept[position] for position in sorted(kept))
+    if marker:
+        compacted = f"\n{header}\n\n{CONTENT_MARKER}\n{compacted_content}\n"
+    else:
+        compacted = compacted_content
+    return compacted, CompactionStats(
+        tokens_before, counter.count(compacted), len(kept), len(sections), counter.exact
+    )
+
+
+def compact_resumes(
+    resumes: List[str],
+    job_description: str,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    model: str = 'gpt-4o-mini',
+) -> Tuple[List[str], List[CompactionStats]]:
+    counter = TokenCounter(model)
+    compacted = []
+    stats = []
+    for resume in resumes:
+        text, resume_stats = compact_resume(resume, job_description, token_budget, counter)
+        compacted.append(text)
+        stats.append(resume_stats)
+    return compacted, stats
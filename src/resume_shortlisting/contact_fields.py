@@ -0,0 +1,129 @@
+import re
+from itertools import islice
+from typing import Iterable, List, NamedTuple
+
+NOT_FOUND = "Not found"
+
+# Ordered by priority: the first pattern that matches anywhere in the text
+# decides the mobile number, taking its leftmost match.
+MOBILE_PATTERNS = [
+    r'(?:\+91|91)[-\s]?[6-9]\d{9}',
+    r'[6-9]\d{9}',
+    r'\+\d{1,3}[-\s]?\d{3}[-\s]?\d{3}[-\s]?\d{4}',
+    r'\(\d{3}\)[-\s]?\d{3}[-\s]?\d{4}',
+    r'\d{3}[-\s]?\d{3}[-\s]?\d{4}',
+    r'\d{10}',
+]
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+NAME_SKIP_KEYWORDS = (
+    'email', 'phone', 'mobile', 'address', 'resume', 'cv', 'objective',
+    'summary', 'profile', 'contact', 'linkedin', 'github'
+)
+
+_WHITESPACE = re.compile(r'\s+')
+_DISALLOWED = re.compile(r'[^\w\s\.\,\-\@\(\)\+\/\:]')
+_SEPARATORS = re.compile(r'[-\s]')
+_WORD = re.compile(r'\S+')
+_NAME_LINE = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$')
+_INITIAL_NAME_LINE = re.compile(r'^[A-Z]\.?\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$')
+_EMAIL = re.compile(EMAIL_PATTERN)
+_MOBILE = [re.compile(pattern) for pattern in MOBILE_PATTERNS]
+_EMAIL_LOCAL_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+
+# Every mobile pattern is built from digits, '+', '(', ')', '-' and whitespace,
+# starts with one of '+', '(' or a digit and is at least ten characters long,
+# so any match lies inside a run this scanner returns. Emails are anchored on
+# their '@'. One scan over the text therefore finds every place the exact
+# patterns need to be tried.
+_SCANNER = re.compile(r'(?P<run>[\d+(][\d+()\s-]{9,})|@')
+
+
+class ContactFields(NamedTuple):
+    name: str
+    mobile: str
+    email: str
+
+
+def clean_text(text: str) -> str:
+    text = _WHITESPACE.sub(' ', text)
+    text = text.encode('ascii', 'ignore').decode('ascii').replace('\x7f', '')
+    text = _DISALLOWED.sub(' ', text)
+    return text.strip()
+
+
+def extract_name(text: str) -> str:
+    for line in text.split('\n', 10)[:10]:
+        line = line.strip()
+        if line and len(line) > 2:
+            # The patterns fail within a few characters on most lines, so
+            # they run before the keyword scan over the whole line.
+            is_name = (
+                (_NAME_LINE.match(line) and len(line.split()) <= 4)
+                or _INITIAL_NAME_LINE.match(line)
+            )
+            if is_name:
+                lowered = line.lower()
+                if not any(keyword in lowered for keyword in NAME_SKIP_KEYWORDS):
+                    return line
+
+    potential_name = []
+    for match in islice(_WORD.finditer(text), 20):
+        word = match.group()
+        if word.istitle() and len(word) > 1 and word.isalpha():
+            potential_name.append(word)
+            if len(potential_name) >= 2:
+                break
+    if potential_name:
+        return ' '.join(potential_name)
+    return NOT_FOUND
+
+
+def _find_email(text: str, at: int) -> str:
+    # No email can start before the local-part characters leading up to the
+    # first '@', so the exact pattern is searched from there.
+    start = at
+    while start > 0 and text[start - 1] in _EMAIL_LOCAL_CHARS:
+        start -= 1
+    match = _EMAIL.search(text, start)
+    return match.group() if match else NOT_FOUND
+
+
+def _scan_mobile_and_email(text: str):
+    mobile = None
+    best = len(_MOBILE)
+    email = None
+    for match in _SCANNER.finditer(text):
+        if match.lastgroup == 'run':
+            # Only patterns that outrank the best match so far can change
+            # the result; the first hit in a run is its leftmost match.
+            for i in range(best):
+                found = _MOBILE[i].search(text, match.start(), match.end())
+                if found:
+                    mobile = found.group()
+                    best = i
+                    break
+        elif email is None:
+            email = _find_email(text, match.start())
+        if best == 0 and email is not None:
+            break
+
+    if mobile is not None:
+        mobile = _SEPARATORS.sub('', mobile)
+    return mobile or NOT_FOUND, email or NOT_FOUND
+
+
+def extract_mobile(text: str) -> str:
+    return _scan_mobile_and_email(text)[0]
+
+
+def extract_email(text: str) -> str:
+    return _scan_mobile_and_email(text)[1]
+
+
+def extract_contact_fields(text: str) -> ContactFields:
+    mobile, email = _scan_mobile_and_email(text)
+    return ContactFields(extract_name(text), mobile, email)
+
+
+def extract_contact_fields_batch(texts: Iterable[str]) -> List[ContactFields]:
+    return [extract_contact_fields(text) for text in texts]
@@ -1,73 +1,218 @@
-from crewai import Agent, Crew, Process, Task
+from crewai import Agent, Crew, LLM, Process, Task
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import PDFSearchTool
 from src.resume_shortlisting.tools.custom_tool import ExtractResumeText
+from src.resume_shortlisting.cache import JDAnalysisCache, ResponseCache
+from src.resume_shortlisting.metrics import DEFAULT_MODEL, DEFAULT_QUICK_MODEL, CandidateKey, RunMetrics
+from src.resume_shortlisting.ratelimit import RateLimitScheduler, estimate_tokens, shared_scheduler
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import copy
+import threading
+import time
 import yaml
+from functools import lru_cache
 from pathlib import Path
 import os
 
+ChunkCallback = Callable[[str], None]
+
+# crewai emits stream chunks on a process-wide event bus, so a single handler
+# routes each chunk to whichever run registered the task that produced it.
+_stream_listeners: Dict[str, ChunkCallback] = {}
+_stream_lock = threading.Lock()
+_stream_handler_registered = False
+
+def _dispatch_stream_chunk(source, event: LLMStreamChunkEvent) -> None:
+    listener = _stream_listeners.get(str(event.task_id))
+    if listener is not None:
+        listener(event.chunk)
+
+@contextmanager
+def _streaming(task: Task, on_chunk: Optional[ChunkCallback]):
+    global _stream_handler_registered
+    if on_chunk is None:
+        yield
+        return
+    task_id = str(task.id)
+    with _stream_lock:
+        if not _stream_handler_registered:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _dispatch_stream_chunk)
+            _stream_handler_registered = True
+        _stream_listeners[task_id] = on_chunk
+    try:
+        yield
+    finally:
+        with _stream_lock:
+            _stream_listeners.pop(task_id, None)
+
+class ScheduledLLM(LLM):
+    """LLM whose API calls are admitted, and retried on 429s, by a RateLimitScheduler."""
+
+    def __init__(self, *args, scheduler: RateLimitScheduler, **kwargs):
+        # litellm's own retries would hide 429s from the scheduler.
+        kwargs.setdefault('max_retries', 0)
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        return self.scheduler.call(
+            lambda: super(ScheduledLLM, self).call(
+                messages, tools, callbacks, available_functions, from_task, from_agent
+            ),
+            tokens=estimate_tokens(messages),
+        )
+
+class CachingLLM(ScheduledLLM):
+    """LLM whose text completions are keyed on endpoint + model + messages and served from a ResponseCache."""
+
+    def __init__(self, *args, response_cache: ResponseCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+
+    @property
+    def endpoint(self) -> str:
+        # Without an explicit base URL, litellm sends OpenAI calls to the one
+        # in the environment, or to api.openai.com.
+        return (
+            self.base_url or self.api_base
+            or os.environ.get('OPENAI_BASE_URL') or os.environ.get('OPENAI_API_BASE') or ''
+        )
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        key = ResponseCache.key_for(
+            self.model, messages, base_url=self.endpoint, tools=tools, stop=self.stop, temperature=self.temperature
+        )
+        if self.response_cache.reads:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                if self.stream:
+                    # Live views still receive the answer, as a single chunk.
+                    crewai_event_bus.emit(
+                        self, event=LLMStreamChunkEvent(chunk=cached, from_task=from_task, from_agent=from_agent)
+                    )
+                return cached
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        # Only misses reach the scheduler; tool-call results are not plain
+        # completions and are not recorded.
+        if self.response_cache.writes and isinstance(response, str):
+            self.response_cache.put(key, self.model, response)
+        return response
+
+@lru_cache(maxsize=None)
+def _read_config(file_path: str) -> dict:
+    with open(Path(__file__).parent / file_path, 'r') as f:
+        return yaml.safe_load(f)
+
+@dataclass
+class ScoringOutcome:
+    index: int
+    raw: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 @CrewBase
-class ResumeShortlistingCrew(): 
-    def __init__(self, api_key=None):
+class ResumeShortlistingCrew():
+    def __init__(
+        self,
+        api_key=None,
+        model: str = DEFAULT_MODEL,
+        jd_cache: Optional[JDAnalysisCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        base_url: Optional[str] = None,
+        quick_model: str = DEFAULT_QUICK_MODEL,
+    ):
         self.agents_config = self._load_config('config/agents.yaml')
         self.tasks_config = self._load_config('config/tasks.yaml')
         self.api_key = api_key
-        if api_key:
-            os.environ['OPENAI_API_KEY'] = api_key
+        self.model = model
+        self.quick_model = quick_model
+        self.jd_cache = jd_cache
+        self.metrics = metrics or RunMetrics(model)
+        self.response_cache = response_cache
+        # Without an explicit scheduler, each model's calls go through the
+        # process-wide scheduler for that model.
+        self.scheduler = scheduler
+        self.base_url = base_url
 
     def _load_config(self, file_path: str) -> dict:
-        module_dir = Path(__file__).parent
-        config_path = module_dir / file_path
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    
-    @agent
-    def jd_interpreter(self) -> Agent:
-        config = self.agents_config['jd_interpreter']
+        # CrewBase writes agent objects into the configs it is given, so each
+        # instance gets its own copy of the once-parsed file.
+        return copy.deepcopy(_read_config(file_path))
+
+    def for_run(
+        self,
+        metrics: Optional[RunMetrics] = None,
+        response_cache: Optional[ResponseCache] = None,
+        model: Optional[str] = None,
+        quick_model: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> 'ResumeShortlistingCrew':
+        # Runs share the configs and caches of a long-lived instance and only
+        # swap in their own metrics, response cache, models and API key.
+        # Agents are built per call, so these apply to everything a run does.
+        run = copy.copy(self)
+        run.api_key = api_key or self.api_key
+        run.model = model or self.model
+        run.quick_model = quick_model or self.quick_model
+        run.metrics = metrics or RunMetrics(run.model)
+        run.response_cache = response_cache
+        return run
+
+    def _build_agent(
+        self, name: str, verbose: bool = True, stream: bool = False, model: Optional[str] = None, **kwargs
+    ) -> Agent:
+        config = self.agents_config[name]
         return Agent(
             role=config['role'],
             goal=config['goal'],
             backstory=config['backstory'],
-            verbose=True,
-            llm_config={    #type: ignore
-                "model": "gpt-4o-mini",
-                "api_key": self.api_key
-            } if self.api_key else None
+            verbose=verbose,
+            llm=self._build_llm(stream, model),
+            **kwargs
         )
 
-    @agent
-    def resume_analyst(self) -> Agent:
-        config = self.agents_config['resume_analyst']
-        return Agent(
-            role=config['role'],
-            goal=config['goal'],
-            backstory=config['backstory'],
-            verbose=True,
-            tools=[ExtractResumeText()],
-            llm_config={    #type: ignore
-                "model": "gpt-4o-mini",
-                "api_key": self.api_key
-            } if self.api_key else None
+    def _build_llm(self, stream: bool = False, model: Optional[str] = None) -> LLM:
+        model = model or self.model
+        settings = dict(
+            model=model, api_key=self.api_key, stream=stream, base_url=self.base_url,
+            scheduler=self.scheduler or shared_scheduler(model)
         )
+        if self.response_cache is not None and self.response_cache.mode != 'off':
+            return CachingLLM(**settings, response_cache=self.response_cache)
+        return ScheduledLLM(**settings)
 
-    @task
-    def analyze_jd(self) -> Task:
-        config = self.tasks_config['analyze_jd']
+    def _build_task(self, name: str, agent: Agent, **kwargs) -> Task:
+        config = self.tasks_config[name]
         return Task(
             description=config['description'],
             expected_output=config['expected_output'],
-            agent=self.jd_interpreter()
+            agent=agent,
+            **kwargs
         )
 
+    @agent
+    def jd_interpreter(self) -> Agent:
+        return self._build_agent('jd_interpreter')
+
+    @agent
+    def resume_analyst(self) -> Agent:
+        return self._build_agent('resume_analyst', tools=[ExtractResumeText()])
+
+    @task
+    def analyze_jd(self) -> Task:
+        return self._build_task('analyze_jd', self.jd_interpreter())
+
     @task
     def shortlist_resumes(self) -> Task:
-        config = self.tasks_config['shortlist_resumes']
-        return Task(
-            description=config['description'],
-            expected_output=config['expected_output'],
-            agent=self.resume_analyst(),
-            context=[self.analyze_jd()]
-        )
+        return self._build_task('shortlist_resumes', self.resume_analyst(), context=[self.analyze_jd()])
 
     @crew
     def crew(self) -> Crew:
@@ -76,4 +221,176 @@ class ResumeShortlistingCrew():
             tasks=[self.analyze_jd(), self.shortlist_resumes()],
             process=Process.sequential,
             verbose=True,
-        )
\ No newline at end of file
+        )
+
+    def _jd_cache_key(self, job_description: str) -> str:
+        return JDAnalysisCache.key_for(
+            job_description,
+            # CrewBase replaces agent names in the instance configs with Agent
+            # objects, so the key is built from the YAML as parsed.
+            _read_config('config/agents.yaml')['jd_interpreter'],
+            _read_config('config/tasks.yaml')['analyze_jd'],
+            self.model
+        )
+
+    def _cached_jd_analysis(self, job_description: str) -> Optional[str]:
+        if self.jd_cache is None:
+            return None
+        start = time.perf_counter()
+        cached = self.jd_cache.get(self._jd_cache_key(job_description))
+        if cached is not None:
+            self.metrics.record('analyze_jd', time.perf_counter() - start, cached=True)
+        return cached
+
+    def _store_jd_analysis(self, job_description: str, summary: str) -> None:
+        if self.jd_cache is not None:
+            self.jd_cache.put(self._jd_cache_key(job_description), summary)
+
+    def _run_crew(
+        self,
+        agents: List[Agent],
+        tasks: List[Task],
+        stages: Sequence[str],
+        inputs: Dict[str, str],
+        verbose: bool = True,
+        candidate: Optional[CandidateKey] = None,
+        model: Optional[str] = None,
+    ):
+        # Tasks run sequentially and each has its own agent, so a task's
+        # stage time runs from the previous completion and its tokens are
+        # whatever its agent's LLM has used.
+        pending = iter(zip(tasks, stages))
+        state = {'started': time.perf_counter(), 'steps': 0}
+
+        def on_step(step):
+            state['steps'] += 1
+
+        def on_task_done(output):
+            task, stage = next(pending)
+            now = time.perf_counter()
+            usage = task.agent._token_process.get_summary()
+            self.metrics.record(
+                stage,
+                now - state['started'],
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                requests=usage.successful_requests,
+                steps=state['steps'],
+                candidate=candidate,
+                model=model,
+            )
+            state['started'] = now
+            state['steps'] = 0
+
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=verbose,
+            step_callback=on_step,
+            task_callback=on_task_done,
+        ).kickoff(inputs=inputs)
+
+    def shortlist(self, job_description: str, resumes: str, on_chunk: Optional[ChunkCallback] = None):
+        jd_requirements = self._cached_jd_analysis(job_description)
+        analyst = self._build_agent('resume_analyst', stream=on_chunk is not None, tools=[ExtractResumeText()])
+        if jd_requirements is None:
+            interpreter = self._build_agent('jd_interpreter')
+            analysis = self._build_task('analyze_jd', interpreter)
+            shortlisting = self._build_task('shortlist_resumes', analyst, context=[analysis])
+            agents, tasks, stages = [interpreter, analyst], [analysis, shortlisting], ['analyze_jd', 'shortlist_resumes']
+        else:
+            # Warm path: the requirement summary is already known, so only the
+            # shortlisting task runs and receives it as part of its prompt.
+            config = self.tasks_config['shortlist_resumes']
+            shortlisting = Task(
+                description=config['description'] + '\n' + config['requirements_context'],
+                expected_output=config['expected_output'],
+                agent=analyst
+            )
+            agents, tasks, stages = [analyst], [shortlisting], ['shortlist_resumes']
+
+        with _streaming(shortlisting, on_chunk):
+            result = self._run_crew(agents, tasks, stages, {
+                'job_description': job_description,
+                'resumes': resumes,
+                'jd_requirements': jd_requirements or ''
+            })
+        if jd_requirements is None:
+            self._store_jd_analysis(job_description, result.tasks_output[0].raw)
+        return result
+
+    # Map-reduce mode: the JD is analysed once and every resume is then scored
+    # by its own single-task crew. Each call builds fresh agents and tasks
+    # because crewai tasks keep their output on the instance.
+    def run_jd_analysis(self, job_description: str) -> str:
+        cached = self._cached_jd_analysis(job_description)
+        if cached is not None:
+            return cached
+        interpreter = self._build_agent('jd_interpreter')
+        analysis = self._build_task('analyze_jd', interpreter)
+        result = self._run_crew([interpreter], [analysis], ['analyze_jd'], {'job_description': job_description})
+        self._store_jd_analysis(job_description, result.raw)
+        return result.raw
+
+    def score_resume(
+        self, jd_requirements: str, resume: str, candidate: Optional[CandidateKey] = None, quick: bool = False
+    ) -> str:
+        # The quick pass asks the cheaper model for a score only.
+        name, model = ('quick_score', self.quick_model) if quick else ('score_resume', self.model)
+        analyst = self._build_agent('resume_analyst', verbose=False, model=model)
+        scoring = self._build_task(name, analyst)
+        result = self._run_crew(
+            [analyst], [scoring], [name],
+            {'jd_requirements': jd_requirements, 'resume': resume},
+            verbose=False,
+            candidate=candidate,
+            model=model,
+        )
+        return result.raw
+
+    def score_resumes(
+        self,
+        jd_requirements: str,
+        resumes: List[str],
+        max_concurrency: int = 4,
+        on_result: Optional[Callable[[ScoringOutcome], None]] = None,
+        candidates: Optional[Sequence[CandidateKey]] = None,
+        quick: bool = False,
+    ) -> List[ScoringOutcome]:
+        return self.score_pairs(
+            [(jd_requirements, resume) for resume in resumes], max_concurrency, on_result, candidates, quick
+        )
+
+    def score_pairs(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        max_concurrency: int = 4,
+        on_result: Optional[Callable[[ScoringOutcome], None]] = None,
+        candidates: Optional[Sequence[CandidateKey]] = None,
+        quick: bool = False,
+    ) -> List[ScoringOutcome]:
+        """Score each (jd_requirements, resume) pair in its own call, all on one pool.
+
+        Pairs for different job descriptions share the pool, so a run over
+        several roles keeps every worker busy until the last call.
+        """
+        outcomes: List[Optional[ScoringOutcome]] = [None] * len(pairs)
+        if not pairs:
+            return []
+        candidates = candidates or range(1, len(pairs) + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pairs)))) as pool:
+            futures = {
+                pool.submit(self.score_resume, jd_requirements, resume, candidates[i], quick): i
+                for i, (jd_requirements, resume) in enumerate(pairs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    outcome = ScoringOutcome(i, raw=future.result())
+                except Exception as e:
+                    outcome = ScoringOutcome(i, error=str(e))
+                outcomes[i] = outcome
+                if on_result:
+                    on_result(outcome)
+        return outcomes  # type: ignore[return-value]
@@ -0,0 +1,153 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.resume_shortlisting.compaction import CONTENT_MARKER, tokenize
+from src.resume_shortlisting.contact_fields import NOT_FOUND
+from src.resume_shortlisting.parsing import parse_candidate_header
+
+# Re-saved copies with a few percent of words edited score 0.7 and up on a
+# synthetic corpus; distinct resumes built from the same phrases stay below 0.3.
+DEFAULT_SIMILARITY = 0.6
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+# 32 bands of 4 rows put pairs above roughly 0.45 Jaccard similarity in a
+# shared bucket; each candidate pair is then checked against the threshold.
+LSH_BANDS = 32
+
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32
+_MASK = np.uint64(0xFFFFFFFF)
+_SHINGLE_BASE = np.uint64(1000003)
+_NON_DIGITS = re.compile(r'\D')
+
+
+class DuplicateMatch(NamedTuple):
+    representative: Hashable
+    reason: str
+
+
+def _normalize_email(email: str) -> Optional[str]:
+    email = email.strip().lower()
+    return email if email and email != NOT_FOUND.lower() else None
+
+
+def _normalize_mobile(mobile: str) -> Optional[str]:
+    # "+91 98765 43210", "919876543210" and "9876543210" are the same number.
+    digits = _NON_DIGITS.sub('', mobile)
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+class DuplicateIndex:
+    """Groups resumes that are the same person or near-identical text, first copy first.
+
+    Text similarity is the Jaccard similarity of word shingles, estimated
+    with MinHash signatures and found through LSH banding, so adding a
+    resume costs the same no matter how many are already indexed. Resumes
+    sharing an email address or mobile number are matched outright.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY,
+        match_contacts: bool = True,
+        num_perm: int = NUM_PERM,
+        bands: int = LSH_BANDS,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.match_contacts = match_contacts
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._representative: Dict[Hashable, Hashable] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._contacts: Dict[str, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._representative)
+
+    def signature(self, resume: str) -> Optional[np.ndarray]:
+        content = resume.partition(CONTENT_MARKER)[2] or resume
+        tokens = tokenize(content)
+        if len(tokens) < SHINGLE_WORDS:
+            return None
+        hashes = np.array([zlib.crc32(token.encode()) for token in tokens], dtype=np.uint64)
+        shingles = np.zeros(len(tokens) - SHINGLE_WORDS + 1, dtype=np.uint64)
+        for offset in range(SHINGLE_WORDS):
+            shingles = (shingles * _SHINGLE_BASE + hashes[offset:len(shingles) + offset]) & _MASK
+        shingles = np.unique(shingles)
+        # a < 2**31 and shingles < 2**32, so the products fit in 64 bits.
+        return ((np.outer(self._a, shingles) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.mean(first == second))
+
+    def _contact_keys(self, resume: str) -> List[str]:
+        fields = parse_candidate_header(resume)
+        keys = []
+        email = _normalize_email(fields.get('email', ''))
+        if email:
+            keys.append(f'email:{email}')
+        mobile = _normalize_mobile(fields.get('mobile', ''))
+        if mobile:
+            keys.append(f'mobile:{mobile}')
+        return keys
+
+    def add(self, resume: str, key: Hashable) -> Optional[DuplicateMatch]:
+        """Index `resume` under `key` and return the group it joined, or None if it starts one."""
+        match = None
+        contact_keys = self._contact_keys(resume) if self.match_contacts else []
+        for contact in contact_keys:
+            if contact in self._contacts:
+                match = DuplicateMatch(self._contacts[contact], f"same {contact.partition(':')[0]}")
+                break
+
+        signature = self.signature(resume)
+        band_keys = []
+        if signature is not None:
+            band_keys = [band.tobytes() for band in np.split(signature, self.bands)]
+            if match is None:
+                best, best_similarity = None, self.threshold
+                seen = set()
+                for bucket, band_key in zip(self._buckets, band_keys):
+                    for other in bucket.get(band_key, ()):
+                        if other in seen:
+                            continue
+                        seen.add(other)
+                        similarity = self.similarity(signature, self._signatures[other])
+                        if similarity >= best_similarity:
+                            best, best_similarity = other, similarity
+                if best is not None:
+                    match = DuplicateMatch(self._representative[best], f"{best_similarity:.0%} similar text")
+
+        # Every copy is indexed, not just representatives, so a chain of small
+        # edits still resolves to the first copy of the group.
+        representative = key if match is None else match.representative
+        self._representative[key] = representative
+        if signature is not None:
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket[band_key].append(key)
+        for contact in contact_keys:
+            self._contacts.setdefault(contact, representative)
+        return match
+
+
+def find_duplicates(
+    resumes: List[str], threshold: float = DEFAULT_SIMILARITY, match_contacts: bool = True
+) -> Dict[int, DuplicateMatch]:
+    """Map the index of every duplicate in `resumes` to the index of the first copy of its group."""
+    index = DuplicateIndex(threshold, match_contacts)
+    matches = {}
+    for position, resume in enumerate(resumes):
+        match = index.add(resume, position)
+        if match is not None:
+            matches[position] = match
+    return matches
@@ -0,0 +1,81 @@
+import re
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, NamedTuple
+
+from pandas.api.types import is_numeric_dtype
+
+# Exports up to this size stay in memory; larger ones roll over to a
+# temporary file so a 10k-row report is never held twice.
+SPOOL_BYTES = 8 * 1024 * 1024
+XLSX_CELL_CHARS = 32767
+_XLSX_ILLEGAL_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+class ExportFormat(NamedTuple):
+    label: str
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'csv': ExportFormat("📊 Download CSV", 'csv', 'text/csv'),
+    'pdf': ExportFormat("📄 Download PDF", 'pdf', 'application/pdf'),
+    'parquet': ExportFormat("🧱 Download Parquet", 'parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ExportFormat(
+        "📗 Download Excel", 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    ),
+}
+
+
+def format_for_path(path) -> str:
+    fmt = Path(path).suffix.lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def _write_xlsx(df, target):
+    # openpyxl's write-only mode streams rows into the archive instead of
+    # building a cell object per value, and rejects control characters and
+    # cells over Excel's length limit, so those are cleaned up column-wise.
+    from openpyxl import Workbook
+
+    cells = df.astype(object).where(df.notna(), None)
+    for col in cells.columns:
+        if not is_numeric_dtype(df[col]):
+            cells[col] = (
+                cells[col].map(lambda value: value if value is None else str(value))
+                .str.replace(_XLSX_ILLEGAL_CHARACTERS, '', regex=True)
+                .str.slice(0, XLSX_CELL_CHARS)
+            )
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Shortlist")
+    sheet.append([str(col) for col in cells.columns])
+    for row in cells.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(target)
+
+
+def write_export(df, fmt: str, target):
+    """Write `df` in format `fmt` to `target`, a path or a writable binary file."""
+    if fmt == 'csv':
+        df.to_csv(target, index=False, encoding='utf-8')
+    elif fmt == 'pdf':
+        from src.resume_shortlisting.report import write_pdf_report
+
+        write_pdf_report(df, target)
+    elif fmt == 'parquet':
+        df.to_parquet(target, index=False)
+    elif fmt == 'xlsx':
+        _write_xlsx(df, target)
+    else:
+        raise ValueError(f"Unsupported export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+
+
+def open_export(df, fmt: str) -> BinaryIO:
+    """Render `df` and return it as a rewound file, on disk once it outgrows SPOOL_BYTES."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    write_export(df, fmt, spooled)
+    spooled.seek(0)
+    return spooled
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from src.resume_shortlisting.cache import ExtractionCache
+from src.resume_shortlisting.pdf_text import (
+    DEFAULT_MAX_CHARS,
+    DEFAULT_MAX_PAGES,
+    ExtractionStats,
+    PDFTextExtractor,
+)
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+@dataclass
+class ExtractionOutcome:
+    name: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+    stats: Optional[ExtractionStats] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def default_worker_count() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _extract_bytes(data: bytes, **options) -> Tuple[str, ExtractionStats]:
+    return PDFTextExtractor(**options).extract_with_stats(data)
+
+
+def _extract_sequential(files, indices, outcomes, report, extract):
+    for i in indices:
+        name, data = files[i]
+        try:
+            text, stats = extract(data)
+            outcomes[i] = ExtractionOutcome(name, text=text, stats=stats)
+        except Exception as e:
+            outcomes[i] = ExtractionOutcome(name, error=str(e))
+        report(name)
+
+
+def _extract_pooled(files, indices, outcomes, report, max_workers, extract) -> List[int]:
+    crashed = []
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(indices))) as pool:
+        futures = {pool.submit(extract, files[i][1]): i for i in indices}
+        for future in as_completed(futures):
+            i = futures[future]
+            name = files[i][0]
+            try:
+                text, stats = future.result()
+                outcomes[i] = ExtractionOutcome(name, text=text, stats=stats)
+            except BrokenProcessPool:
+                crashed.append(i)
+                continue
+            except Exception as e:
+                outcomes[i] = ExtractionOutcome(name, error=str(e))
+            report(name)
+    return crashed
+
+
+def _extract_remaining_pooled(files, indices, outcomes, report, workers, extract) -> None:
+    crashed = _extract_pooled(files, indices, outcomes, report, workers, extract)
+
+    # A worker that dies (e.g. a parser segfault on a malformed PDF) breaks the
+    # whole pool, so every unfinished file is retried in its own single-worker
+    # pool to pin the failure on the file that caused it.
+    for i in crashed:
+        if _extract_pooled(files, [i], outcomes, report, 1, extract):
+            outcomes[i] = ExtractionOutcome(files[i][0], error="Extraction worker crashed")
+            report(files[i][0])
+
+
+def extract_resumes(
+    files: Sequence[Tuple[str, bytes]],
+    max_workers: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    cache: Optional[ExtractionCache] = None,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+    max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+    fallback: bool = True,
+) -> List[ExtractionOutcome]:
+    total = len(files)
+    extract = partial(_extract_bytes, max_pages=max_pages, max_chars=max_chars, fallback=fallback)
+    settings = PDFTextExtractor(max_pages, max_chars, fallback).settings_key
+    outcomes: List[Optional[ExtractionOutcome]] = [None] * total
+    done = 0
+
+    def report(name: str) -> None:
+        nonlocal done
+        done += 1
+        if on_progress:
+            on_progress(done, total, name)
+
+    keys = [cache.key_for(data, settings) for _, data in files] if cache else []
+    indices = []
+    for i, (name, _) in enumerate(files):
+        cached = cache.get(keys[i]) if cache else None
+        if cached is None:
+            indices.append(i)
+        else:
+            outcomes[i] = ExtractionOutcome(name, text=cached, stats=ExtractionStats('cache', chars=len(cached)))
+            report(name)
+
+    workers = default_worker_count() if max_workers is None else max_workers
+    if workers <= 1 or len(indices) <= 1:
+        _extract_sequential(files, indices, outcomes, report, extract)
+    else:
+        _extract_remaining_pooled(files, indices, outcomes, report, workers, extract)
+
+    if cache:
+        for i in indices:
+            outcome = outcomes[i]
+            if outcome is not None and outcome.ok:
+                cache.put(keys[i], outcome.text)  # type: ignore[arg-type]
+
+    return outcomes  # type: ignore[return-value]
+
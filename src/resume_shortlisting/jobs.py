@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_JOB_WORKERS = 4
+# Finished jobs hold their result DataFrames in memory until this many
+# newer ones have finished.
+KEEP_FINISHED = 50
+
+
+class Job:
+    """One analysis run, updated by its worker thread and read by any number of page renders."""
+
+    def __init__(self, job_id: str, label: str = ''):
+        self.id = job_id
+        self.label = label
+        self.status = QUEUED
+        self.stage = 'Queued'
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._messages: List[Tuple[str, str]] = []
+        self._partial: Dict[Any, Dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def set_stage(self, stage: str, progress: Optional[float] = None) -> None:
+        self.stage = stage
+        if progress is not None:
+            self.set_progress(progress)
+
+    def set_progress(self, progress: float) -> None:
+        self.progress = min(1.0, max(0.0, progress))
+
+    def _log(self, level: str, text: str) -> None:
+        with self._lock:
+            self._messages.append((level, text))
+
+    def info(self, text: str) -> None:
+        self._log('info', text)
+
+    def warning(self, text: str) -> None:
+        self._log('warning', text)
+
+    def error_message(self, text: str) -> None:
+        self._log('error', text)
+
+    def messages(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._messages)
+
+    def put_partial(self, key, row: Dict) -> None:
+        """Record a row finished ahead of the final result, for live views."""
+        with self._lock:
+            self._partial[key] = row
+
+    def partial_rows(self) -> List[Dict]:
+        with self._lock:
+            return [self._partial[key] for key in sorted(self._partial)]
+
+
+class JobManager:
+    """Runs jobs on a thread pool and keeps them addressable by ID after they finish.
+
+    One manager is shared by every session of the app, so a job survives
+    reruns and reconnects; sessions only keep the ID of the job they started.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, keep_finished: int = KEEP_FINISHED):
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args, label: str = '', **kwargs) -> Job:
+        """Queue `fn(job, *args, **kwargs)`; its return value becomes `job.result`."""
+        job = Job(uuid.uuid4().hex[:12], label)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        def run():
+            job.started = time.time()
+            job.status = RUNNING
+            status = FAILED
+            try:
+                job.result = fn(job, *args, **kwargs)
+                status = DONE
+            except Exception as e:
+                job.error = e
+            finally:
+                # The status is set last, so a reader that sees a finished
+                # job also sees its result and end time.
+                job.finished = time.time()
+                job.status = status
+                self._prune()
+
+        self._executor.submit(run)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created)
+
+    def _prune(self) -> None:
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.is_finished), key=lambda job: job.finished or 0.0
+            )
+            for job in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self._jobs[job.id]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
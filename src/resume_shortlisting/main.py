@@ -3,9 +3,157 @@ import sys
 sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
 sys.modules["sqlite3.dbapi2"] = sys.modules["pysqlite3.dbapi2"]
 
+import argparse
+import os
+from pathlib import Path
+
+from src.resume_shortlisting.cache import RESPONSE_CACHE_MODES
+from src.resume_shortlisting.crew import DEFAULT_MODEL, DEFAULT_QUICK_MODEL
+from src.resume_shortlisting.dedup import DEFAULT_SIMILARITY
+from src.resume_shortlisting.pdf_text import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+from src.resume_shortlisting.ratelimit import DEFAULT_MAX_CONCURRENCY, DEFAULT_RPM, DEFAULT_TPM
+from src.resume_shortlisting.screening import DEFAULT_CASCADE_MARGIN
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="resume_shortlisting",
+        description="Screen a directory of PDF resumes against a job description."
+    )
+    parser.add_argument("--resumes-dir", required=True, type=Path, help="Directory searched recursively for PDF resumes")
+    parser.add_argument("--jd-file", required=True, type=Path, help="Text file containing the job description")
+    parser.add_argument("--output", type=Path, default=Path("shortlist_results.jsonl"), help="JSONL file results are appended to")
+    parser.add_argument("--csv", type=Path, help="Optional CSV file results are also appended to")
+    parser.add_argument(
+        "--report", type=Path,
+        help="Also write every row in --output, best score first, to this .csv, .pdf, .parquet or .xlsx file"
+    )
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint.json)")
+    parser.add_argument("--chunk-size", type=int, default=10, help="Resumes sent through the crew per chunk")
+    parser.add_argument("--workers", type=int, help="PDF extraction processes (default: CPU count, up to 8)")
+    parser.add_argument("--per-candidate", action="store_true", help="Score each resume in its own concurrent call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent scoring calls in per-candidate mode")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Pages read per PDF (0 reads all)")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS, help="Characters kept per PDF (0 keeps all)")
+    parser.add_argument("--no-fallback", action="store_true", help="Never re-extract poor text with pdfplumber")
+    parser.add_argument("--no-dedup", action="store_true", help="Score every copy of a duplicate resume separately")
+    parser.add_argument(
+        "--dedup-threshold", type=float, default=DEFAULT_SIMILARITY,
+        help="Text similarity (0-1) at which two resumes count as duplicates"
+    )
+    parser.add_argument("--token-budget", type=int, default=0, help="Compact each resume to this many tokens (0 disables)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="OpenAI model used by the agents")
+    parser.add_argument(
+        "--cascade", type=float, metavar="THRESHOLD",
+        help="Score every resume with --quick-model first and fully evaluate only those scoring at least "
+             "THRESHOLD minus --cascade-margin"
+    )
+    parser.add_argument(
+        "--cascade-margin", type=float, default=DEFAULT_CASCADE_MARGIN,
+        help="Points below the --cascade threshold that still get the full evaluation"
+    )
+    parser.add_argument("--quick-model", default=DEFAULT_QUICK_MODEL, help="OpenAI model for the --cascade quick pass")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="OpenAI requests per minute to stay within (0 disables)")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="OpenAI tokens per minute to stay within (0 disables)")
+    parser.add_argument(
+        "--max-inflight", type=int, default=DEFAULT_MAX_CONCURRENCY,
+        help="Upper bound on concurrent OpenAI calls; the limit adapts downwards on 429 responses"
+    )
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint to call instead of api.openai.com")
+    parser.add_argument(
+        "--llm-cache", choices=RESPONSE_CACHE_MODES,
+        default=os.environ.get('RESUME_SHORTLISTING_LLM_CACHE', 'read_write'),
+        help="Recorded LLM responses: read_write reuses and records, record refreshes, "
+             "replay answers only from recordings (no API key needed), off disables"
+    )
+    parser.add_argument(
+        "--store", nargs="?", const="", type=str, metavar="PATH",
+        help="Save extracted resumes and their scores to the candidate pool shared with the app "
+             "(default: ~/.local/share/resume_shortlisting/candidates.sqlite3)"
+    )
+    parser.add_argument("--metrics-json", type=Path, help="Write per-stage timing, token and cost metrics as JSON")
+    parser.add_argument("--metrics-prom", type=Path, help="Write the same metrics in Prometheus text format")
+    return parser
+
+
+def run(argv=None) -> int:
+    from src.resume_shortlisting.batch import export_results, screen_directory
+    from src.resume_shortlisting.export import format_for_path
+    from src.resume_shortlisting.metrics import RunMetrics
+    from src.resume_shortlisting.ratelimit import configure_scheduler
+    from src.resume_shortlisting.store import CandidateStore
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.report:
+        try:
+            format_for_path(args.report)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.llm_cache != 'replay' and not os.environ.get('OPENAI_API_KEY'):
+        print("OPENAI_API_KEY is not set.", file=sys.stderr)
+        return 2
+
+    configure_scheduler(args.model, rpm=args.rpm or None, tpm=args.tpm or None, max_concurrency=args.max_inflight)
+    checkpoint = args.checkpoint or Path(f"{args.output}.checkpoint.json")
+    metrics = RunMetrics(args.model)
+    try:
+        summary = screen_directory(
+            args.resumes_dir,
+            args.jd_file.read_text(encoding='utf-8'),
+            args.output,
+            csv_path=args.csv,
+            checkpoint_path=checkpoint,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            per_candidate=args.per_candidate,
+            concurrency=args.concurrency,
+            token_budget=args.token_budget,
+            model=args.model,
+            quick_model=args.quick_model,
+            cascade_threshold=args.cascade,
+            cascade_margin=args.cascade_margin,
+            base_url=args.base_url,
+            metrics=metrics,
+            llm_cache_mode=args.llm_cache,
+            max_pages=args.max_pages or None,
+            max_chars=args.max_chars or None,
+            fallback=not args.no_fallback,
+            dedup=not args.no_dedup,
+            dedup_threshold=args.dedup_threshold,
+            store=None if args.store is None else CandidateStore(args.store or None),
+        )
+        if args.report:
+            export_results(args.output, args.report, metrics)
+    except KeyboardInterrupt:
+        print(f"Interrupted. Progress is saved in {checkpoint}; rerun the same command to resume.", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Stopped: {e}", file=sys.stderr)
+        print(f"Progress is saved in {checkpoint}; rerun the same command to resume.", file=sys.stderr)
+        return 1
+    finally:
+        # Metrics are written even for interrupted runs, which are the ones
+        # most worth looking at.
+        if args.metrics_json:
+            args.metrics_json.write_text(metrics.to_json())
+        if args.metrics_prom:
+            args.metrics_prom.write_text(metrics.to_prometheus())
+
+    print(
+        f"Done: {summary['scored']} scored, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped from a previous run, {summary['rows']} row(s) in {args.output}"
+        f" ({summary['fallbacks']} re-extracted with pdfplumber, {summary['duplicates']} duplicate(s) not re-scored)"
+    )
+    if args.report:
+        print(f"Report written to {args.report}")
+    return 0
+
+
 def main():
     print("Resume Shortlisting")
+    return run()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+METRIC_PREFIX = 'resume_shortlisting'
+
+# A candidate's resume id, or (role, resume id) when one run screens the
+# same resumes against several job descriptions.
+CandidateKey = Union[int, Tuple[str, int]]
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+# Used for the score-only first pass of the scoring cascade.
+DEFAULT_QUICK_MODEL = os.environ.get('RESUME_SHORTLISTING_QUICK_MODEL', 'gpt-4.1-nano')
+
+# USD per million tokens as (prompt, completion). Models missing from the
+# table are reported with tokens but no cost estimate.
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-3.5-turbo': (0.50, 1.50),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    prices = MODEL_PRICES.get(model.split('/')[-1])
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    seconds: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    requests: int = 0
+    steps: int = 0
+    cost: Optional[float] = None
+    candidate: Optional[CandidateKey] = None
+    cached: bool = False
+
+
+class RunMetrics:
+    def __init__(self, model: str = DEFAULT_MODEL):
+        self.model = model
+        self.records: List[StageRecord] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        requests: int = 0,
+        steps: int = 0,
+        candidate: Optional[CandidateKey] = None,
+        cached: bool = False,
+        model: Optional[str] = None,
+    ) -> StageRecord:
+        # `model` prices stages run on another model than the run's own,
+        # such as the quick pass of a scoring cascade.
+        cost = None
+        if prompt_tokens or completion_tokens:
+            cost = estimate_cost(model or self.model, prompt_tokens, completion_tokens)
+        record = StageRecord(
+            stage, seconds, prompt_tokens, completion_tokens, requests, steps, cost, candidate, cached
+        )
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    @contextmanager
+    def stage(self, stage: str, candidate: Optional[CandidateKey] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, candidate=candidate)
+
+    def _aggregate(self, key) -> Dict:
+        totals: Dict = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            name = key(record)
+            if name is None:
+                continue
+            total = totals.setdefault(name, {
+                'seconds': 0.0, 'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                'requests': 0, 'steps': 0, 'cost': None, 'cached': 0,
+            })
+            total['seconds'] += record.seconds
+            total['calls'] += 1
+            total['prompt_tokens'] += record.prompt_tokens
+            total['completion_tokens'] += record.completion_tokens
+            total['requests'] += record.requests
+            total['steps'] += record.steps
+            total['cached'] += record.cached
+            if record.cost is not None:
+                total['cost'] = (total['cost'] or 0.0) + record.cost
+        return totals
+
+    def by_stage(self) -> Dict[str, Dict]:
+        return self._aggregate(lambda record: record.stage)
+
+    def by_candidate(self) -> Dict[CandidateKey, Dict]:
+        return self._aggregate(lambda record: record.candidate)
+
+    def totals(self) -> Dict:
+        stages = self.by_stage().values()
+        costs = [stage['cost'] for stage in stages if stage['cost'] is not None]
+        return {
+            'seconds': sum(stage['seconds'] for stage in stages),
+            'prompt_tokens': sum(stage['prompt_tokens'] for stage in stages),
+            'completion_tokens': sum(stage['completion_tokens'] for stage in stages),
+            'requests': sum(stage['requests'] for stage in stages),
+            'cost': sum(costs) if costs else None,
+        }
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            records = [asdict(record) for record in self.records]
+        return {
+            'model': self.model,
+            'totals': self.totals(),
+            'stages': self.by_stage(),
+            'candidates': {_candidate_name(candidate): total for candidate, total in self.by_candidate().items()},
+            'records': records,
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        # Prometheus text exposition format, suitable for the node exporter's
+        # textfile collector or a Pushgateway.
+        lines = []
+
+        def family(name: str, help_text: str, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} counter")
+            for labels, value in samples:
+                rendered = ','.join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{rendered}}} {value}")
+
+        model = {'model': self.model}
+        stages = self.by_stage()
+        candidates = self.by_candidate()
+        family('stage_seconds_total', "Wall time spent in each stage.",
+               [({**model, 'stage': stage}, total['seconds']) for stage, total in stages.items()])
+        family('stage_calls_total', "Times each stage ran.",
+               [({**model, 'stage': stage}, total['calls']) for stage, total in stages.items()])
+        family('stage_tokens_total', "LLM tokens used by each stage.",
+               [({**model, 'stage': stage, 'direction': direction}, total[f'{direction}_tokens'])
+                for stage, total in stages.items() for direction in ('prompt', 'completion')])
+        family('stage_cost_usd_total', "Estimated LLM cost of each stage in US dollars.",
+               [({**model, 'stage': stage}, total['cost']) for stage, total in stages.items()
+                if total['cost'] is not None])
+        family('candidate_seconds_total', "Wall time spent scoring each candidate.",
+               [({**model, **_candidate_labels(candidate)}, total['seconds'])
+                for candidate, total in candidates.items()])
+        family('candidate_tokens_total', "LLM tokens used to score each candidate.",
+               [({**model, **_candidate_labels(candidate), 'direction': direction}, total[f'{direction}_tokens'])
+                for candidate, total in candidates.items() for direction in ('prompt', 'completion')])
+        return '\n'.join(lines) + '\n'
+
+
+def _candidate_name(candidate: CandidateKey) -> str:
+    if isinstance(candidate, tuple):
+        role, resume_id = candidate
+        return f"{role} #{resume_id}"
+    return str(candidate)
+
+
+def _candidate_labels(candidate: CandidateKey) -> Dict:
+    if isinstance(candidate, tuple):
+        role, resume_id = candidate
+        return {'role': role, 'candidate': resume_id}
+    return {'candidate': candidate}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
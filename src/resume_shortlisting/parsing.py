@@ -0,0 +1,182 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from src.resume_shortlisting.schemas import CandidateEvaluation
+
+_HEADER_FIELD = re.compile(r'^(Name|Mobile|Email): (.*)$', re.MULTILINE)
+JD_SEPARATOR = '---'
+_TITLE_CHARS = 60
+_QUICK_SCORE = re.compile(r'"score"\s*:\s*"?(\d+(?:\.\d+)?)')
+_RECORD_START = re.compile(r'\{|\[(?=\s*\{)')
+_DECODER = json.JSONDecoder()
+
+
+def parse_candidate_header(resume: str) -> Dict[str, str]:
+    header = resume.partition('RESUME CONTENT:')[0]
+    return {field.lower(): value.strip() for field, value in _HEADER_FIELD.findall(header)}
+
+
+def format_resume(resume_id: int, resume: str) -> str:
+    return f"=== RESUME {resume_id} ===\n{resume.strip()}"
+
+
+def format_resumes_for_prompt(resumes: Sequence[str]) -> str:
+    return '\n\n'.join(format_resume(i, resume) for i, resume in enumerate(resumes, start=1))
+
+
+def split_job_descriptions(text: str) -> Dict[str, str]:
+    """Split `text` on lines holding only ``---`` into job descriptions titled by their first line."""
+    roles: Dict[str, str] = {}
+    sections, current = [], []
+    for line in text.splitlines():
+        if line.strip() == JD_SEPARATOR:
+            sections.append(current)
+            current = []
+        else:
+            current.append(line)
+    sections.append(current)
+    for lines in sections:
+        description = '\n'.join(lines).strip()
+        if not description:
+            continue
+        title = description.splitlines()[0].strip().lstrip('#').strip()[:_TITLE_CHARS] or f"Role {len(roles) + 1}"
+        unique, n = title, 2
+        while unique in roles:
+            unique, n = f"{title} ({n})", n + 1
+        roles[unique] = description
+    return roles
+
+
+def parse_quick_score(text: str) -> Optional[float]:
+    """The score in a quick-pass answer, or None when it has none in the 0-10 range."""
+    match = _QUICK_SCORE.search(text or '')
+    if match is None:
+        return None
+    score = float(match.group(1))
+    return score if 0 <= score <= 10 else None
+
+
+@dataclass
+class RecordError:
+    resume_id: Optional[int]
+    record: str
+    error: str
+
+
+@dataclass
+class ParsedEvaluations:
+    evaluations: Dict[int, CandidateEvaluation] = field(default_factory=dict)
+    errors: List[RecordError] = field(default_factory=list)
+
+    def add(self, item) -> None:
+        if isinstance(item, RecordError):
+            self.errors.append(item)
+        else:
+            self.evaluations.setdefault(item.resume_id, item)
+
+    def failure_reasons(self, expected_ids: Iterable[int]) -> Dict[int, str]:
+        reasons = {}
+        for error in self.errors:
+            if error.resume_id is not None and error.resume_id not in self.evaluations:
+                reasons.setdefault(error.resume_id, error.error)
+        return {
+            resume_id: reasons.get(resume_id, "Missing from response")
+            for resume_id in expected_ids
+            if resume_id not in self.evaluations
+        }
+
+
+def _validate(data, record: str):
+    resume_id = data.get('resume_id') if isinstance(data, dict) else None
+    try:
+        return CandidateEvaluation.model_validate(data)
+    except ValidationError as e:
+        problems = '; '.join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+            for error in e.errors()
+        )
+        return RecordError(resume_id if isinstance(resume_id, int) else None, record, problems)
+
+
+def _records(text: str, start: int = 0) -> Iterator[Tuple[int, int, object]]:
+    """(start, end, decoded value or JSONDecodeError) for each JSON record in `text`.
+
+    Records are found by decoding from each '{' (or a '[' that opens a list
+    of objects), so a record may span several lines and prose, code fences
+    or a "Final Answer:" prefix around it are skipped.
+    """
+    while True:
+        match = _RECORD_START.search(text, start)
+        if match is None:
+            return
+        try:
+            data, end = _DECODER.raw_decode(text, match.start())
+        except json.JSONDecodeError as e:
+            yield match.start(), match.start(), e
+            start = match.start() + 1
+            continue
+        yield match.start(), end, data
+        start = end
+
+
+def _items(data, record: str) -> List:
+    if isinstance(data, json.JSONDecodeError):
+        return [RecordError(None, record, f"Invalid JSON: {data}")]
+    if isinstance(data, list):
+        return [_validate(item, record) for item in data]
+    return [_validate(data, record)]
+
+
+def parse_evaluations(text: str) -> ParsedEvaluations:
+    parsed = ParsedEvaluations()
+    text = str(text)
+    for start, end, data in _records(text):
+        record = text[start:end] if end > start else text[start:].partition('\n')[0]
+        for item in _items(data, record):
+            parsed.add(item)
+    return parsed
+
+
+class IncrementalRecordParser:
+    def __init__(self):
+        self.parsed = ParsedEvaluations()
+        self._buffer = ''
+
+    @property
+    def evaluations(self) -> List[CandidateEvaluation]:
+        return list(self.parsed.evaluations.values())
+
+    def feed(self, chunk: str) -> List[CandidateEvaluation]:
+        self._buffer += chunk
+        new = []
+        # A record that does not decode yet may still be arriving; it is kept
+        # until a later record decodes, which shows it was malformed.
+        incomplete = None
+        consumed = 0
+        for start, end, data in _records(self._buffer):
+            if isinstance(data, json.JSONDecodeError):
+                if incomplete is None:
+                    incomplete = start
+                continue
+            incomplete = None
+            consumed = end
+            new += self._consume(_items(data, self._buffer[start:end]))
+        self._buffer = self._buffer[consumed if incomplete is None else incomplete:]
+        return new
+
+    def close(self) -> List[CandidateEvaluation]:
+        remaining = parse_evaluations(self._buffer)
+        self._buffer = ''
+        return self._consume([*remaining.evaluations.values(), *remaining.errors])
+
+    def _consume(self, items: List) -> List[CandidateEvaluation]:
+        new = []
+        for item in items:
+            if isinstance(item, CandidateEvaluation) and item.resume_id not in self.parsed.evaluations:
+                new.append(item)
+            self.parsed.add(item)
+        return new
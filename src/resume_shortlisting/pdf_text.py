@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+import io
+import os
+import time
+
+import PyPDF2
+
+from src.resume_shortlisting.contact_fields import clean_text, extract_contact_fields
+from src.resume_shortlisting.skills import default_taxonomy
+
+# Bump whenever extraction output changes so cached results are invalidated.
+EXTRACTOR_VERSION = "4"
+
+# Resumes rarely carry anything job-relevant past the first pages, and the
+# prompt only has room for a few thousand tokens per candidate anyway.
+DEFAULT_MAX_PAGES = 10
+DEFAULT_MAX_CHARS = 30000
+
+# Output that fails these checks is re-extracted with pdfplumber.
+MIN_CHARS_PER_PAGE = 80
+MIN_ALPHA_RATIO = 0.5
+MAX_AVG_WORD_LENGTH = 20
+MAX_REPLACEMENT_RATIO = 0.01
+
+PDFSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+@dataclass
+class ExtractionStats:
+    method: str
+    pages_total: int = 0
+    pages_read: int = 0
+    chars: int = 0
+    stopped_early: bool = False
+    fallback_reason: Optional[str] = None
+    seconds: float = 0.0
+
+
+def text_quality_issue(text: str, pages_read: int) -> Optional[str]:
+    stripped = ''.join(text.split())
+    if len(stripped) < MIN_CHARS_PER_PAGE * max(pages_read, 1):
+        return "too little text"
+    if sum(char.isalpha() for char in stripped) / len(stripped) < MIN_ALPHA_RATIO:
+        return "mostly non-alphabetic"
+    if stripped.count('\ufffd') / len(stripped) > MAX_REPLACEMENT_RATIO:
+        return "undecodable characters"
+    if len(stripped) / len(text.split()) > MAX_AVG_WORD_LENGTH:
+        return "missing word breaks"
+    return None
+
+
+def _collect(page_texts: Iterator[str], max_chars: Optional[int]) -> Tuple[str, int, bool]:
+    parts: List[str] = []
+    size = 0
+    for page_text in page_texts:
+        parts.append(f"{page_text}\n")
+        size += len(parts[-1])
+        if max_chars and size >= max_chars:
+            return "".join(parts)[:max_chars], len(parts), True
+    return "".join(parts), len(parts), False
+
+
+class PDFTextExtractor:
+    def __init__(
+        self,
+        max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        fallback: bool = True,
+    ):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.fallback = fallback
+
+    @property
+    def settings_key(self) -> str:
+        # Editing the skills dictionary changes every profile, so it is part
+        # of the key too.
+        return f"{self.max_pages}:{self.max_chars}:{int(self.fallback)}:{default_taxonomy().fingerprint}"
+
+    def extract(self, source: PDFSource) -> str:
+        return self.extract_with_stats(source)[0]
+
+    def extract_with_stats(self, source: PDFSource) -> Tuple[str, ExtractionStats]:
+        start = time.perf_counter()
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                text, stats = self._extract_tiered(file)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            text, stats = self._extract_tiered(io.BytesIO(source))
+        else:
+            text, stats = self._extract_tiered(source)
+        stats.seconds = time.perf_counter() - start
+        return self._structure(text), stats
+
+    def _extract_tiered(self, stream: BinaryIO) -> Tuple[str, ExtractionStats]:
+        start = stream.tell()
+        reader = PyPDF2.PdfReader(stream)
+        pages = reader.pages[:self.max_pages] if self.max_pages else reader.pages
+        text, pages_read, stopped_early = _collect((page.extract_text() for page in pages), self.max_chars)
+        stats = ExtractionStats('pypdf', len(reader.pages), pages_read, len(text), stopped_early)
+
+        issue = text_quality_issue(text, pages_read) if self.fallback else None
+        if issue is None:
+            return text, stats
+        stats.fallback_reason = issue
+        stream.seek(start)
+        try:
+            fallback_text, fallback_pages, fallback_stopped = self._read_pdfplumber(stream)
+        except Exception as e:
+            stats.fallback_reason = f"{issue}; pdfplumber failed: {e}"
+            return text, stats
+        # pdfplumber is only kept when it actually did better.
+        if len(''.join(fallback_text.split())) > len(''.join(text.split())) or \
+                text_quality_issue(fallback_text, fallback_pages) is None:
+            stats.method = 'pdfplumber'
+            stats.pages_read = fallback_pages
+            stats.chars = len(fallback_text)
+            stats.stopped_early = fallback_stopped
+            return fallback_text, stats
+        return text, stats
+
+    def _read_pdfplumber(self, stream: BinaryIO) -> Tuple[str, int, bool]:
+        import pdfplumber
+
+        with pdfplumber.open(stream) as pdf:
+            pages = pdf.pages[:self.max_pages] if self.max_pages else pdf.pages
+            return _collect((page.extract_text() or '' for page in pages), self.max_chars)
+
+    def _structure(self, text: str) -> str:
+        # Skills are matched before cleaning, which drops the '#' of C#.
+        profile = default_taxonomy().profile(text)
+        text = clean_text(text)
+        name, mobile, email = extract_contact_fields(text)
+        
+        structured_output = f"""
+CANDIDATE INFORMATION:
+Name: {name}
+Mobile: {mobile}
+Email: {email}
+
+{profile.to_text()}
+
+RESUME CONTENT:
+{text}
+"""
+        
+        return structured_output
+    
+    def iter_pages(self, source: PDFSource) -> Iterator[str]:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                yield from self._iter_reader_pages(file)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            yield from self._iter_reader_pages(io.BytesIO(source))
+        else:
+            yield from self._iter_reader_pages(source)
+
+    def _iter_reader_pages(self, stream: BinaryIO) -> Iterator[str]:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        for page in pdf_reader.pages:
+            yield page.extract_text()
@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.resume_shortlisting.compaction import tokenize
+
+
+def bm25_scores(documents: List[str], query: str, k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    query_terms = pd.unique(pd.Series(tokenize(query), dtype=object))
+    if len(documents) == 0 or len(query_terms) == 0:
+        return np.zeros(len(documents))
+
+    doc_terms = [tokenize(document) for document in documents]
+    lengths = np.array([len(terms) for terms in doc_terms], dtype=float)
+    rows = np.repeat(np.arange(len(documents)), lengths.astype(int))
+    flat_terms = [term for terms in doc_terms for term in terms]
+
+    # Map every token of the corpus onto the query vocabulary in one pass;
+    # tokens outside the query get code -1 and are dropped.
+    codes = pd.Index(query_terms).get_indexer(flat_terms)
+    in_query = codes >= 0
+    tf = np.zeros((len(documents), len(query_terms)))
+    np.add.at(tf, (rows[in_query], codes[in_query]), 1.0)
+
+    doc_freq = np.count_nonzero(tf, axis=0)
+    idf = np.log((len(documents) - doc_freq + 0.5) / (doc_freq + 0.5) + 1.0)
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1.0 - b + b * lengths / avg_length)
+    return (tf * (k1 + 1.0) / (tf + norm[:, None])) @ idf
+
+
+def select_top(scores: np.ndarray, top_k: Optional[int] = None, min_relative_score: float = 0.0) -> List[int]:
+    order = np.argsort(-scores, kind='stable')
+    best = scores[order[0]] if len(order) else 0.0
+    if best > 0 and min_relative_score > 0:
+        order = order[scores[order] >= best * min_relative_score]
+    if top_k is not None:
+        order = order[:top_k]
+    return order.tolist()
@@ -0,0 +1,296 @@
+import email.utils
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Tier-1 OpenAI limits for gpt-4o-mini; both can be raised or lowered
+# through the environment without touching code.
+DEFAULT_RPM = int(os.environ.get('RESUME_SHORTLISTING_RPM', 500))
+DEFAULT_TPM = int(os.environ.get('RESUME_SHORTLISTING_TPM', 200_000))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get('RESUME_SHORTLISTING_MAX_CONCURRENCY', 16))
+DEFAULT_MAX_RETRIES = 6
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+# Concurrency is halved at most once per window, so the burst of 429s that
+# every in-flight request gets at once counts as a single signal.
+DECREASE_COOLDOWN = 2.0
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKENS_ESTIMATE = 512
+
+TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = {'APIConnectionError', 'APITimeoutError', 'Timeout', 'ServiceUnavailableError', 'InternalServerError'}
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def estimate_tokens(messages) -> int:
+    """Rough prompt size of `messages` plus room for the completion, for budgeting only."""
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = len(json.dumps(messages, default=str))
+    return chars // CHARS_PER_TOKEN + COMPLETION_TOKENS_ESTIMATE
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    # OpenAI's x-ratelimit-reset-* headers look like "1s", "250ms" or "6m0s".
+    parts = _DURATION_PART.findall(value)
+    if not parts or ''.join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds to wait according to retry-after-ms, retry-after or OpenAI's reset headers."""
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            date = email.utils.parsedate_to_datetime(value) if email.utils.parsedate_tz(value) else None
+            if date is not None:
+                return max(0.0, date.timestamp() - time.time())
+    resets = [
+        _parse_duration(headers.get(name, '').strip())
+        for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+def _http_error(error: BaseException) -> Optional[BaseException]:
+    # crewai re-raises streaming failures as a bare Exception, so the client
+    # error may sit further down the cause chain.
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if getattr(error, 'status_code', None) is not None or type(error).__name__ in TRANSIENT_ERRORS:
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def classify_error(error: BaseException):
+    """Return (throttled, retryable, retry_after_seconds) for an exception raised by an LLM call."""
+    cause = _http_error(error)
+    if cause is None:
+        return False, False, None
+    status = getattr(cause, 'status_code', None)
+    try:
+        status = int(status) if status is not None else None
+    except (TypeError, ValueError):
+        status = None
+    throttled = status == 429 or 'RateLimit' in type(cause).__name__
+    # An exhausted quota is also a 429, but waiting will not fix it.
+    if throttled and 'insufficient_quota' in str(cause):
+        return True, False, None
+    retryable = throttled or status in TRANSIENT_STATUS or type(cause).__name__ in TRANSIENT_ERRORS
+    response = getattr(cause, 'response', None)
+    headers = getattr(cause, 'litellm_response_headers', None) or getattr(response, 'headers', None)
+    return throttled, retryable, parse_retry_after(headers) if retryable else None
+
+
+class TokenBucket:
+    """A budget of `per_minute` units that refills continuously.
+
+    Callers reserve what they need up front and wait out the deficit, so
+    reservations are served in the order they were made and a burst never
+    spends more than a minute's budget ahead.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` (capped at the capacity) and return the seconds until it is covered."""
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    succeeded: int = 0
+    throttled: int = 0
+    retries: int = 0
+    failed: int = 0
+    waited_seconds: float = 0.0
+    in_flight: int = 0
+    concurrency_limit: float = 0.0
+
+
+class RateLimitScheduler:
+    """Admits LLM calls within request and token budgets and an adaptive concurrency limit.
+
+    The concurrency limit grows by one per limit's worth of successful
+    calls and halves when the API answers 429 (AIMD, as TCP does). A
+    retry-after on a 429 pauses every caller, not just the one that was
+    told, since they all share the same organisation limits.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = DEFAULT_RPM,
+        tpm: Optional[float] = DEFAULT_TPM,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._requests = TokenBucket(rpm, clock) if rpm else None
+        self._tokens = TokenBucket(tpm, clock) if tpm else None
+        self._cond = threading.Condition()
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._stats = SchedulerStats(concurrency_limit=self._limit)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._limit)
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            with self._cond:
+                self._stats.waited_seconds += seconds
+            self._sleep(seconds)
+
+    def _acquire(self, tokens: int) -> None:
+        with self._cond:
+            pause = self._paused_until - self._clock()
+        self._wait(pause)
+        with self._cond:
+            delay = 0.0
+            if self._requests is not None:
+                delay = self._requests.reserve(1)
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens))
+        self._wait(delay)
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            self._stats.requests += 1
+
+    def _release(self, throttled: bool, retry_after: Optional[float]) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            now = self._clock()
+            if throttled:
+                self._stats.throttled += 1
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self._limit = max(float(self.min_concurrency), self._limit / 2)
+                    self._last_decrease = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                self._limit = min(float(self.max_concurrency), self._limit + 1 / self._limit)
+            self._stats.concurrency_limit = self._limit
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0-based): full jitter, never shorter than retry-after."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        if retry_after is not None:
+            # A little jitter on top keeps callers told the same instant
+            # from arriving together again.
+            return min(self.max_delay, retry_after) + self._rng() * self.base_delay
+        return self._rng() * ceiling
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """Run `fn` once admitted, retrying throttled and transient failures."""
+        attempt = 0
+        while True:
+            self._acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                throttled, retryable, retry_after = classify_error(e)
+                self._release(throttled, retry_after)
+                if not retryable or attempt >= self.max_retries:
+                    with self._cond:
+                        self._stats.failed += 1
+                    raise
+                with self._cond:
+                    self._stats.retries += 1
+                self._wait(self.backoff(attempt, retry_after))
+                attempt += 1
+                continue
+            self._release(False, None)
+            with self._cond:
+                self._stats.succeeded += 1
+            return result
+
+    def stats(self) -> Dict:
+        with self._cond:
+            self._stats.in_flight = self._in_flight
+            return asdict(self._stats)
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def shared_scheduler(model: str, **settings) -> RateLimitScheduler:
+    """The process-wide scheduler for `model`, created with `settings` on first use.
+
+    OpenAI limits apply per organisation and model, so every crew, batch
+    run and Streamlit session in the process calling the same model goes
+    through the same budgets.
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(model)
+        if scheduler is None:
+            scheduler = _schedulers[model] = RateLimitScheduler(**settings)
+        return scheduler
+
+
+def configure_scheduler(model: str, **settings) -> RateLimitScheduler:
+    """Replace the process-wide scheduler for `model`; calls already admitted finish under the old one."""
+    with _schedulers_lock:
+        scheduler = _schedulers[model] = RateLimitScheduler(**settings)
+        return scheduler
+
+
+def scheduler_stats() -> Dict[str, Dict]:
+    """Stats of every process-wide scheduler, by model."""
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    return {model: scheduler.stats() for model, scheduler in schedulers.items()}
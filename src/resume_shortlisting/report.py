@@ -0,0 +1,185 @@
+import io
+import os
+from xml.sax.saxutils import escape
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Relative column widths, scaled to the page width of each report.
+PDF_COLUMN_WIDTHS = {
+    "Resume #": 0.7, "Name": 1.1, "Mobile": 0.9, "Score": 0.5,
+    "Questions for Interview": 2.2, "Reasoning": 1.8, "Duplicate Of": 0.8,
+    "Quick Score": 0.5, "Decided By": 0.7,
+    "Must-Have Coverage": 0.7, "Missing Must-Haves": 1.0,
+}
+PDF_CELL_CHARS = 100
+CELL_PADDING = 4
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+    ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('LEADING', (0, 1), (-1, -1), 10),
+])
+# Text that does not fit its column becomes a Paragraph so it wraps;
+# TABLE_STYLE's fonts do not reach Paragraphs, so these styles match them.
+HEADER_STYLE = ParagraphStyle(
+    'TableHeader', fontName='Helvetica-Bold', fontSize=8, leading=10,
+    textColor=colors.whitesmoke, alignment=TA_CENTER,
+)
+CELL_STYLE = ParagraphStyle('TableCell', fontName='Helvetica', fontSize=8, leading=10, alignment=TA_CENTER)
+
+
+def truncate_cells(df, limit: int = PDF_CELL_CHARS):
+    """Stringify every cell and cut those longer than `limit` characters, column by column."""
+    cells = df.astype(str)
+    for col in cells.columns:
+        values = cells[col]
+        too_long = values.str.len() > limit
+        if too_long.any():
+            cells.loc[too_long, col] = values[too_long].str.slice(0, limit) + "..."
+    return cells
+
+
+def _column_widths(columns, frame_width):
+    """Scale the PDF_COLUMN_WIDTHS weights of `columns` to fill `frame_width`."""
+    weights = np.array([PDF_COLUMN_WIDTHS.get(col, 0.8) for col in columns])
+    return (weights / weights.sum() * frame_width).tolist()
+
+
+class _Cell(Paragraph):
+    """A Paragraph that keeps its last wrap; `Table` wraps every cell again when drawing."""
+
+    def wrap(self, availWidth, availHeight):
+        if getattr(self, '_wrapped_width', None) != availWidth:
+            self._wrapped_size = super().wrap(availWidth, availHeight)
+            self._wrapped_width = availWidth
+        return self._wrapped_size
+
+
+def _paragraph(text, style):
+    return _Cell(escape(text).replace('\n', '<br/>'), style)
+
+
+def _column_cells(texts, width):
+    """Return the cells of one column and the number of lines each wraps to.
+
+    ReportLab lays out a plain string far faster than a Paragraph, so only
+    text wider than the column is wrapped in one.
+    """
+    cells, lines = [], []
+    for text in texts:
+        if '\n' not in text and stringWidth(text, CELL_STYLE.fontName, CELL_STYLE.fontSize) <= width:
+            cells.append(text)
+            lines.append(1)
+        else:
+            cell = _paragraph(text, CELL_STYLE)
+            cell.wrap(width, 1e6)
+            cells.append(cell)
+            lines.append(max(len(cell.blPara.lines), 1))
+    return cells, lines
+
+
+def _row_metrics(header, col_widths):
+    # A row is as tall as its cell with the most wrapped lines. Measuring a
+    # probe table keeps the numbers in step with TABLE_STYLE and CELL_STYLE
+    # instead of hard-coding ReportLab's padding and leading.
+    one_line = ['x'] * len(col_widths)
+    two_lines = [_paragraph('x\nx', CELL_STYLE) for _ in col_widths]
+    probe = Table([header, one_line, two_lines], colWidths=col_widths)
+    probe.setStyle(TABLE_STYLE)
+    probe.wrap(0, 0)
+    header_height, one, two = probe._rowHeights
+    return header_height, one - (two - one), two - one
+
+
+def _paginate(line_counts, header_height, padding, leading, first_page, other_pages):
+    """Yield (start, stop) row ranges that each fill one page."""
+    heights = padding + leading * line_counts
+    start, available = 0, first_page - header_height
+    used = 0.0
+    for index, height in enumerate(heights):
+        if used + height > available and index > start:
+            yield start, index
+            start, available, used = index, other_pages - header_height, 0.0
+        used += height
+    if start < len(heights) or not len(heights):
+        yield start, len(heights)
+
+
+def write_pdf_report(df, target, title: str = "Resume Shortlisting Report"):
+    """Render `df` as a table report into `target`, a path or a writable binary file.
+
+    Rows are laid out one page per `Table`. ReportLab re-measures every
+    remaining row each time it splits a table across pages, which made
+    a single table grow quadratically with the row count. Row heights are
+    measured once here and handed to each `Table`.
+    """
+    if isinstance(target, os.PathLike):
+        target = os.fspath(target)
+    doc = SimpleDocTemplate(
+        target, pagesize=landscape(letter),
+        leftMargin=0.5 * inch, rightMargin=0.5 * inch, topMargin=0.5 * inch, bottomMargin=0.5 * inch,
+    )
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        textColor=colors.darkblue,
+        alignment=1
+    )
+    heading = Paragraph(title, title_style)
+    story = [heading, Spacer(1, 12)]
+
+    columns = df.columns.tolist()
+    # The default frame has 6pt of padding on each side; a 1pt margin
+    # absorbs rounding in ReportLab's own layout.
+    col_widths = _column_widths(columns, doc.width - 12 - 1)
+    header = [_paragraph(col, HEADER_STYLE) for col in columns]
+    texts = truncate_cells(df)
+    cells = []
+    line_counts = np.ones(len(texts), dtype=int)
+    for col, width in zip(texts.columns, col_widths):
+        column, lines = _column_cells(texts[col], width - 2 * CELL_PADDING)
+        cells.append(column)
+        line_counts = np.maximum(line_counts, lines)
+
+    page_height = doc.height - 12 - 1
+    title_height = heading.wrap(doc.width, doc.height)[1] + title_style.spaceAfter + 12
+    header_height, padding, leading = _row_metrics(header, col_widths)
+    row_heights = padding + leading * line_counts
+
+    rows = [list(row) for row in zip(*cells)]
+    pages = list(_paginate(line_counts, header_height, padding, leading, page_height - title_height, page_height))
+    for page, (start, stop) in enumerate(pages):
+        table = Table(
+            [header] + rows[start:stop], colWidths=col_widths,
+            rowHeights=[header_height, *row_heights[start:stop]], repeatRows=1,
+        )
+        table.setStyle(TABLE_STYLE)
+        story.append(table)
+        if page < len(pages) - 1:
+            story.append(PageBreak())
+    doc.build(story)
+
+
+def create_pdf_report(df, filename):
+    buffer = io.BytesIO()
+    write_pdf_report(df, buffer)
+    buffer.seek(0)
+    return buffer
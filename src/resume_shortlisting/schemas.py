@@ -0,0 +1,48 @@
+import re
+from typing import Dict, List
+
+from pydantic import BaseModel, Field, field_validator
+
+_SCORE = re.compile(r'\d+(?:\.\d+)?')
+
+
+class CandidateEvaluation(BaseModel):
+    resume_id: int = Field(ge=1, description="Number of the RESUME heading the evaluation belongs to")
+    name: str = Field(min_length=1)
+    mobile: str = "Not found"
+    score: float = Field(ge=0, le=10)
+    questions: List[str] = Field(min_length=1)
+    reasoning: str = Field(min_length=1)
+
+    @field_validator('score', mode='before')
+    @classmethod
+    def _parse_score(cls, value):
+        # Models sometimes answer "8/10" or "8 out of 10".
+        if isinstance(value, str):
+            match = _SCORE.search(value)
+            return float(match.group()) if match else value
+        return value
+
+    @field_validator('questions', mode='before')
+    @classmethod
+    def _split_questions(cls, value):
+        if isinstance(value, str):
+            return [value]
+        return value
+
+    @field_validator('mobile', mode='before')
+    @classmethod
+    def _mobile_to_text(cls, value):
+        if value is None or value == '':
+            return "Not found"
+        return str(value)
+
+    def to_row(self) -> Dict:
+        return {
+            "Resume #": self.resume_id,
+            "Name": self.name,
+            "Mobile": self.mobile,
+            "Score": self.score,
+            "Questions for Interview": ' '.join(self.questions),
+            "Reasoning": self.reasoning,
+        }
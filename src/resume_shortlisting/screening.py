@@ -0,0 +1,345 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from src.resume_shortlisting.crew import ChunkCallback, ResumeShortlistingCrew
+from src.resume_shortlisting.parsing import (
+    format_resume,
+    format_resumes_for_prompt,
+    parse_candidate_header,
+    parse_evaluations,
+    parse_quick_score,
+)
+from src.resume_shortlisting.schemas import CandidateEvaluation
+from src.resume_shortlisting.skills import default_taxonomy, must_have_coverage, must_have_section, profile_of
+
+EvaluationCallback = Callable[[int, Optional[CandidateEvaluation], Optional[str]], None]
+
+
+@dataclass
+class ScreeningResult:
+    evaluations: Dict[int, CandidateEvaluation]
+    failures: Dict[int, str]
+    jd_requirements: str
+    raw: str
+    reasked: List[int] = field(default_factory=list)
+    # Cascade runs only: which tier settled each score, and the quick-pass
+    # score every candidate got.
+    decided_by: Dict[int, str] = field(default_factory=dict)
+    quick_scores: Dict[int, float] = field(default_factory=dict)
+    # Failed candidates whose last attempt got no response at all (transport,
+    # auth or rate-limit errors), as opposed to a response that failed
+    # validation.
+    call_failures: Set[int] = field(default_factory=set)
+
+    def must_haves(self) -> List[str]:
+        """Taxonomy skills named in the must-have part of the job requirements."""
+        return default_taxonomy().find(must_have_section(self.jd_requirements))
+
+    def coverage(self, resumes: Sequence[str]) -> Dict[int, Tuple[float, List[str]]]:
+        """Share of the must-have skills each resume has, and those it lacks, by resume id.
+
+        Empty when the requirements name no must-have skill the taxonomy knows.
+        """
+        must_haves = self.must_haves()
+        if not must_haves:
+            return {}
+        return {
+            resume_id: must_have_coverage(profile_of(resume), must_haves)
+            for resume_id, resume in enumerate(resumes, start=1)
+        }
+
+    def rows(self, resumes: Sequence[str]) -> List[Dict]:
+        rows = []
+        coverage = self.coverage(resumes)
+        for resume_id in range(1, len(resumes) + 1):
+            if resume_id in self.evaluations:
+                rows.append(self.evaluations[resume_id].to_row())
+            elif resume_id in self.failures:
+                fields = parse_candidate_header(resumes[resume_id - 1])
+                rows.append({
+                    "Resume #": resume_id,
+                    "Name": fields.get('name', f"Resume {resume_id}"),
+                    "Mobile": fields.get('mobile', "Not found"),
+                    "Score": 0.0,
+                    "Questions for Interview": "Evaluation failed",
+                    "Reasoning": self.failures[resume_id],
+                })
+            if self.decided_by and rows and rows[-1]["Resume #"] == resume_id:
+                rows[-1]["Quick Score"] = self.quick_scores.get(resume_id)
+                rows[-1]["Decided By"] = self.decided_by.get(resume_id, "")
+            if coverage and rows and rows[-1]["Resume #"] == resume_id:
+                share, missing = coverage[resume_id]
+                rows[-1]["Must-Have Coverage"] = round(share * 100)
+                rows[-1]["Missing Must-Haves"] = ', '.join(missing)
+        return rows
+
+
+def _evaluation_from(crew_instance: ResumeShortlistingCrew, outcome, resume_id: int, role: Optional[str] = None):
+    if not outcome.ok:
+        return None, outcome.error
+    with crew_instance.metrics.stage('parse_response', candidate=resume_id if role is None else (role, resume_id)):
+        parsed = parse_evaluations(outcome.raw)
+    if parsed.evaluations:
+        # The resume id is known from the request, whatever the model echoed.
+        evaluation = next(iter(parsed.evaluations.values()))
+        return evaluation.model_copy(update={'resume_id': resume_id}), None
+    return None, parsed.errors[0].error if parsed.errors else "No evaluation in response"
+
+
+def score_individually(
+    crew_instance: ResumeShortlistingCrew,
+    jd_requirements: str,
+    resumes: Sequence[str],
+    resume_ids: Sequence[int],
+    max_concurrency: int = 4,
+    on_evaluation: Optional[EvaluationCallback] = None,
+    role: Optional[str] = None,
+):
+    evaluations: Dict[int, CandidateEvaluation] = {}
+    failures: Dict[int, str] = {}
+    call_failures: Set[int] = set()
+    raw_sections: List[str] = []
+
+    def handle(outcome):
+        resume_id = resume_ids[outcome.index]
+        raw_sections.append(outcome.raw if outcome.ok else f"Resume {resume_id} failed: {outcome.error}")
+        evaluation, error = _evaluation_from(crew_instance, outcome, resume_id, role)
+        if evaluation is not None:
+            evaluations[resume_id] = evaluation
+        else:
+            failures[resume_id] = error
+            if not outcome.ok:
+                call_failures.add(resume_id)
+        if on_evaluation:
+            on_evaluation(resume_id, evaluation, error)
+
+    prompts = [format_resume(resume_id, resumes[resume_id - 1]) for resume_id in resume_ids]
+    candidates = resume_ids if role is None else [(role, resume_id) for resume_id in resume_ids]
+    crew_instance.score_resumes(jd_requirements, prompts, max_concurrency, on_result=handle, candidates=candidates)
+    return evaluations, failures, call_failures, raw_sections
+
+
+def _reask_failures(crew_instance, result: ScreeningResult, resumes, max_concurrency, on_evaluation, retries, role=None):
+    for _ in range(retries):
+        if not result.failures:
+            break
+        resume_ids = sorted(result.failures)
+        result.reasked.extend(resume_ids)
+        evaluations, failures, call_failures, raw_sections = score_individually(
+            crew_instance, result.jd_requirements, resumes, resume_ids, max_concurrency, on_evaluation, role
+        )
+        result.evaluations.update(evaluations)
+        result.failures = failures
+        result.call_failures = call_failures
+        result.raw = '\n\n'.join([result.raw, *raw_sections])
+    return result
+
+
+def screen_single_prompt(
+    crew_instance: ResumeShortlistingCrew,
+    job_description: str,
+    resumes: Sequence[str],
+    on_chunk: Optional[ChunkCallback] = None,
+    on_evaluation: Optional[EvaluationCallback] = None,
+    max_concurrency: int = 4,
+    retries: int = 1,
+) -> ScreeningResult:
+    output = crew_instance.shortlist(job_description, format_resumes_for_prompt(resumes), on_chunk=on_chunk)
+    if len(output.tasks_output) > 1:
+        jd_requirements = output.tasks_output[0].raw
+    else:
+        jd_requirements = crew_instance.run_jd_analysis(job_description)
+
+    # One pass over the response; only candidates whose record is missing or
+    # fails validation are sent back to the model, one call each.
+    expected_ids = range(1, len(resumes) + 1)
+    with crew_instance.metrics.stage('parse_response'):
+        parsed = parse_evaluations(output.raw)
+    result = ScreeningResult(
+        evaluations={i: e for i, e in parsed.evaluations.items() if i in expected_ids},
+        failures=parsed.failure_reasons(expected_ids),
+        jd_requirements=jd_requirements,
+        raw=output.raw,
+    )
+    return _reask_failures(crew_instance, result, resumes, max_concurrency, on_evaluation, retries)
+
+
+def screen_per_candidate(
+    crew_instance: ResumeShortlistingCrew,
+    job_description: str,
+    resumes: Sequence[str],
+    max_concurrency: int = 4,
+    on_evaluation: Optional[EvaluationCallback] = None,
+    retries: int = 1,
+) -> ScreeningResult:
+    jd_requirements = crew_instance.run_jd_analysis(job_description)
+    evaluations, failures, call_failures, raw_sections = score_individually(
+        crew_instance, jd_requirements, resumes, range(1, len(resumes) + 1), max_concurrency, on_evaluation
+    )
+    result = ScreeningResult(
+        evaluations=evaluations,
+        failures=failures,
+        call_failures=call_failures,
+        jd_requirements=jd_requirements,
+        raw='\n\n'.join([f"JOB REQUIREMENTS:\n{jd_requirements}", *raw_sections]),
+    )
+    return _reask_failures(crew_instance, result, resumes, max_concurrency, on_evaluation, retries)
+
+
+DEFAULT_CASCADE_MARGIN = 1.5
+
+
+def screen_cascade(
+    crew_instance: ResumeShortlistingCrew,
+    job_description: str,
+    resumes: Sequence[str],
+    threshold: float,
+    margin: float = DEFAULT_CASCADE_MARGIN,
+    max_concurrency: int = 4,
+    on_evaluation: Optional[EvaluationCallback] = None,
+    retries: int = 1,
+) -> ScreeningResult:
+    """Score every resume with the quick model, then fully evaluate only the contenders.
+
+    Candidates whose quick score is at least `threshold - margin`, or
+    whose quick pass gave no usable score, get the full evaluation with
+    interview questions. The rest keep their quick score.
+    """
+    jd_requirements = crew_instance.run_jd_analysis(job_description)
+    resume_ids = range(1, len(resumes) + 1)
+    quick_scores: Dict[int, float] = {}
+    raw_sections = [f"JOB REQUIREMENTS:\n{jd_requirements}"]
+
+    def handle(outcome):
+        resume_id = resume_ids[outcome.index]
+        if outcome.ok:
+            raw_sections.append(f"Resume {resume_id} quick pass: {outcome.raw}")
+            score = parse_quick_score(outcome.raw)
+            if score is not None:
+                quick_scores[resume_id] = score
+        else:
+            raw_sections.append(f"Resume {resume_id} quick pass failed: {outcome.error}")
+
+    prompts = [format_resume(resume_id, resumes[resume_id - 1]) for resume_id in resume_ids]
+    crew_instance.score_resumes(jd_requirements, prompts, max_concurrency, on_result=handle, quick=True)
+
+    quick_tier = f"quick ({crew_instance.quick_model})"
+    full_tier = f"full ({crew_instance.model})"
+    cutoff = threshold - margin
+    escalated = [i for i in resume_ids if quick_scores.get(i, cutoff) >= cutoff]
+    evaluations: Dict[int, CandidateEvaluation] = {}
+    decided_by: Dict[int, str] = {}
+    for resume_id in resume_ids:
+        if resume_id in escalated:
+            continue
+        fields = parse_candidate_header(resumes[resume_id - 1])
+        evaluations[resume_id] = CandidateEvaluation(
+            resume_id=resume_id,
+            name=fields.get('name') or f"Resume {resume_id}",
+            mobile=fields.get('mobile'),
+            score=quick_scores[resume_id],
+            questions=["Not generated: the quick pass scored this candidate well below the threshold."],
+            reasoning=f"Quick-pass score {quick_scores[resume_id]:.1f} is below {cutoff:.1f} "
+                      f"(threshold {threshold:.1f} minus a {margin:.1f} margin).",
+        )
+        decided_by[resume_id] = quick_tier
+        if on_evaluation:
+            on_evaluation(resume_id, evaluations[resume_id], None)
+
+    full_evaluations, failures, call_failures, full_sections = score_individually(
+        crew_instance, jd_requirements, resumes, escalated, max_concurrency, on_evaluation
+    )
+    evaluations.update(full_evaluations)
+    decided_by.update((resume_id, full_tier) for resume_id in escalated)
+    result = ScreeningResult(
+        evaluations=evaluations,
+        failures=failures,
+        call_failures=call_failures,
+        jd_requirements=jd_requirements,
+        raw='\n\n'.join([*raw_sections, *full_sections]),
+        decided_by=decided_by,
+        quick_scores=quick_scores,
+    )
+    return _reask_failures(crew_instance, result, resumes, max_concurrency, on_evaluation, retries)
+
+
+RoleEvaluationCallback = Callable[[str, int, Optional[CandidateEvaluation], Optional[str]], None]
+
+
+def screen_many(
+    crew_instance: ResumeShortlistingCrew,
+    job_descriptions: Dict[str, str],
+    resumes: Sequence[str],
+    max_concurrency: int = 4,
+    on_evaluation: Optional[RoleEvaluationCallback] = None,
+    retries: int = 1,
+) -> Dict[str, ScreeningResult]:
+    """Score every resume against every job description, by role title.
+
+    Each job description is analysed once (and served from the JD cache
+    after that). All candidate × role scoring calls then go through one
+    pool, instead of one run per role re-sending the whole batch.
+    """
+    roles = list(job_descriptions)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(roles)))) as pool:
+        requirements = dict(zip(roles, pool.map(crew_instance.run_jd_analysis, job_descriptions.values())))
+
+    pairs = [(role, resume_id) for role in roles for resume_id in range(1, len(resumes) + 1)]
+    prompts = [format_resume(resume_id, resumes[resume_id - 1]) for resume_id in range(1, len(resumes) + 1)]
+    results = {
+        role: ScreeningResult(evaluations={}, failures={}, jd_requirements=requirements[role], raw='')
+        for role in roles
+    }
+    raw_sections: Dict[str, List[str]] = {role: [f"JOB REQUIREMENTS:\n{requirements[role]}"] for role in roles}
+
+    def handle(outcome):
+        role, resume_id = pairs[outcome.index]
+        raw_sections[role].append(outcome.raw if outcome.ok else f"Resume {resume_id} failed: {outcome.error}")
+        evaluation, error = _evaluation_from(crew_instance, outcome, resume_id, role)
+        if evaluation is not None:
+            results[role].evaluations[resume_id] = evaluation
+        else:
+            results[role].failures[resume_id] = error
+            if not outcome.ok:
+                results[role].call_failures.add(resume_id)
+        if on_evaluation:
+            on_evaluation(role, resume_id, evaluation, error)
+
+    crew_instance.score_pairs(
+        [(requirements[role], prompts[resume_id - 1]) for role, resume_id in pairs],
+        max_concurrency,
+        on_result=handle,
+        candidates=pairs,
+    )
+    for role in roles:
+        result = results[role]
+        result.raw = '\n\n'.join(raw_sections[role])
+        callback = partial(on_evaluation, role) if on_evaluation else None
+        _reask_failures(crew_instance, result, resumes, max_concurrency, callback, retries, role)
+    return results
+
+
+def build_score_matrix(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Pivot per-role result frames into one row per candidate and one score column per role.
+
+    The frames must list the same candidates in the same order, as frames
+    built from one screen_many run do. Ties for the best fit go to the
+    role listed first.
+    """
+    roles = list(frames)
+    first = frames[roles[0]]
+    identity = [col for col in ("Resume #", "Name", "Mobile", "Duplicate Of") if col in first.columns]
+    matrix = first[identity].reset_index(drop=True)
+    for role in roles:
+        frame = frames[role]
+        if not frame["Resume #"].reset_index(drop=True).equals(matrix["Resume #"]):
+            raise ValueError(f"Results for {role!r} list different candidates")
+        matrix[role] = frame["Score"].to_numpy()
+    scores = matrix[roles]
+    matrix["Best Fit Role"] = scores.idxmax(axis=1)
+    matrix["Best Score"] = scores.max(axis=1)
+    return matrix
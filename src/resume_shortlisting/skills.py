@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+DEFAULT_SKILLS_PATH = Path(__file__).parent / 'config' / 'skills.yaml'
+PROFILE_MARKER = 'SKILL PROFILE:'
+# A years figure belongs to a skill named right before it ("Python - 3 yrs"),
+# else to the first one named within this many words after it ("5+ years of
+# hands-on Python"), else to one ending a few words before it.
+YEARS_WINDOW_AFTER = 6
+YEARS_WINDOW_BEFORE = 3
+MAX_YEARS = 50
+
+# Words keep the symbols skill names are written with: c++, c#, .net, node.js.
+_TOKEN = re.compile(r'\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9][a-z0-9+#]*)*')
+_YEARS_NUMBER = re.compile(r'^(\d{1,2}(?:\.\d)?)\+?$')
+_YEARS_UNIT = {'year', 'years', 'yr', 'yrs'}
+_EXPERIENCE = {'experience', 'exp'}
+_SKILLS_LINE = re.compile(r'^Skills: (.*)$', re.MULTILINE)
+_EXPERIENCE_LINE = re.compile(r'^Experience: (\d+(?:\.\d+)?) years?$', re.MULTILINE)
+_PROFILE_SKILL = re.compile(r'^(.*?)(?: \((\d+(?:\.\d+)?) yrs?\))?$')
+
+_MUST_HAVE = re.compile(r'must[\s-]*have|mandatory|required skills|essential', re.IGNORECASE)
+_OTHER_SECTION = re.compile(
+    r'nice[\s-]*to[\s-]*have|preferred|bonus|optional|experience|industr|domain|responsibilit|education',
+    re.IGNORECASE,
+)
+_HEADING_PREFIX = re.compile(r'^\s*(?:#+|\d+[.)]|[-*•+])?\s*')
+_BULLET = re.compile(r'^\s*(?:[-*•+]|\d+[.)])\s+')
+
+_END = ''
+
+
+def tokenize_skills(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _format_years(years: float) -> str:
+    return f"{years:g}"
+
+
+@dataclass
+class SkillProfile:
+    """Skills found in one resume, most mentioned first, with the years stated for them."""
+
+    skills: List[str] = field(default_factory=list)
+    years: Dict[str, float] = field(default_factory=dict)
+    total_years: Optional[float] = None
+
+    def vector(self, taxonomy: 'SkillTaxonomy') -> np.ndarray:
+        """One slot per taxonomy skill: the years stated for it, 1 when present without years, else 0."""
+        vector = np.zeros(len(taxonomy), dtype=np.float32)
+        for skill in self.skills:
+            index = taxonomy.index.get(skill)
+            if index is not None:
+                vector[index] = self.years.get(skill, 1.0)
+        return vector
+
+    def to_text(self) -> str:
+        lines = [PROFILE_MARKER]
+        if self.total_years is not None:
+            lines.append(f"Experience: {_format_years(self.total_years)} years")
+        skills = [
+            f"{skill} ({_format_years(self.years[skill])} yrs)" if skill in self.years else skill
+            for skill in self.skills
+        ]
+        lines.append(f"Skills: {', '.join(skills) if skills else 'none recognised'}")
+        return '\n'.join(lines)
+
+    @classmethod
+    def from_text(cls, resume: str) -> Optional['SkillProfile']:
+        """The profile written into `resume` by `to_text`, or None when it has none."""
+        section = resume.partition(PROFILE_MARKER)[2]
+        if not section:
+            return None
+        section = section.partition('RESUME CONTENT:')[0]
+        profile = cls()
+        experience = _EXPERIENCE_LINE.search(section)
+        if experience:
+            profile.total_years = float(experience.group(1))
+        skills = _SKILLS_LINE.search(section)
+        if skills and skills.group(1) != 'none recognised':
+            for item in skills.group(1).split(', '):
+                name, years = _PROFILE_SKILL.match(item).groups()
+                profile.skills.append(name)
+                if years:
+                    profile.years[name] = float(years)
+        return profile
+
+
+class SkillTaxonomy:
+    """A skills dictionary compiled into a word-level trie.
+
+    Every synonym of every skill is a path through the trie, so one
+    left-to-right pass over a resume's words finds all of them, taking the
+    longest match at each position ("react native" over "react").
+    """
+
+    def __init__(self, skills: Dict[str, Dict]):
+        self.names: List[str] = []
+        self.categories: List[str] = []
+        self._root: Dict = {}
+        for name, entry in skills.items():
+            entry = entry or {}
+            index = len(self.names)
+            self.names.append(str(name))
+            self.categories.append(str(entry.get('category', '')))
+            phrases = [str(synonym) for synonym in entry.get('synonyms') or []]
+            if entry.get('match_name', True):
+                phrases.append(str(name))
+            for phrase in phrases:
+                self._add(phrase, index)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.fingerprint = hashlib.sha256(json.dumps(skills, sort_keys=True).encode()).hexdigest()[:12]
+
+    def _add(self, phrase: str, index: int) -> None:
+        words = tokenize_skills(phrase)
+        if not words:
+            raise ValueError(f"Skill synonym {phrase!r} has no words")
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        existing = node.get(_END)
+        if existing is not None and existing != index:
+            raise ValueError(f"{phrase!r} is listed under both {self.names[existing]} and {self.names[index]}")
+        node[_END] = index
+
+    @classmethod
+    def load(cls, path=None) -> 'SkillTaxonomy':
+        with open(path or DEFAULT_SKILLS_PATH, 'r', encoding='utf-8') as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def matches(self, words: Sequence[str]) -> List[Tuple[int, int, int]]:
+        """(skill index, first word, end word) of every skill mention in `words`."""
+        found = []
+        i, n = 0, len(words)
+        while i < n:
+            node, j, match = self._root, i, None
+            while j < n:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+            if match is None:
+                i += 1
+            else:
+                found.append((match[0], i, match[1]))
+                i = match[1]
+        return found
+
+    def find(self, text: str) -> List[str]:
+        """Skills mentioned in `text`, in taxonomy order."""
+        indices = {index for index, _, _ in self.matches(tokenize_skills(text))}
+        return [self.names[index] for index in sorted(indices)]
+
+    def profile(self, text: str) -> SkillProfile:
+        words = tokenize_skills(text)
+        found = self.matches(words)
+        counts: Dict[int, int] = {}
+        for index, _, _ in found:
+            counts[index] = counts.get(index, 0) + 1
+        order = sorted(counts, key=lambda index: (-counts[index], index))
+
+        years: Dict[str, float] = {}
+        total = None
+        starts = {start: index for index, start, _ in found}
+        ends = {end: index for index, _, end in found}
+        for i in range(len(words) - 1):
+            number = _YEARS_NUMBER.match(words[i])
+            if number is None or words[i + 1] not in _YEARS_UNIT:
+                continue
+            value = float(number.group(1))
+            if not 0 < value <= MAX_YEARS:
+                continue
+            if _EXPERIENCE & set(words[i + 2:i + 5]):
+                total = max(total or 0.0, value)
+            skill = ends.get(i)
+            if skill is None:
+                skill = next(
+                    (starts[k] for k in range(i + 2, i + 2 + YEARS_WINDOW_AFTER) if k in starts),
+                    next((ends[k] for k in range(i - 1, i - YEARS_WINDOW_BEFORE, -1) if k in ends), None),
+                )
+            if skill is not None:
+                name = self.names[skill]
+                years[name] = max(years.get(name, 0.0), value)
+        return SkillProfile([self.names[index] for index in order], years, total)
+
+
+@lru_cache(maxsize=None)
+def _load_taxonomy(path: str) -> SkillTaxonomy:
+    return SkillTaxonomy.load(path)
+
+
+def default_taxonomy() -> SkillTaxonomy:
+    """The taxonomy in RESUME_SHORTLISTING_SKILLS, or the bundled config/skills.yaml."""
+    return _load_taxonomy(os.environ.get('RESUME_SHORTLISTING_SKILLS') or str(DEFAULT_SKILLS_PATH))
+
+
+def must_have_section(jd_requirements: str) -> str:
+    """The must-have part of an `analyze_jd` summary, or '' when it has no such heading."""
+    kept: List[str] = []
+    capturing = False
+    for line in jd_requirements.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        cleaned = _HEADING_PREFIX.sub('', stripped)
+        label, colon, rest = cleaned.partition(':')
+        label = label.strip('*# ')
+        is_heading = (
+            stripped.startswith('#')
+            or (cleaned.startswith('**') and cleaned.endswith('**'))
+            or bool(colon and len(label) <= 60 and (
+                not rest.strip('* ') or cleaned.startswith('*') or not _BULLET.match(line)
+            ))
+        )
+        if not is_heading:
+            if capturing:
+                kept.append(stripped)
+            continue
+        title = label if colon else cleaned.strip('*# ')
+        if _MUST_HAVE.search(title):
+            capturing = True
+            if rest.strip('* '):
+                kept.append(rest.strip('* '))
+        elif _OTHER_SECTION.search(title):
+            capturing = False
+        elif capturing:
+            # A sub-heading such as "Technical skills: Python, SQL".
+            kept.append(cleaned)
+    return '\n'.join(kept)
+
+
+def profile_of(resume: str, taxonomy: Optional[SkillTaxonomy] = None) -> SkillProfile:
+    """The profile stored in an extracted resume, matched afresh for text extracted without one."""
+    profile = SkillProfile.from_text(resume)
+    if profile is None:
+        profile = (taxonomy or default_taxonomy()).profile(resume)
+    return profile
+
+
+def must_have_coverage(profile: SkillProfile, must_haves: Sequence[str]) -> Tuple[float, List[str]]:
+    """Share of `must_haves` present in `profile` (1.0 when there are none) and the missing ones."""
+    present = set(profile.skills)
+    missing = [skill for skill in must_haves if skill not in present]
+    if not must_haves:
+        return 1.0, missing
+    return 1 - len(missing) / len(must_haves), missing
@@ -0,0 +1,276 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.resume_shortlisting.cache import JDAnalysisCache, connect, normalize_job_description
+from src.resume_shortlisting.contact_fields import NOT_FOUND
+from src.resume_shortlisting.parsing import parse_candidate_header
+
+_TERM = re.compile(r'\w+')
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS candidates ('
+    ' id INTEGER PRIMARY KEY,'
+    ' digest TEXT NOT NULL UNIQUE,'
+    ' source_name TEXT NOT NULL,'
+    ' name TEXT NOT NULL,'
+    ' mobile TEXT NOT NULL,'
+    ' email TEXT NOT NULL,'
+    ' text TEXT NOT NULL,'
+    ' added_at REAL NOT NULL,'
+    ' updated_at REAL NOT NULL)',
+    # External-content FTS5 table: the text lives once, in candidates, and the
+    # triggers below keep the index in step with it.
+    'CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5('
+    ' name, mobile, email, source_name, text,'
+    " content='candidates', content_rowid='id', tokenize='unicode61')",
+    'CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN'
+    ' INSERT INTO candidates_fts (rowid, name, mobile, email, source_name, text)'
+    ' VALUES (new.id, new.name, new.mobile, new.email, new.source_name, new.text);'
+    ' END',
+    'CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN'
+    ' INSERT INTO candidates_fts (candidates_fts, rowid, name, mobile, email, source_name, text)'
+    " VALUES ('delete', old.id, old.name, old.mobile, old.email, old.source_name, old.text);"
+    ' END',
+    'CREATE TRIGGER IF NOT EXISTS candidates_au AFTER UPDATE ON candidates BEGIN'
+    ' INSERT INTO candidates_fts (candidates_fts, rowid, name, mobile, email, source_name, text)'
+    " VALUES ('delete', old.id, old.name, old.mobile, old.email, old.source_name, old.text);"
+    ' INSERT INTO candidates_fts (rowid, name, mobile, email, source_name, text)'
+    ' VALUES (new.id, new.name, new.mobile, new.email, new.source_name, new.text);'
+    ' END',
+    'CREATE TABLE IF NOT EXISTS job_descriptions ('
+    ' id INTEGER PRIMARY KEY,'
+    ' jd_hash TEXT NOT NULL UNIQUE,'
+    ' title TEXT NOT NULL,'
+    ' text TEXT NOT NULL,'
+    ' created_at REAL NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS scores ('
+    ' id INTEGER PRIMARY KEY,'
+    ' candidate_id INTEGER NOT NULL REFERENCES candidates (id) ON DELETE CASCADE,'
+    ' job_id INTEGER NOT NULL REFERENCES job_descriptions (id) ON DELETE CASCADE,'
+    ' score REAL NOT NULL,'
+    ' questions TEXT NOT NULL,'
+    ' reasoning TEXT NOT NULL,'
+    ' model TEXT NOT NULL,'
+    ' scored_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS scores_job ON scores (job_id, score)',
+    'CREATE INDEX IF NOT EXISTS scores_candidate ON scores (candidate_id, scored_at)',
+]
+
+
+def default_store_path() -> Path:
+    # Unlike the caches, the pool is data the user curates, so it lives in
+    # its own file that clearing or evicting the caches never touches.
+    configured = os.environ.get('RESUME_SHORTLISTING_STORE')
+    if configured:
+        return Path(configured)
+    return Path.home() / '.local' / 'share' / 'resume_shortlisting' / 'candidates.sqlite3'
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query.
+
+    Every whitespace-separated word must match, as a phrase when it spans
+    several tokens (an email address or a formatted phone number), and the
+    last word matches as a prefix so results update while typing.
+    """
+    phrases = []
+    for word in query.split():
+        terms = _TERM.findall(word)
+        if terms:
+            phrases.append('"' + ' '.join(terms) + '"')
+    if phrases:
+        phrases[-1] += '*'
+    return ' '.join(phrases)
+
+
+class StoredCandidate(NamedTuple):
+    id: int
+    source_name: str
+    name: str
+    mobile: str
+    email: str
+    text: str
+
+
+class CandidateStore:
+    """Extracted resumes and their score history per job description, kept across runs."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else default_store_path()
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        with self._lock, self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    @staticmethod
+    def digest(data: Union[bytes, str]) -> str:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def add_candidates(self, candidates: Iterable[Tuple[str, str, Optional[str]]]) -> List[int]:
+        """Store (source_name, text, digest) triples and return their ids.
+
+        `digest` identifies the file, normally the SHA-256 of the PDF bytes;
+        when it is None the text is hashed instead. A file stored before
+        keeps its id and has its text and contact fields refreshed.
+        """
+        ids = []
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN')
+            for source_name, text, digest in candidates:
+                fields = parse_candidate_header(text)
+                values = (
+                    source_name,
+                    fields.get('name', NOT_FOUND),
+                    fields.get('mobile', NOT_FOUND),
+                    fields.get('email', NOT_FOUND),
+                    text,
+                )
+                row = self._conn.execute(
+                    'INSERT INTO candidates (digest, source_name, name, mobile, email, text, added_at, updated_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+                    ' ON CONFLICT (digest) DO UPDATE SET'
+                    '  source_name = excluded.source_name, name = excluded.name, mobile = excluded.mobile,'
+                    '  email = excluded.email, text = excluded.text, updated_at = excluded.updated_at'
+                    ' RETURNING id',
+                    (digest or self.digest(text), *values, now, now)
+                ).fetchone()
+                ids.append(row[0])
+        return ids
+
+    def _job_id(self, job_description: str) -> int:
+        normalized = normalize_job_description(job_description)
+        title = next((line.strip() for line in job_description.splitlines() if line.strip()), normalized)[:120]
+        return self._conn.execute(
+            'INSERT INTO job_descriptions (jd_hash, title, text, created_at) VALUES (?, ?, ?, ?)'
+            ' ON CONFLICT (jd_hash) DO UPDATE SET text = excluded.text'
+            ' RETURNING id',
+            (JDAnalysisCache.jd_hash(job_description), title, job_description, time.time())
+        ).fetchone()[0]
+
+    def record_scores(self, job_description: str, scores: Iterable[Tuple[int, Dict]], model: str = '') -> int:
+        """Append (candidate_id, result row) pairs to the history for `job_description`.
+
+        Byte-identical uploads share a candidate id, so only the first row per
+        candidate is kept.
+        """
+        rows = {}
+        for candidate_id, row in scores:
+            rows.setdefault(candidate_id, row)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN')
+            job_id = self._job_id(job_description)
+            cursor = self._conn.executemany(
+                'INSERT INTO scores (candidate_id, job_id, score, questions, reasoning, model, scored_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        candidate_id, job_id, float(row['Score']),
+                        str(row.get('Questions for Interview', '')), str(row.get('Reasoning', '')), model, now
+                    )
+                    for candidate_id, row in rows.items()
+                ]
+            )
+            return cursor.rowcount
+
+    def search(self, query: str = '', limit: int = 50) -> List[Dict]:
+        """Candidates matching `query` in their text or contact fields, best match first.
+
+        An empty query lists the most recently stored candidates.
+        """
+        match = fts_query(query)
+        with self._lock:
+            if not match:
+                rows = self._conn.execute(
+                    'SELECT id, source_name, name, mobile, email, updated_at, NULL FROM candidates'
+                    ' ORDER BY updated_at DESC, id DESC LIMIT ?', (limit,)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    'SELECT c.id, c.source_name, c.name, c.mobile, c.email, c.updated_at,'
+                    "  snippet(candidates_fts, 4, '[', ']', ' … ', 12)"
+                    ' FROM candidates_fts JOIN candidates c ON c.id = candidates_fts.rowid'
+                    ' WHERE candidates_fts MATCH ? ORDER BY bm25(candidates_fts) LIMIT ?',
+                    (match, limit)
+                ).fetchall()
+        return [
+            {
+                'id': row[0], 'source_name': row[1], 'name': row[2], 'mobile': row[3], 'email': row[4],
+                'updated_at': row[5], 'snippet': row[6] or '',
+            }
+            for row in rows
+        ]
+
+    def get_candidates(self, candidate_ids: Sequence[int]) -> List[StoredCandidate]:
+        """Stored candidates in the order of `candidate_ids`, skipping ids that no longer exist."""
+        if not candidate_ids:
+            return []
+        placeholders = ','.join('?' * len(candidate_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT id, source_name, name, mobile, email, text FROM candidates WHERE id IN ({placeholders})',
+                list(candidate_ids)
+            ).fetchall()
+        by_id = {row[0]: StoredCandidate(*row) for row in rows}
+        return [by_id[candidate_id] for candidate_id in candidate_ids if candidate_id in by_id]
+
+    def jobs(self) -> List[Dict]:
+        """Job descriptions with recorded scores, most recently screened first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT j.id, j.title, j.jd_hash, COUNT(DISTINCT s.candidate_id), MAX(s.scored_at)'
+                ' FROM job_descriptions j JOIN scores s ON s.job_id = j.id'
+                ' GROUP BY j.id ORDER BY MAX(s.scored_at) DESC'
+            ).fetchall()
+        return [
+            {'id': row[0], 'title': row[1], 'jd_hash': row[2], 'candidates': row[3], 'last_scored_at': row[4]}
+            for row in rows
+        ]
+
+    def score_history(self, job_id: Optional[int] = None, candidate_id: Optional[int] = None) -> List[Dict]:
+        """Every recorded score, newest first, optionally for one job and/or one candidate."""
+        clauses, params = [], []
+        if job_id is not None:
+            clauses.append('s.job_id = ?')
+            params.append(job_id)
+        if candidate_id is not None:
+            clauses.append('s.candidate_id = ?')
+            params.append(candidate_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT s.candidate_id, c.name, c.source_name, j.title, s.score, s.questions, s.reasoning,'
+                '  s.model, s.scored_at'
+                ' FROM scores s JOIN candidates c ON c.id = s.candidate_id JOIN job_descriptions j ON j.id = s.job_id'
+                f' {where} ORDER BY s.scored_at DESC, s.score DESC',
+                params
+            ).fetchall()
+        return [
+            {
+                'candidate_id': row[0], 'name': row[1], 'source_name': row[2], 'job': row[3], 'score': row[4],
+                'questions': row[5], 'reasoning': row[6], 'model': row[7], 'scored_at': row[8],
+            }
+            for row in rows
+        ]
+
+    def delete_candidates(self, candidate_ids: Sequence[int]) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.executemany('DELETE FROM candidates WHERE id = ?', [(i,) for i in candidate_ids])
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            candidates = self._conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+            jobs = self._conn.execute('SELECT COUNT(*) FROM job_descriptions').fetchone()[0]
+            scores = self._conn.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        return {'candidates': candidates, 'jobs': jobs, 'scores': scores, 'path': str(self.path)}
@@ -0,0 +1,24 @@
+from src.resume_shortlisting.batch import _copy_to_duplicates
+from src.resume_shortlisting.dedup import DuplicateMatch
+
+
+def test_duplicates_follow_their_representative():
+    duplicates = {
+        'copy-of-scored.pdf': DuplicateMatch('scored.pdf', 'same email'),
+        'copy-of-rejected.pdf': DuplicateMatch('rejected.pdf', '92% similar text'),
+        'copy-of-unanswered.pdf': DuplicateMatch('unanswered.pdf', 'same mobile'),
+    }
+    texts = {source: f"Name: Copy\nMobile: 9876543210\nRESUME CONTENT:\n{source}" for source in duplicates}
+    scored_rows = {'scored.pdf': {'Source File': 'scored.pdf', 'Name': 'Asha Rao', 'Mobile': '9123456780', 'Score': 8.0}}
+
+    rows, copied, failed, pending = _copy_to_duplicates(
+        duplicates, texts, scored_rows, {'rejected.pdf': 'score: field required'}
+    )
+
+    assert copied == ['copy-of-scored.pdf']
+    assert rows == [{
+        'Source File': 'copy-of-scored.pdf', 'Name': 'Copy', 'Mobile': '9876543210', 'Score': 8.0,
+        'Duplicate Of': 'scored.pdf',
+    }]
+    assert failed == {'copy-of-rejected.pdf': 'duplicate of rejected.pdf, which failed: score: field required'}
+    assert pending == ['copy-of-unanswered.pdf']
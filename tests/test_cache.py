@@ -0,0 +1,96 @@
+import types
+
+import pytest
+
+from src.resume_shortlisting import cache
+from src.resume_shortlisting.cache import ExtractionCache, JDAnalysisCache, ReplayMissError, ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache, 'time', types.SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_extraction_cache_evicts_least_recently_used_first(tmp_path, clock):
+    extraction = ExtractionCache(tmp_path / 'cache.sqlite3', max_bytes=10)
+    extraction.put('a', 'aaaa')
+    clock.value += 1
+    extraction.put('b', 'bbbb')
+    clock.value += 1
+    assert extraction.get('a') == 'aaaa'
+    clock.value += 1
+    extraction.put('c', 'cccc')
+
+    assert extraction.get('b') is None
+    assert extraction.get('a') == 'aaaa'
+    assert extraction.get('c') == 'cccc'
+    assert extraction.stats()['bytes'] == 8
+
+
+def test_extraction_cache_counts_hits_and_misses(tmp_path):
+    extraction = ExtractionCache(tmp_path / 'cache.sqlite3')
+    key = ExtractionCache.key_for(b'%PDF-1.4 resume')
+    assert extraction.get(key) is None
+    extraction.put(key, 'Jane Doe')
+    assert extraction.get(key) == 'Jane Doe'
+    assert extraction.get(key) == 'Jane Doe'
+
+    stats = extraction.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+    extraction.clear()
+    assert extraction.stats()['hits'] == extraction.stats()['entries'] == 0
+
+
+def test_jd_analysis_expires_after_ttl(tmp_path, clock):
+    jd_cache = JDAnalysisCache(tmp_path / 'cache.sqlite3', ttl_seconds=60)
+    key = JDAnalysisCache.key_for("Senior  Python developer", {'role': 'analyst'}, {'description': 'x'}, 'gpt-4o-mini')
+    # Whitespace differences in the job description share a cache entry.
+    assert key == JDAnalysisCache.key_for(
+        "Senior Python\ndeveloper", {'role': 'analyst'}, {'description': 'x'}, 'gpt-4o-mini'
+    )
+    jd_cache.put(key, "**Must-Have Skills and Qualifications:**\n- Python")
+
+    clock.value += 59
+    assert jd_cache.get(key).endswith("- Python")
+    clock.value += 2
+    assert jd_cache.get(key) is None
+    assert jd_cache.stats()['entries'] == 0
+    assert (jd_cache.hits, jd_cache.misses) == (1, 1)
+
+
+def test_jd_analysis_invalidate_by_job_description(tmp_path):
+    jd_cache = JDAnalysisCache(tmp_path / 'cache.sqlite3')
+    python_jd, java_jd = "Python developer", "Java developer"
+    for model in ('gpt-4o-mini', 'gpt-4o'):
+        jd_cache.put(JDAnalysisCache.key_for(python_jd, {}, {}, model), "python summary")
+    jd_cache.put(JDAnalysisCache.key_for(java_jd, {}, {}, 'gpt-4o-mini'), "java summary")
+
+    assert jd_cache.invalidate(" Python   developer ") == 2
+    assert jd_cache.get(JDAnalysisCache.key_for(python_jd, {}, {}, 'gpt-4o')) is None
+    assert jd_cache.get(JDAnalysisCache.key_for(java_jd, {}, {}, 'gpt-4o-mini')) == "java summary"
+    assert jd_cache.invalidate() == 1
+
+
+def test_response_cache_replay_raises_on_unrecorded_prompt(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    messages = [{'role': 'user', 'content': 'Score RESUME 1'}]
+    recorded = ResponseCache.key_for('gpt-4o-mini', messages, temperature=0.0)
+    ResponseCache(path, mode='read_write').put(recorded, 'gpt-4o-mini', 'Final Answer: {"resume_id": 1}')
+
+    replay = ResponseCache(path, mode='replay')
+    assert replay.get(recorded) == 'Final Answer: {"resume_id": 1}'
+    with pytest.raises(ReplayMissError):
+        replay.get(ResponseCache.key_for('gpt-4o-mini', messages, temperature=0.7))
+    assert (replay.hits, replay.misses) == (1, 1)
+    assert not replay.writes
+
+
+def test_response_cache_miss_outside_replay_returns_none(tmp_path):
+    responses = ResponseCache(tmp_path / 'cache.sqlite3', mode='read_write')
+    assert responses.get(ResponseCache.key_for('gpt-4o-mini', [])) is None
+    with pytest.raises(ValueError):
+        ResponseCache(tmp_path / 'cache.sqlite3', mode='playback')
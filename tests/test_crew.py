@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAIServer, FakeOpenAISettings
+from src.resume_shortlisting.cache import ReplayMissError, ResponseCache
+from src.resume_shortlisting.crew import CachingLLM, ResumeShortlistingCrew
+from src.resume_shortlisting.ratelimit import RateLimitScheduler
+
+MESSAGES = [{'role': 'user', 'content': 'Say hello'}]
+
+
+def _llm(base_url, cache_path, mode):
+    return CachingLLM(
+        model='gpt-4o-mini', api_key='sk-fake', base_url=base_url,
+        scheduler=RateLimitScheduler(), response_cache=ResponseCache(cache_path, mode=mode),
+    )
+
+
+def test_recorded_responses_are_replayed_only_for_the_same_endpoint(tmp_path):
+    cache_path = tmp_path / 'cache.sqlite3'
+    with FakeOpenAIServer(FakeOpenAISettings(latency=0)) as server:
+        answer = _llm(server.url, cache_path, 'read_write').call(MESSAGES)
+        assert server.stats()['completed'] == 1
+
+    assert _llm(server.url, cache_path, 'replay').call(MESSAGES) == answer
+    with pytest.raises(ReplayMissError):
+        _llm('http://127.0.0.1:9/v1', cache_path, 'replay').call(MESSAGES)
+
+
+def test_each_run_gets_its_api_key_without_touching_the_environment(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    template = ResumeShortlistingCrew()
+    first, second = template.for_run(api_key='sk-session-one'), template.for_run(api_key='sk-session-two')
+
+    assert first._build_llm().api_key == 'sk-session-one'
+    assert second._build_llm().api_key == 'sk-session-two'
+    assert template.api_key is None
+    assert 'OPENAI_API_KEY' not in os.environ
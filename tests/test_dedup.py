@@ -0,0 +1,47 @@
+from src.resume_shortlisting.dedup import find_duplicates
+
+BODY = (
+    "Backend engineer with six years of Python and Go. Built a payments ledger on PostgreSQL that settles two "
+    "million transactions a day, cut p99 latency of the checkout API from 800 to 120 milliseconds, and moved "
+    "nightly batch jobs to Kafka streams. Led a team of four, ran the on-call rotation and wrote the incident "
+    "review process. Earlier built internal dashboards in React and maintained Terraform for three AWS accounts."
+)
+OTHER_BODY = (
+    "Registered nurse with eight years in paediatric intensive care. Coordinated ward rosters, trained new staff "
+    "on ventilator protocols, audited medication charts every month and represented the unit on the hospital "
+    "infection control committee. Holds advanced paediatric life support certification and speaks Spanish."
+)
+
+
+def _resume(name, mobile, email, body):
+    return f"Name: {name}\nMobile: {mobile}\nEmail: {email}\nRESUME CONTENT:\n{body}"
+
+
+def test_near_duplicate_text_joins_the_first_copy():
+    edited = BODY.replace("six years", "seven years").replace("team of four", "team of five")
+    resumes = [
+        _resume("Asha Rao", "Not found", "Not found", BODY),
+        _resume("Tom Ek", "Not found", "Not found", OTHER_BODY),
+        _resume("Asha Rao", "Not found", "Not found", edited),
+    ]
+    matches = find_duplicates(resumes)
+    assert list(matches) == [2]
+    assert matches[2].representative == 0
+    assert matches[2].reason.endswith("similar text")
+
+
+def test_distinct_resumes_are_not_duplicates():
+    resumes = [
+        _resume("Asha Rao", "9876543210", "asha@example.com", BODY),
+        _resume("Tom Ek", "9123456780", "tom@example.com", OTHER_BODY),
+    ]
+    assert find_duplicates(resumes) == {}
+
+
+def test_same_mobile_in_another_format_matches_without_similar_text():
+    resumes = [
+        _resume("Asha Rao", "+91 98765 43210", "Not found", BODY),
+        _resume("A. Rao", "9876543210", "Not found", OTHER_BODY),
+    ]
+    assert find_duplicates(resumes)[1].reason == "same mobile"
+    assert find_duplicates(resumes, match_contacts=False) == {}
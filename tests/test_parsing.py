@@ -0,0 +1,38 @@
+import json
+
+from src.resume_shortlisting.parsing import IncrementalRecordParser, parse_evaluations
+
+
+def _record(resume_id):
+    return {
+        "resume_id": resume_id,
+        "name": f"Candidate {resume_id}",
+        "mobile": "9876543210",
+        "score": 7.5,
+        "questions": ["How did you size the {cache}?", "What would you change?"],
+        "reasoning": "Strong backend experience.",
+    }
+
+
+def test_pretty_printed_record_in_code_fence():
+    text = "Final Answer: ```json\n" + json.dumps(_record(1), indent=2) + "\n```"
+    parsed = parse_evaluations(text)
+    assert list(parsed.evaluations) == [1]
+    assert parsed.errors == []
+
+
+def test_invalid_record_does_not_hide_the_next_one():
+    text = '{"resume_id": 1, "score": }\n' + json.dumps(_record(2))
+    parsed = parse_evaluations(text)
+    assert list(parsed.evaluations) == [2]
+    assert parsed.errors[0].error.startswith("Invalid JSON")
+
+
+def test_incremental_parser_handles_records_split_across_chunks():
+    text = "\n".join(json.dumps(_record(i), indent=2) for i in (1, 2, 3))
+    parser = IncrementalRecordParser()
+    seen = []
+    for start in range(0, len(text), 7):
+        seen += [evaluation.resume_id for evaluation in parser.feed(text[start:start + 7])]
+    seen += [evaluation.resume_id for evaluation in parser.close()]
+    assert seen == [1, 2, 3]
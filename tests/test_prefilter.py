@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.resume_shortlisting.prefilter import bm25_scores, select_top
+
+RESUMES = [
+    "Frontend developer: React, TypeScript and CSS for design systems.",
+    "Backend engineer: Python services on Kubernetes, PostgreSQL tuning, Python tooling.",
+    "Data engineer: Python pipelines with Spark and Airflow.",
+    "Office manager: scheduling, vendor contracts and travel.",
+]
+QUERY = "Python backend engineer with Kubernetes and PostgreSQL"
+
+
+def test_bm25_ranks_the_closest_resume_first():
+    scores = bm25_scores(RESUMES, QUERY)
+    assert scores.shape == (4,)
+    assert select_top(scores) == [1, 2, 0, 3]
+    assert scores[0] == scores[3] == 0.0
+
+
+def test_bm25_without_documents_or_query_terms_scores_zero():
+    assert bm25_scores([], QUERY).shape == (0,)
+    assert not bm25_scores(RESUMES, "the and of").any()
+
+
+def test_select_top_applies_top_k_after_the_relative_floor():
+    scores = np.array([2.0, 10.0, 6.0, 4.9, 6.0])
+    # Ties keep their upload order.
+    assert select_top(scores, min_relative_score=0.5) == [1, 2, 4]
+    assert select_top(scores, top_k=2, min_relative_score=0.5) == [1, 2]
+    assert select_top(scores, top_k=10) == [1, 2, 4, 3, 0]
+
+
+def test_select_top_keeps_everyone_when_nothing_matches():
+    assert select_top(np.zeros(3), min_relative_score=0.9) == [0, 1, 2]
+    assert select_top(np.array([]), top_k=5) == []
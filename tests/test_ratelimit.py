@@ -0,0 +1,45 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import OpenAI
+
+from benchmarks.fake_openai import FakeOpenAIServer, FakeOpenAISettings
+from src.resume_shortlisting.ratelimit import RateLimitScheduler
+
+REQUESTS = 40
+MAX_CONCURRENCY = 8
+
+
+def test_scheduler_backs_off_and_completes_every_request_under_injected_429s():
+    settings = FakeOpenAISettings(latency=0.02, error_rate=0.3, retry_after=0.05, seed=3)
+    scheduler = RateLimitScheduler(
+        rpm=None, tpm=None, max_concurrency=MAX_CONCURRENCY, max_retries=20, base_delay=0.01,
+        rng=random.Random(3).random,
+    )
+    limits = []
+    lock = threading.Lock()
+
+    with FakeOpenAIServer(settings) as server:
+        client = OpenAI(base_url=server.url, api_key='test', max_retries=0)
+
+        def complete(index):
+            with lock:
+                limits.append(scheduler.concurrency_limit)
+            response = client.chat.completions.create(
+                model='gpt-4o-mini', messages=[{'role': 'user', 'content': f'Request {index}'}]
+            )
+            return response.choices[0].message.content
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            answers = list(pool.map(lambda index: scheduler.call(lambda: complete(index)), range(REQUESTS)))
+        served = server.stats()
+
+    stats = scheduler.stats()
+    assert len(answers) == REQUESTS and all(answers)
+    assert served['completed'] == REQUESTS
+    assert served['injected_429'] > 0
+    assert stats['throttled'] == stats['retries'] == served['injected_429']
+    assert stats['succeeded'] == REQUESTS and stats['failed'] == 0
+    assert limits[0] == MAX_CONCURRENCY
+    assert min(limits) <= MAX_CONCURRENCY // 2
@@ -0,0 +1,34 @@
+import json
+
+from src.resume_shortlisting.crew import ResumeShortlistingCrew
+from src.resume_shortlisting.screening import screen_many
+
+RESUMES = [
+    "Name: Asha Rao\nMobile: 9876543210\nRESUME CONTENT:\nPython and Django.",
+    "Name: Tom Ek\nMobile: 9123456780\nRESUME CONTENT:\nReact and TypeScript.",
+]
+
+
+class FakeCrew(ResumeShortlistingCrew):
+    def run_jd_analysis(self, job_description):
+        return job_description
+
+    def score_resume(self, jd_requirements, resume, candidate=None, quick=False):
+        self.metrics.record('score_resume', 0.5, prompt_tokens=100, completion_tokens=20, candidate=candidate)
+        resume_id = int(resume.split()[2])
+        return json.dumps({
+            "resume_id": resume_id, "name": "Candidate", "mobile": "Not found",
+            "score": 7.0, "questions": ["Why?"], "reasoning": jd_requirements,
+        })
+
+
+def test_screen_many_keeps_candidate_metrics_apart_per_role():
+    crew = FakeCrew()
+    results = screen_many(crew, {'Backend': "Python backend", 'Frontend': "React frontend"}, RESUMES)
+
+    assert sorted(results['Frontend'].evaluations) == [1, 2]
+    candidates = crew.metrics.by_candidate()
+    assert sorted(candidates) == [('Backend', 1), ('Backend', 2), ('Frontend', 1), ('Frontend', 2)]
+    assert all(total['calls'] == 2 and total['prompt_tokens'] == 100 for total in candidates.values())
+    assert 'Frontend #2' in crew.metrics.to_dict()['candidates']
+    assert 'role="Backend",candidate="1"' in crew.metrics.to_prometheus()
@@ -0,0 +1,48 @@
+import io
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from src.resume_shortlisting.pdf_text import PDFTextExtractor
+from src.resume_shortlisting.screening import ScreeningResult
+from src.resume_shortlisting.skills import profile_of
+
+CSHARP_RESUME = [
+    "Priya Sharma",
+    "priya.sharma@example.com | +91 9876543210",
+    "Backend developer on payment platforms.",
+    "Skills: C# (5 years), .NET Core (4 years), SQL Server, Azure",
+    "Built payment services in C# and ASP.NET Core on Azure.",
+]
+
+CSHARP_JD_SUMMARY = """**Must-Have Skills and Qualifications:**
+- C#
+- .NET
+- SQL Server
+**Nice-to-Have Skills:**
+- Azure
+"""
+
+
+def _pdf(lines):
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 740
+    for line in lines:
+        pdf.drawString(72, y, line)
+        y -= 18
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_csharp_resume_covers_csharp_must_have():
+    resume = PDFTextExtractor().extract(_pdf(CSHARP_RESUME))
+    profile = profile_of(resume)
+
+    assert 'C#' in profile.skills
+    assert profile.years['C#'] == 5
+    assert profile.years['.NET'] == 4
+
+    result = ScreeningResult(evaluations={}, failures={}, jd_requirements=CSHARP_JD_SUMMARY, raw='')
+    assert result.must_haves() == ['C#', '.NET', 'SQL Server']
+    assert result.coverage([resume]) == {1: (1.0, [])}
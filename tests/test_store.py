@@ -0,0 +1,62 @@
+import pytest
+
+from src.resume_shortlisting.store import CandidateStore, fts_query
+
+JD = "Senior Python Developer\nPython, Django and PostgreSQL."
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CandidateStore(tmp_path / 'candidates.sqlite3')
+    store.add_candidates([
+        ("asha.pdf", "Name: Asha Rao\nMobile: 9876543210\nEmail: asha.rao@example.com\n"
+                     "RESUME CONTENT:\nDjango and PostgreSQL services for a payments team.", "digest-asha"),
+        ("tom.pdf", "Name: Tom Ek\nMobile: 9123456780\nEmail: tom@example.com\n"
+                    "RESUME CONTENT:\nReact and TypeScript design systems.", "digest-tom"),
+    ])
+    return store
+
+
+def test_fts_query_quotes_words_and_prefixes_the_last():
+    assert fts_query('postgres asha.rao@example') == '"postgres" "asha rao example"*'
+    assert fts_query('  ') == ''
+
+
+def test_search_matches_text_contact_fields_and_prefixes(store):
+    assert [row['source_name'] for row in store.search('postgresql')] == ['asha.pdf']
+    assert [row['name'] for row in store.search('asha.rao@example.com')] == ['Asha Rao']
+    assert [row['name'] for row in store.search('Typ')] == ['Tom Ek']
+    assert '[PostgreSQL]' in store.search('postgresql')[0]['snippet']
+    assert store.search('kotlin') == []
+    assert len(store.search()) == 2
+
+
+def test_re_adding_a_file_keeps_its_id_and_refreshes_the_index(store):
+    asha_id = store.search('asha')[0]['id']
+    [same_id] = store.add_candidates([
+        ("asha-v2.pdf", "Name: Asha Rao\nRESUME CONTENT:\nKotlin services.", "digest-asha"),
+    ])
+    assert same_id == asha_id
+    assert store.search('postgresql') == []
+    assert store.search('kotlin')[0]['source_name'] == 'asha-v2.pdf'
+
+
+def test_record_scores_keeps_one_row_per_candidate_and_job(store):
+    asha_id, tom_id = (store.search(name)[0]['id'] for name in ('asha', 'tom'))
+    rows = [
+        (asha_id, {'Score': 8.5, 'Questions for Interview': 'Why Django?', 'Reasoning': 'Strong match'}),
+        (asha_id, {'Score': 1.0}),
+        (tom_id, {'Score': '4'}),
+    ]
+    assert store.record_scores(JD, rows, model='gpt-4o-mini') == 2
+    # A whitespace variant of the job description is the same job.
+    store.record_scores(JD.replace('\n', '  \n'), [(tom_id, {'Score': 5})])
+
+    [job] = store.jobs()
+    assert (job['title'], job['candidates']) == ("Senior Python Developer", 2)
+    history = store.score_history(job_id=job['id'], candidate_id=asha_id)
+    assert [(row['score'], row['questions'], row['model']) for row in history] == [(8.5, 'Why Django?', 'gpt-4o-mini')]
+    assert sorted(row['score'] for row in store.score_history(candidate_id=tom_id)) == [4.0, 5.0]
+
+    store.delete_candidates([tom_id])
+    assert store.stats()['scores'] == 1